@@ -26,7 +26,11 @@ class Student(models.Model):
 
     @property
     def full_name(self):
-        name_parts = [self.first_name, self.middle_name, self.last_name]
+        return self.format_full_name(self.first_name, self.middle_name, self.last_name)
+
+    @staticmethod
+    def format_full_name(first_name, middle_name, last_name):
+        name_parts = [first_name, middle_name, last_name]
         return (
             " ".join([part for part in name_parts if part]).strip().replace("  ", " ")
         )
@@ -20,6 +20,8 @@ from rest_framework_simplejwt.views import TokenRefreshView
 
 from Test_Management.models import AnalysisDocument, Section, Subject
 from Test_Management.permissions.permissions import IsTeacher
+from utils.mixins.mixins import SparseFieldsetMixin
+from utils.pagination.pagination import PageNumberOrKeysetPagination
 
 from .forms import UserRegisterForm
 from .models import Student, Teacher
@@ -279,10 +281,11 @@ class SystemStatsViewSet(viewsets.ViewSet):
         )
 
 
-class StudentViewSet(ModelViewSet):
+class StudentViewSet(SparseFieldsetMixin, ModelViewSet):
     queryset = Student.objects.all()
     serializer_class = StudentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrKeysetPagination
     filter_backends = [DjangoFilterBackend, filters.SearchFilter]
     filterset_fields = ["section"]
     search_fields = ["first_name", "last_name", "lrn", "user_id__email"]
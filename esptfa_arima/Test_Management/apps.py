@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TestManagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'Test_Management'
+
+    def ready(self):
+        # connect the full_details cache invalidation and register its system check
+        from . import checks, signals  # noqa: F401
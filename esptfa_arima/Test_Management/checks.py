@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.core.checks import Error, Tags, Warning, register
+
+# cache backends whose entries only the process that wrote them can see
+PROCESS_LOCAL_CACHES = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+@register(Tags.caches)
+def check_full_details_cache_is_shared(app_configs, **kwargs):
+    """
+    Analyses run by `run_analysis_worker` (ARIMA_JOBS BACKEND "redis") bump the
+    full_details cache versions from the worker process, which the web process only
+    sees through a cache both of them share.
+
+    Outside DEBUG the same goes for several web processes (e.g. more than one
+    gunicorn worker): each keeps its own copy and serves it until the timeout.
+    """
+    from arima_model.jobs import job_settings
+    from Test_Management.services.full_details_service import FULL_DETAILS_CACHE_ALIAS
+
+    alias = FULL_DETAILS_CACHE_ALIAS if FULL_DETAILS_CACHE_ALIAS in settings.CACHES else "default"
+    if settings.CACHES[alias]["BACKEND"] not in PROCESS_LOCAL_CACHES:
+        return []
+    if job_settings()["BACKEND"] != "redis":
+        if settings.DEBUG:
+            return []
+        return [
+            Warning(
+                f"The '{alias}' cache is local to each process, so with more than one web process "
+                "full_details responses can stay stale for up to FULL_DETAILS_CACHE_TIMEOUT.",
+                hint="Run a single web process or point the full_details cache at a shared backend "
+                "(set REDIS_CACHE_URL).",
+                id="Test_Management.W001",
+            )
+        ]
+    return [
+        Error(
+            f"The '{alias}' cache is local to each process, so full_details invalidations made by "
+            "run_analysis_worker never reach the web process.",
+            hint="Point the full_details cache at a shared backend (set REDIS_CACHE_URL) "
+            "or use ARIMA_JOBS['BACKEND'] = 'local'.",
+            id="Test_Management.E001",
+        )
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2 on 2026-10-17 12:24
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicate_statistics(apps, schema_editor):
+    """Reruns used to add statistic rows; keep the newest row per document and key."""
+    for model_name, key in (
+        ("FormativeAssessmentStatistic", "formative_assessment_number"),
+        ("StudentScoresStatistic", "student"),
+    ):
+        model = apps.get_model("Test_Management", model_name)
+        pk_name = model._meta.pk.name
+        keep = (
+            model.objects.order_by()
+            .values("analysis_document", key)
+            .annotate(newest=Max(pk_name))
+            .values_list("newest", flat=True)
+        )
+        model.objects.exclude(**{f"{pk_name}__in": list(keep)}).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Authentication', '0008_alter_student_lrn'),
+        ('Test_Management', '0016_analysisgroup'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_statistics, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='formativeassessmentstatistic',
+            unique_together={('analysis_document', 'formative_assessment_number')},
+        ),
+        migrations.AlterUniqueTogether(
+            name='studentscoresstatistic',
+            unique_together={('analysis_document', 'student')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Test_Management', '0017_unique_statistics_per_document'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisdocument',
+            name='forecast_method',
+            field=models.CharField(choices=[('xgboost', 'XGBoost'), ('arima', 'ARIMA (XGBoost for short series)')], default='xgboost', max_length=10),
+        ),
+    ]
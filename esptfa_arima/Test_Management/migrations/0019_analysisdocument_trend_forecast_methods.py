@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 12:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Test_Management', '0018_analysisdocument_forecast_method'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='analysisdocument',
+            name='forecast_method',
+            field=models.CharField(choices=[('xgboost', 'XGBoost'), ('arima', 'ARIMA (XGBoost for short series)'), ('ar1', 'AR(1) with drift (XGBoost for short series)'), ('holt', 'Holt linear trend (XGBoost for short series)')], default='xgboost', max_length=10),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Test_Management', '0019_analysisdocument_trend_forecast_methods'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisdocumentstatistic',
+            name='prediction_error_lower',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='analysisdocumentstatistic',
+            name='prediction_error_upper',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='predictedscore',
+            name='lower_bound',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='predictedscore',
+            name='upper_bound',
+            field=models.FloatField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2 on 2026-10-17 13:15
+
+from django.db import migrations
+from django.db.models import Max
+
+
+def remove_duplicate_predictions(apps, schema_editor):
+    """Reruns used to add prediction rows; keep the newest row per document, student and test."""
+    PredictedScore = apps.get_model("Test_Management", "PredictedScore")
+    keep = (
+        PredictedScore.objects.order_by()
+        .values("analysis_document", "student_id", "test_number")
+        .annotate(newest=Max("predicted_score_id"))
+        .values_list("newest", flat=True)
+    )
+    PredictedScore.objects.exclude(predicted_score_id__in=list(keep)).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Authentication', '0008_alter_student_lrn'),
+        ('Test_Management', '0020_prediction_intervals'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_predictions, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='predictedscore',
+            unique_together={('analysis_document', 'student_id', 'test_number')},
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2 on 2026-10-17 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Authentication', '0008_alter_student_lrn'),
+        ('Test_Management', '0021_unique_predicted_score'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='formativeassessmentscore',
+            index=models.Index(fields=['analysis_document', 'student_id', 'test_number'], name='fa_score_doc_student_test_idx'),
+        ),
+    ]
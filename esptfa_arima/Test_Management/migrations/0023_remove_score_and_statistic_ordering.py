@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-17 14:19
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Test_Management', '0022_formativeassessmentscore_document_index'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='analysisdocumentstatistic',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='formativeassessmentscore',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='formativeassessmentstatistic',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='predictedscore',
+            options={},
+        ),
+        migrations.AlterModelOptions(
+            name='studentscoresstatistic',
+            options={},
+        ),
+    ]
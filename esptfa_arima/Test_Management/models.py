@@ -90,6 +90,18 @@ class TestDraft(models.Model):
 
 
 class AnalysisDocument(models.Model):
+    # how the post-test scores are forecast
+    XGBOOST = "xgboost"
+    ARIMA = "arima"
+    AR1 = "ar1"
+    HOLT = "holt"
+    FORECAST_METHOD_CHOICES = [
+        (XGBOOST, "XGBoost"),
+        (ARIMA, "ARIMA (XGBoost for short series)"),
+        (AR1, "AR(1) with drift (XGBoost for short series)"),
+        (HOLT, "Holt linear trend (XGBoost for short series)"),
+    ]
+
     analysis_document_id = models.AutoField(unique=True, primary_key=True)
     analysis_doc_title = models.CharField(max_length=100)
     quarter = models.ForeignKey(Quarter, on_delete=models.CASCADE, null=True)
@@ -106,6 +118,7 @@ class AnalysisDocument(models.Model):
     teacher = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True)
     section = models.ForeignKey(Section, on_delete=models.CASCADE)
     status = models.BooleanField(default=False)  # True if processed, False if not
+    forecast_method = models.CharField(max_length=10, choices=FORECAST_METHOD_CHOICES, default=XGBOOST)
 
     def __str__(self):
         return self.analysis_doc_title
@@ -170,8 +183,18 @@ class FormativeAssessmentScore(models.Model):
     def __str__(self):
         return f"{self.student_id} - {self.test_number}: {self.score}"
 
+    # no default ordering on the score and statistic models: queries order
+    # explicitly where a response needs it, and bulk reads skip the sort
     class Meta:
-        ordering = ["-date", "-formative_assessment_score_id"]
+        # reads filter by document, then by student (and test). test_number is a
+        # CharField, so the index keeps it in text order ("10" before "2"): callers
+        # that show scores in test order sort with test_number_order
+        indexes = [
+            models.Index(
+                fields=["analysis_document", "student_id", "test_number"],
+                name="fa_score_doc_student_test_idx",
+            ),
+        ]
 
 
 class PredictedScore(models.Model):
@@ -186,12 +209,16 @@ class PredictedScore(models.Model):
     predicted_status = models.CharField(max_length=20, null=True, blank=True)
     passing_threshold = models.FloatField()
     max_score = models.FloatField(null=True)
+    # prediction interval, on the same scale as score
+    lower_bound = models.FloatField(null=True, blank=True)
+    upper_bound = models.FloatField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.student_id} - {self.test_number}: {self.score}"
 
     class Meta:
-        ordering = ["-date", "-predicted_score_id"]
+        # one prediction per student and reference test; reruns upsert it
+        unique_together = ("analysis_document", "student_id", "test_number")
 
 
 class AnalysisDocumentStatistic(models.Model):
@@ -206,13 +233,13 @@ class AnalysisDocumentStatistic(models.Model):
     total_students = models.IntegerField()
     mean_passing_threshold = models.FloatField()
     heatmap = models.FileField(upload_to="heatmaps/", null=True)
+    # quantiles of the model's scaled backtest errors that bound the predictions
+    prediction_error_lower = models.FloatField(null=True, blank=True)
+    prediction_error_upper = models.FloatField(null=True, blank=True)
 
     def __str__(self):
         return f"{self.analysis_document.analysis_doc_title} Statistics"
 
-    class Meta:
-        ordering = ["-analysis_document_statistic_id"]
-
 
 class AnalysisDocumentInsights(models.Model):
     analysis_document_insights_id = models.AutoField(unique=True, primary_key=True)
@@ -253,8 +280,9 @@ class FormativeAssessmentStatistic(models.Model):
     def __str__(self):
         return f"{self.analysis_document.analysis_doc_title} - FA {self.formative_assessment_number} Statistics"
 
+    # one row per test, so statistics can be upserted in bulk
     class Meta:
-        ordering = ["-formative_assessment_statistic_id"]
+        unique_together = ("analysis_document", "formative_assessment_number")
 
 
 class StudentScoresStatistic(models.Model):
@@ -280,8 +308,9 @@ class StudentScoresStatistic(models.Model):
     def __str__(self):
         return f"{self.analysis_document.analysis_doc_title} - {self.student.lrn} Statistics"
 
+    # one row per student, so statistics can be upserted in bulk
     class Meta:
-        ordering = ["-student_scores_statistic_id"]
+        unique_together = ("analysis_document", "student")
 
 
 class ActualPostTest(models.Model):
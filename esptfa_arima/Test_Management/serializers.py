@@ -4,6 +4,7 @@ from Authentication.models import Teacher
 from django.contrib.auth.models import User
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models import Avg
+from .services.document_query_service import with_statistics_summary
 
 
 class SubjectSerializer(serializers.ModelSerializer):
@@ -80,35 +81,35 @@ class AnalysisDocumentSerializer(serializers.ModelSerializer):
         fields = "__all__"
 
     def get_statistics(self, obj):
-        try:
-            stat = AnalysisDocumentStatistic.objects.get(analysis_document=obj)
-
-            # Match the computation in AnalysisDetailPage.tsx:
-            # { title: "Class Success %", value: (students with passing_rate >= 75) / (total students) * 100 }
-            student_stats = StudentScoresStatistic.objects.filter(analysis_document=obj)
-            total_students = student_stats.count()
-
-            if total_students > 0:
-                passing_students = student_stats.filter(passing_rate__gte=75).count()
-                success_rate = (passing_students / total_students) * 100
-            else:
-                success_rate = 0
-
-            # Predicted Mean match: average of all student predictions
-            avg_predicted = PredictedScore.objects.filter(
-                analysis_document=obj
-            ).aggregate(avg=Avg("score"))["avg"]
-            if avg_predicted is None:
-                avg_predicted = stat.mean_passing_threshold
-
-            return {
-                "avg_class_score": round(stat.mean, 1),
-                "predicted_mean": round(avg_predicted, 1),
-                "success_rate": round(success_rate, 1),
-            }
-        except (AnalysisDocumentStatistic.DoesNotExist, AttributeError):
+        # list endpoints annotate the summary up front (see with_statistics_summary);
+        # anything else fetches it with a single query
+        if not hasattr(obj, "summary_mean"):
+            obj = with_statistics_summary(AnalysisDocument.objects.filter(pk=obj.pk)).first()
+            if obj is None:
+                return None
+
+        if obj.summary_mean is None:
             return None
 
+        # Match the computation in AnalysisDetailPage.tsx:
+        # { title: "Class Success %", value: (students with passing_rate >= 75) / (total students) * 100 }
+        total_students = obj.summary_total_students
+        if total_students > 0:
+            success_rate = (obj.summary_passing_students / total_students) * 100
+        else:
+            success_rate = 0
+
+        # Predicted Mean match: average of all student predictions
+        avg_predicted = obj.summary_avg_predicted
+        if avg_predicted is None:
+            avg_predicted = obj.summary_mean_passing_threshold
+
+        return {
+            "avg_class_score": round(obj.summary_mean, 1),
+            "predicted_mean": round(avg_predicted, 1),
+            "success_rate": round(success_rate, 1),
+        }
+
 
 class FormativeAssessmentScoreSerializer(serializers.ModelSerializer):
     formative_assessment_number = serializers.ReadOnlyField(source="test_number")
@@ -1,7 +1,8 @@
 from Test_Management.models import TestDraft, IdempotencyKey, TestTopicMapping, TestTopic, AnalysisDocument, FormativeAssessmentScore
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from Authentication.models import Student, Teacher
-from arima_model.arima_model import arima_driver
+from arima_model.jobs import enqueue_analysis, enqueue_reanalysis, enqueue_batch_analysis
 import logging
 from typing import List, Dict
 
@@ -60,6 +61,14 @@ def create_analysis_document(draft: TestDraft):
         if not teacher:
             raise ValueError("User is not a teacher")
 
+        # the draft JSON is not validated on save, so check the method against the model's choices
+        forecast_method = draft.test_content.get('forecast_method', AnalysisDocument.XGBOOST)
+        forecast_methods = [method for method, _ in AnalysisDocument.FORECAST_METHOD_CHOICES]
+        if forecast_method not in forecast_methods:
+            raise ValidationError(
+                f"Unknown forecast_method {forecast_method!r}; expected one of {', '.join(forecast_methods)}"
+            )
+
         # Create the analysis document
         document = AnalysisDocument.objects.create(
             analysis_doc_title=draft.title,
@@ -68,7 +77,8 @@ def create_analysis_document(draft: TestDraft):
             teacher=draft.user_teacher,
             section=draft.section_id,
             status=False,
-            post_test_max_score=draft.test_content.get('post_test_max_score', DEFAULT_POST_TEST_MAX_SCORE)
+            post_test_max_score=draft.test_content.get('post_test_max_score', DEFAULT_POST_TEST_MAX_SCORE),
+            forecast_method=forecast_method,
         )
 
         # get the specific objs from the json from the test_content
@@ -97,8 +107,9 @@ def create_analysis_document(draft: TestDraft):
 
 # STARTING ARIMA MODEL
 def start_arima_model(document):
+    """Queue the prediction pipeline for the document and return the job."""
     try:
-        arima_driver(document)
+        return enqueue_analysis(document)
     except Exception as e:
         logger.error(f"Error starting ARIMA model: {e}")
         raise
@@ -107,6 +118,25 @@ def start_arima_model(document):
 
 
 
+def start_reanalysis(document, students, test_numbers):
+    """Queue a recompute of the students and tests whose scores changed."""
+    try:
+        return enqueue_reanalysis(document, students, test_numbers)
+    except Exception as e:
+        logger.error(f"Error starting reanalysis: {e}")
+        raise
+
+
+def start_batch_analysis(documents):
+    """Queue one prediction run covering all the documents and return the job."""
+    try:
+        return enqueue_batch_analysis(documents)
+    except Exception as e:
+        logger.error(f"Error starting batch analysis: {e}")
+        raise
+
+
+
 # FORMATIVE ASSESSMENT SCORES
 
 """Creates the formative assessment scores and commits them to the db"""
@@ -164,6 +194,65 @@ def process_formative_assessment_scores(document, scores, test_topic_mappings):
 
 
 
+"""Adds or corrects scores of an analyzed document; returns the affected students and tests"""
+def update_formative_assessment_scores(document, scores):
+    PASSING_PERCENTAGE = 0.70
+    try:
+        items = [
+            (str(item.get("lrn")), str(item.get("test_number")), float(item.get("score")))
+            for item in scores
+        ]
+        lrns = {lrn for lrn, _, _ in items}
+        test_numbers = {test_number for _, test_number, _ in items}
+
+        students = Student.objects.in_bulk(list(lrns))
+        missing = sorted(lrns - set(students))
+        if missing:
+            raise Student.DoesNotExist(f"Students not found: {', '.join(missing)}")
+
+        mapping_lookup = {
+            str(m.topic.test_number): m
+            for m in TestTopicMapping.objects.filter(analysis_document=document).select_related("topic")
+        }
+        existing = {
+            (s.student_id_id, s.test_number): s
+            for s in FormativeAssessmentScore.objects.filter(
+                analysis_document=document, student_id__in=lrns, test_number__in=test_numbers
+            )
+        }
+
+        to_update, to_create = [], []
+        for lrn, test_num, score in items:
+            score_obj = existing.get((lrn, test_num))
+            if score_obj:
+                score_obj.score = score
+                to_update.append(score_obj)
+                continue
+
+            topic_mapping = mapping_lookup.get(test_num)
+            max_score = topic_mapping.topic.max_score if topic_mapping and topic_mapping.topic.max_score else 0
+            to_create.append(FormativeAssessmentScore(
+                analysis_document=document,
+                student_id=students[lrn],
+                test_number=test_num,
+                score=score,
+                topic_mapping=topic_mapping,
+                passing_threshold=max_score * PASSING_PERCENTAGE if max_score > 0 else 0
+            ))
+
+        FormativeAssessmentScore.objects.bulk_update(to_update, ["score"])
+        FormativeAssessmentScore.objects.bulk_create(to_create)
+        return sorted(lrns), sorted(int(t) for t in test_numbers)
+    except Student.DoesNotExist as e:
+        logger.error(f"Error updating formative assessment scores: {e}")
+        raise
+    except Exception as e:
+        logger.error(f"Error updating formative assessment scores: {e}")
+        raise
+
+
+
+
 # UTILS
 def get_students_by_section(section_id: int) -> Dict[str, Student]:
     try:
@@ -0,0 +1,47 @@
+from Test_Management.models import AnalysisDocumentStatistic, StudentScoresStatistic, PredictedScore
+from django.db.models import Avg, Count, FloatField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+# students at or above this passing rate count towards the class success rate
+SUCCESS_PASSING_RATE = 75
+
+
+def _aggregate_subquery(queryset, aggregate, output_field):
+    """A correlated subquery returning one aggregate over ``queryset`` per analysis document."""
+    return Subquery(
+        queryset.filter(analysis_document=OuterRef("pk"))
+        .order_by()
+        .values("analysis_document")
+        .annotate(value=aggregate)
+        .values("value")[:1],
+        output_field=output_field,
+    )
+
+
+def with_statistics_summary(queryset):
+    """
+    Annotate analysis documents with what AnalysisDocumentSerializer.get_statistics
+    reads, so serializing a page of documents costs no query per document.
+    """
+    document_statistic = AnalysisDocumentStatistic.objects.filter(
+        analysis_document=OuterRef("pk")
+    ).order_by("-analysis_document_statistic_id")
+
+    return queryset.select_related("quarter", "subject", "section__adviser").annotate(
+        summary_mean=Subquery(document_statistic.values("mean")[:1], output_field=FloatField()),
+        summary_mean_passing_threshold=Subquery(
+            document_statistic.values("mean_passing_threshold")[:1], output_field=FloatField()
+        ),
+        summary_total_students=Coalesce(
+            _aggregate_subquery(StudentScoresStatistic.objects.all(), Count("pk"), IntegerField()), 0
+        ),
+        summary_passing_students=Coalesce(
+            _aggregate_subquery(
+                StudentScoresStatistic.objects.filter(passing_rate__gte=SUCCESS_PASSING_RATE),
+                Count("pk"),
+                IntegerField(),
+            ),
+            0,
+        ),
+        summary_avg_predicted=_aggregate_subquery(PredictedScore.objects.all(), Avg("score"), FloatField()),
+    )
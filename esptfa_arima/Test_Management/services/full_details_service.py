@@ -0,0 +1,219 @@
+from Test_Management.models import (
+    AnalysisDocumentStatistic, TestTopicMapping, FormativeAssessmentStatistic, StudentScoresStatistic,
+    PredictedScore, FormativeAssessmentScore, ActualPostTest, AnalysisDocumentInsights
+)
+from Test_Management.serializers import (
+    AnalysisDocumentSerializer, AnalysisDocumentStatisticSerializer,
+    FormativeAssessmentStatisticSerializer, AnalysisDocumentInsightsSerializer
+)
+from Test_Management.services.intervention_service import InterventionEnum, get_intervention
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# cache alias for the payloads; falls back to the default cache when not configured.
+# Jobs run out of process (ARIMA_JOBS BACKEND "redis") invalidate it from the worker,
+# so it must then be shared between processes (see Test_Management.checks)
+FULL_DETAILS_CACHE_ALIAS = "full_details"
+DEFAULT_FULL_DETAILS_TIMEOUT = 60 * 60 * 24
+
+
+def test_number_order(test_number):
+    """Sort key putting test numbers (stored as text) in numeric order, non-numeric ones last."""
+    return (0, int(test_number), "") if test_number.isdigit() else (1, 0, test_number)
+
+
+# CACHE
+def get_full_details_cache():
+    alias = FULL_DETAILS_CACHE_ALIAS if FULL_DETAILS_CACHE_ALIAS in settings.CACHES else "default"
+    return caches[alias]
+
+
+def _version_key(document_id):
+    return f"full_details:version:{document_id}"
+
+
+def _payload_key(document_id, version):
+    return f"full_details:{document_id}:{version}"
+
+
+def get_full_details_version(document_id):
+    """
+    Current cache version of a document. A missing counter starts from the clock,
+    so a counter that was evicted never comes back at a version already used.
+    """
+    cache = get_full_details_cache()
+    version = cache.get(_version_key(document_id))
+    if version is None:
+        cache.add(_version_key(document_id), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(document_id))
+    return version
+
+
+def invalidate_full_details(document_id):
+    """Bump the document's version once the current transaction commits, orphaning the cached payload."""
+    def bump():
+        cache = get_full_details_cache()
+        try:
+            cache.incr(_version_key(document_id))
+        except ValueError:
+            # no counter yet, so nothing was cached under it
+            get_full_details_version(document_id)
+
+    transaction.on_commit(bump)
+
+
+def get_full_details(document):
+    """The full_details payload of an analyzed document, served from the cache when possible."""
+    cache = get_full_details_cache()
+    key = _payload_key(document.pk, get_full_details_version(document.pk))
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_full_details(document)
+        cache.set(key, payload, timeout=getattr(settings, "FULL_DETAILS_CACHE_TIMEOUT", DEFAULT_FULL_DETAILS_TIMEOUT))
+    return payload
+
+
+def prewarm_full_details(document):
+    """Build and cache the payload ahead of the first page load. Never raises."""
+    try:
+        get_full_details(document)
+    except Exception as e:
+        logger.warning(f"Could not prewarm full details for document {document.pk}: {e}")
+
+
+def refresh_full_details(document):
+    """Invalidate the document's payload and rebuild it once the current transaction commits."""
+    invalidate_full_details(document.pk)
+    transaction.on_commit(lambda: prewarm_full_details(document))
+
+
+# PAYLOAD
+def build_full_details(document):
+    # 1. Base Stats
+    doc_stats = AnalysisDocumentStatistic.objects.filter(
+        analysis_document=document
+    ).first()
+    doc_stats_data = (
+        AnalysisDocumentStatisticSerializer(doc_stats).data
+        if doc_stats
+        else None
+    )
+
+    # 2. Topic Mapping
+    topics_mapping = TestTopicMapping.objects.filter(
+        analysis_document=document
+    ).select_related("topic")
+    topics_data = []
+    for tm in topics_mapping:
+        topics_data.append(
+            {
+                "test_number": tm.topic.test_number,
+                "topic_name": tm.topic.topic_name,
+                "max_score": tm.topic.max_score,
+            }
+        )
+
+    # 3. Formative Assessment Statistics (Class level per test)
+    # one row per test, put in numeric test order here rather than by the text column
+    fa_stats = sorted(
+        FormativeAssessmentStatistic.objects.filter(analysis_document=document).select_related("fa_topic"),
+        key=lambda stat: test_number_order(stat.formative_assessment_number),
+    )
+    fa_stats_data = FormativeAssessmentStatisticSerializer(
+        fa_stats, many=True
+    ).data
+
+    # 4. Student Statistics, Predictions, and raw scores
+    # students in LRN order, which the (document, student) key already reads them in
+    student_stats = StudentScoresStatistic.objects.filter(
+        analysis_document=document
+    ).select_related("student", "student__user_id").order_by("student")
+    predictions = PredictedScore.objects.filter(
+        analysis_document=document
+    ).select_related("student_id")
+    # oldest first, so a repeated (student, test) score resolves to the newest row;
+    # the document index already holds the rows in that order
+    all_scores = FormativeAssessmentScore.objects.filter(
+        analysis_document=document
+    ).order_by("pk").values("student_id__lrn", "test_number", "score", "passing_threshold")
+
+    # Create a lookup for predictions and actual scores
+    pred_lookup = {p.student_id.lrn: p for p in predictions}
+    # student_id is the LRN, so no student is fetched per post-test
+    actual_lookup = {
+        a.student_id: a
+        for a in ActualPostTest.objects.filter(analysis_document=document)
+    }
+
+    # Group scores by student for the matrix
+    scores_by_student = {}
+    for s in all_scores:
+        lrn = s["student_id__lrn"]
+        if lrn not in scores_by_student:
+            scores_by_student[lrn] = {}
+        scores_by_student[lrn][s["test_number"]] = s["score"]
+
+    # Combine student stats and predictions
+    student_performance = []
+    for ss in student_stats:
+        pred = pred_lookup.get(ss.student.lrn)
+        prediction_score_percent = (
+            (pred.score / pred.max_score) * 100
+            if pred and pred.max_score
+            else 0
+        )
+        actual = actual_lookup.get(ss.student.lrn)
+        student_performance.append(
+            {
+                "lrn": ss.student.lrn,
+                "name": ss.student.full_name,
+                "mean": ss.mean,
+                "passing_rate": ss.passing_rate,
+                "failing_rate": ss.failing_rate,
+                "predicted_score": pred.score if pred else None,
+                "predicted_lower": pred.lower_bound if pred else None,
+                "predicted_upper": pred.upper_bound if pred else None,
+                "predicted_status": pred.predicted_status if pred else "N/A",
+                "prediction_score_percent": prediction_score_percent,
+                "actual_score": actual.score if actual else None,
+                "actual_max": actual.max_score if actual else None,
+                "actual_status": actual.status if actual else None,
+                "prediction_intervention": get_intervention(
+                    prediction_score_percent, "analysis_document"
+                )
+                if pred
+                else {InterventionEnum.NA.value: "No data"},
+                "actual_intervention": get_intervention(
+                    (actual.score / actual.max_score) * 100, "analysis_document"
+                )
+                if actual and actual.max_score
+                else {InterventionEnum.NA.value: "No data"},
+                "scores": scores_by_student.get(ss.student.lrn, {}),
+                "sum_scores": ss.sum_scores,
+                "max_possible_score": ss.max_possible_score,
+            }
+        )
+
+    # 5. Insights
+    insights_obj = AnalysisDocumentInsights.objects.filter(
+        analysis_document=document
+    ).first()
+    insights_data = (
+        AnalysisDocumentInsightsSerializer(insights_obj).data
+        if insights_obj
+        else None
+    )
+
+    return {
+        "document": AnalysisDocumentSerializer(document).data,
+        "statistics": doc_stats_data,
+        "topics": topics_data,
+        "formative_assessments": fa_stats_data,
+        "student_performance": student_performance,
+        "insights": insights_data,
+    }
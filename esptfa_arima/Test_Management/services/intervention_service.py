@@ -0,0 +1,53 @@
+from enum import Enum
+
+
+# enum for intervention
+class InterventionEnum(Enum):
+    REMEDIAL = "Remedial"
+    RE_TEACHING = "Re-teaching"
+    PRACTICE_ACTIVITY = "Practice Activity"
+    TUTORIAL = "Tutorial"
+    NA = "N/A"
+
+
+def get_intervention(prediction_score_percent, type: str):
+    if prediction_score_percent is None:
+        return {InterventionEnum.NA.value: "N/A"}
+
+    # based on type, return different intervention
+    if type == "analysis_document":
+        if prediction_score_percent < 75:
+            return {
+                InterventionEnum.REMEDIAL.value: "Intensive Intervention Required: Immediate one-on-one session and remedial materials."
+            }
+        elif prediction_score_percent <= 79:
+            return {
+                InterventionEnum.RE_TEACHING.value: "Targeted Support: Peer tutoring and additional practice exercises on weak topics."
+            }
+        elif prediction_score_percent <= 89:
+            return {
+                InterventionEnum.PRACTICE_ACTIVITY.value: "Regular Monitoring: Continue standard instruction with occasional check-ins."
+            }
+        else:
+            return {
+                InterventionEnum.TUTORIAL.value: "Enrichment Activities: Provide advanced materials to further challenge the student."
+            }
+    # if type is student
+    elif type == "student":
+        if prediction_score_percent < 75:
+            return {
+                InterventionEnum.REMEDIAL.value: "You need additional support to understand the lesson. Please review the basics."
+            }
+        elif prediction_score_percent <= 79:
+            return {
+                InterventionEnum.RE_TEACHING.value: "You need further clarification of some lesson parts."
+            }
+        elif prediction_score_percent <= 89:
+            return {
+                InterventionEnum.PRACTICE_ACTIVITY.value: "You are doing well. More practice will help you improve further."
+            }
+        else:
+            return {
+                InterventionEnum.TUTORIAL.value: "You are performing very well. Try guided or enrichment activities to challenge you further."
+            }
+    return {InterventionEnum.NA.value: "N/A"}
@@ -0,0 +1,116 @@
+from Authentication.models import Student
+from Test_Management.models import FormativeAssessmentScore, TestTopicMapping
+from Test_Management.services.full_details_service import (
+    get_full_details_cache, get_full_details_version, test_number_order
+)
+from django.conf import settings
+import gzip
+import json
+import numpy as np
+
+# the score matrix is cached next to the full_details payload and shares its version,
+# so invalidating full_details invalidates the matrix too
+DEFAULT_SCORE_MATRIX_TIMEOUT = 60 * 60 * 24
+SCORE_MATRIX_ENCODINGS = ("json", "gzip", "msgpack")
+MSGPACK_CONTENT_TYPE = "application/x-msgpack"
+
+
+# PAYLOAD
+def build_score_matrix(document):
+    """
+    The document's formative assessment scores as a dense students x tests matrix:
+    ``students``/``names`` index the rows (LRN order), ``tests``/``max_scores`` the
+    columns (test-number order) and ``scores[i, j]`` is NaN where student i has no
+    score for test j.
+    """
+    rows = list(
+        FormativeAssessmentScore.objects.filter(analysis_document=document)
+        .order_by("pk")
+        .values_list("student_id", "test_number", "score")
+    )
+    names = {
+        lrn: Student.format_full_name(first, middle, last)
+        for lrn, first, middle, last in Student.objects.filter(formativeassessmentscore__analysis_document=document)
+        .distinct()
+        .values_list("lrn", "first_name", "middle_name", "last_name")
+    }
+    max_scores = {
+        topic_number: max_score
+        for topic_number, max_score in TestTopicMapping.objects.filter(analysis_document=document)
+        .values_list("topic__test_number", "topic__max_score")
+    }
+
+    if rows:
+        lrns, test_numbers, scores = zip(*rows)
+    else:
+        lrns, test_numbers, scores = (), (), ()
+    students = sorted(set(lrns))
+    tests = sorted(set(test_numbers), key=test_number_order)
+    student_index = {lrn: i for i, lrn in enumerate(students)}
+    test_index = {test_number: j for j, test_number in enumerate(tests)}
+
+    matrix = np.full((len(students), len(tests)), np.nan)
+    # rows come oldest first, like full_details reads them, so a repeated
+    # (student, test) score resolves to the newest row there too (the last one assigned)
+    matrix[
+        np.fromiter((student_index[lrn] for lrn in lrns), dtype=np.intp, count=len(rows)),
+        np.fromiter((test_index[test_number] for test_number in test_numbers), dtype=np.intp, count=len(rows)),
+    ] = np.asarray(scores, dtype=float)
+
+    return {
+        "students": students,
+        "names": [names.get(lrn, "") for lrn in students],
+        "tests": tests,
+        "max_scores": [max_scores.get(test_number) for test_number in tests],
+        "scores": matrix,
+    }
+
+
+# CACHE
+def get_score_matrix(document):
+    """The document's score matrix, served from the cache when possible."""
+    cache = get_full_details_cache()
+    key = f"score_matrix:{document.pk}:{get_full_details_version(document.pk)}"
+    matrix = cache.get(key)
+    if matrix is None:
+        matrix = build_score_matrix(document)
+        cache.set(key, matrix, timeout=getattr(settings, "FULL_DETAILS_CACHE_TIMEOUT", DEFAULT_SCORE_MATRIX_TIMEOUT))
+    return matrix
+
+
+# ENCODINGS
+def score_matrix_json(matrix):
+    """JSON-ready payload: ``scores`` as nested lists, with null for a missing score."""
+    scores = matrix["scores"]
+    return {
+        **matrix,
+        "scores": np.where(np.isnan(scores), None, scores).tolist(),
+    }
+
+
+def score_matrix_gzip(matrix):
+    """The JSON payload, compactly dumped and gzip-compressed."""
+    content = json.dumps(score_matrix_json(matrix), separators=(",", ":")).encode()
+    return gzip.compress(content, compresslevel=6)
+
+
+def score_matrix_msgpack(matrix):
+    """
+    MessagePack payload with ``scores`` as the raw little-endian matrix (row-major,
+    NaN for a missing score) next to its ``shape`` and ``dtype``: float32 when
+    every score survives it exactly (whole and half points do), float64 otherwise,
+    ready for a ``Float32Array``/``Float64Array`` on the client.
+    """
+    import msgpack
+
+    scores = matrix["scores"]
+    narrow = scores.astype("<f4")
+    if np.array_equal(narrow, scores, equal_nan=True):
+        scores = narrow
+    scores = np.ascontiguousarray(scores, dtype=scores.dtype.newbyteorder("<"))
+    return msgpack.packb({
+        **matrix,
+        "shape": list(scores.shape),
+        "dtype": scores.dtype.str,
+        "scores": scores.tobytes(),
+    })
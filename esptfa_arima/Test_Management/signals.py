@@ -0,0 +1,28 @@
+from django.db.models.signals import post_save, post_delete
+from .models import (
+    FormativeAssessmentScore, PredictedScore, ActualPostTest, AnalysisDocumentInsights,
+    AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic, TestTopicMapping
+)
+from .services.full_details_service import invalidate_full_details
+
+# models whose rows make up a document's full_details payload;
+# bulk writes send no signals and invalidate explicitly instead
+FULL_DETAILS_SOURCES = (
+    FormativeAssessmentScore,
+    PredictedScore,
+    ActualPostTest,
+    AnalysisDocumentInsights,
+    AnalysisDocumentStatistic,
+    FormativeAssessmentStatistic,
+    StudentScoresStatistic,
+    TestTopicMapping,
+)
+
+
+def invalidate_document_full_details(sender, instance, **kwargs):
+    invalidate_full_details(instance.analysis_document_id)
+
+
+for model in FULL_DETAILS_SOURCES:
+    post_save.connect(invalidate_document_full_details, sender=model, dispatch_uid=f"full_details_save_{model.__name__}")
+    post_delete.connect(invalidate_document_full_details, sender=model, dispatch_uid=f"full_details_delete_{model.__name__}")
@@ -0,0 +1,79 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from Authentication.models import Teacher, Student
+from Test_Management.models import AnalysisDocument, Section, ActualPostTest
+
+
+class ActualPostTestBulkUploadTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_upload", password="password")
+        Teacher.objects.create(user_id=self.user)
+        self.section = Section.objects.create(section_name="Section Upload")
+        self.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Upload Doc", teacher=self.user, section=self.section, post_test_max_score=40.0
+        )
+        self.students = [Student.objects.create(lrn=f"9100000{i:04d}", section=self.section) for i in range(30)]
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = "/api/actual-post-test/bulk_upload/"
+
+    def upload(self, scores):
+        return self.client.post(
+            self.url, {"analysis_document_id": self.document.pk, "scores": scores}, format="json"
+        )
+
+    def count_queries(self, scores):
+        # the first request also caches role lookups on the forced user, so measure a repeat
+        self.upload(scores)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.upload(scores)
+        self.assertEqual(response.status_code, 201)
+        return len(queries.captured_queries)
+
+    def test_query_count_does_not_depend_on_upload_size(self):
+        small = self.count_queries([{"lrn": s.lrn, "score": 30} for s in self.students[:2]])
+        large = self.count_queries([{"lrn": s.lrn, "score": 30} for s in self.students])
+        self.assertEqual(small, large)
+
+    def test_upload_creates_and_updates(self):
+        ActualPostTest.objects.create(
+            analysis_document=self.document, student=self.students[0], score=10, max_score=40, status="Fail"
+        )
+        response = self.upload([
+            {"lrn": self.students[0].lrn, "score": 35},
+            {"lrn": self.students[1].lrn, "score": 20},
+        ])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["message"], "Successfully uploaded 2 scores")
+        self.assertEqual(
+            [(row["lrn"], row["status"], row["result"]) for row in response.data["results"]],
+            [(self.students[0].lrn, "Pass", "updated"), (self.students[1].lrn, "Fail", "created")],
+        )
+
+        rows = ActualPostTest.objects.filter(analysis_document=self.document).order_by("student_id")
+        self.assertEqual([(r.score, r.max_score, r.status) for r in rows], [(35, 40, "Pass"), (20, 40, "Fail")])
+
+    def test_every_missing_student_is_reported_and_nothing_is_written(self):
+        response = self.upload([
+            {"lrn": self.students[0].lrn, "score": 35},
+            {"lrn": "91999999998", "score": 20},
+            {"lrn": "91999999999", "score": 20},
+            {"lrn": self.students[1].lrn, "score": "n/a"},
+        ])
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data["missing_lrns"], ["91999999998", "91999999999"])
+        self.assertIn("91999999998", response.data["error"])
+        self.assertEqual([row["row"] for row in response.data["errors"]], [1, 2, 3])
+        self.assertFalse(ActualPostTest.objects.exists())
+
+    def test_unknown_document(self):
+        response = self.client.post(
+            self.url, {"analysis_document_id": 999999, "scores": []}, format="json"
+        )
+        self.assertEqual(response.status_code, 404)
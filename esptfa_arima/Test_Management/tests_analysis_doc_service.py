@@ -1,5 +1,6 @@
 from django.test import TestCase
 from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
 from Test_Management.models import TestDraft, IdempotencyKey, Subject, Quarter, Section, AnalysisDocument, TestTopic, TestTopicMapping, FormativeAssessmentScore
 from Authentication.models import Teacher, Student
 from Test_Management.services.analysis_doc_service import (
@@ -127,3 +128,25 @@ class AnalysisDocServiceTest(TestCase):
             test_content=self.draft_data
         )
         self.assertRaises(ValueError, create_analysis_document, draft)
+
+    def make_draft(self, forecast_method):
+        return TestDraft.objects.create(
+            user_teacher=self.user,
+            title=f"{forecast_method} Draft",
+            quarter=self.quarter,
+            subject=self.subject,
+            section_id=self.section,
+            test_content={**self.draft_data, 'forecast_method': forecast_method}
+        )
+
+    def test_create_analysis_document_keeps_every_forecast_method(self):
+        for method, _ in AnalysisDocument.FORECAST_METHOD_CHOICES:
+            doc = create_analysis_document(self.make_draft(method))
+            self.assertEqual(doc.forecast_method, method)
+
+    def test_create_analysis_document_rejects_unknown_forecast_method(self):
+        with self.assertRaises(ValidationError) as raised:
+            create_analysis_document(self.make_draft('prophet'))
+
+        self.assertIn("'prophet'", raised.exception.messages[0])
+        self.assertFalse(AnalysisDocument.objects.exists())
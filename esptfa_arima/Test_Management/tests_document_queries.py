@@ -0,0 +1,189 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from Authentication.models import Teacher, Student
+from Test_Management.models import (
+    AnalysisDocument, Subject, Quarter, Section, AnalysisGroup,
+    AnalysisDocumentStatistic, StudentScoresStatistic, PredictedScore,
+    TestTopicMapping, FormativeAssessmentScore, FormativeAssessmentStatistic, ActualPostTest
+)
+from Test_Management.serializers import AnalysisDocumentSerializer
+from arima_model.fixtures import make_teacher, make_document
+
+
+class DocumentStatisticsQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_queries", password="password")
+        Teacher.objects.create(user_id=self.user)
+        self.adviser = User.objects.create_user(username="adviser_queries", password="password")
+        self.section = Section.objects.create(section_name="Section Queries", adviser=self.adviser)
+        self.subject = Subject.objects.create(subject_name="Math Queries")
+        self.quarter = Quarter.objects.create(quarter_name="1st Quarter")
+        self.students = [Student.objects.create(lrn=f"8000000000{i}", section=self.section) for i in range(4)]
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_documents(self, count):
+        documents = []
+        for d in range(count):
+            document = AnalysisDocument.objects.create(
+                analysis_doc_title=f"Doc {d}",
+                teacher=self.user,
+                section=self.section,
+                subject=self.subject,
+                quarter=self.quarter,
+                status=True,
+            )
+            AnalysisDocumentStatistic.objects.create(
+                analysis_document=document, mean=40.0, standard_deviation=1.0, median=40.0,
+                minimum=30.0, maximum=50.0, mode=40.0, total_students=4, mean_passing_threshold=35.0,
+            )
+            for i, student in enumerate(self.students):
+                StudentScoresStatistic.objects.create(
+                    analysis_document=document, student=student, mean=40.0, standard_deviation=1.0,
+                    median=40.0, minimum=30.0, maximum=50.0, passing_rate=50.0 + i * 10, failing_rate=0.0,
+                )
+                PredictedScore.objects.create(
+                    analysis_document=document, student_id=student, score=30.0 + i * 10,
+                    test_number="3", passing_threshold=0.7,
+                )
+            documents.append(document)
+        return documents
+
+    def count_queries(self, url):
+        # the first request also caches role lookups on the forced user, so measure a repeat
+        self.client.get(url)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries.captured_queries)
+
+    def test_list_query_count_does_not_depend_on_page_size(self):
+        self.make_documents(2)
+        small, small_queries = self.count_queries("/api/analysis-document/")
+        self.make_documents(10)
+        large, large_queries = self.count_queries("/api/analysis-document/")
+
+        self.assertEqual(len(small.data["results"]), 2)
+        self.assertEqual(len(large.data["results"]), 12)
+        self.assertEqual(small_queries, large_queries)
+
+    def test_group_details_query_count_does_not_depend_on_group_size(self):
+        small_group = AnalysisGroup.objects.create(group_name="Small", teacher=self.user)
+        small_group.analysis_documents.set(self.make_documents(2))
+        large_group = AnalysisGroup.objects.create(group_name="Large", teacher=self.user)
+        large_group.analysis_documents.set(self.make_documents(8))
+
+        _, small_queries = self.count_queries(f"/api/analysis-group/{small_group.pk}/details/")
+        large, large_queries = self.count_queries(f"/api/analysis-group/{large_group.pk}/details/")
+
+        self.assertEqual(len(large.data["analysis_documents"]), 8)
+        self.assertEqual(small_queries, large_queries)
+
+    def test_summary_values(self):
+        document = self.make_documents(1)[0]
+        response = self.client.get("/api/analysis-document/")
+        statistics = response.data["results"][0]["statistics"]
+
+        # passing rates 50, 60, 70, 80 -> one student at or above 75
+        self.assertEqual(statistics, {"avg_class_score": 40.0, "predicted_mean": 45.0, "success_rate": 25.0})
+        # an unannotated instance computes the same summary
+        self.assertEqual(AnalysisDocumentSerializer(document).data["statistics"], statistics)
+
+    def test_documents_without_statistics(self):
+        AnalysisDocument.objects.create(analysis_doc_title="Pending", teacher=self.user, section=self.section)
+        response = self.client.get("/api/analysis-document/")
+        self.assertIsNone(response.data["results"][0]["statistics"])
+
+    def test_predicted_mean_falls_back_to_passing_threshold(self):
+        document = self.make_documents(1)[0]
+        PredictedScore.objects.filter(analysis_document=document).delete()
+        response = self.client.get("/api/analysis-document/")
+        self.assertEqual(response.data["results"][0]["statistics"]["predicted_mean"], 35.0)
+
+
+class StudentAnalysisDetailQueryTests(TestCase):
+    # document (with its summary), the student and their statistics, prediction, post test,
+    # features, scores and the class test statistics
+    EXPECTED_QUERIES = 8
+
+    def setUp(self):
+        self.user = make_teacher("teacher_detail")
+        self.section = Section.objects.create(section_name="Section Detail")
+        self.student = Student.objects.create(lrn="810000000001", section=self.section)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def make_document(self, n_tests):
+        document = make_document(
+            self.user, self.section, [self.student], n_tests, lambda i, t: 20 + t,
+            title=f"Detail {n_tests}", max_score=lambda t: 40 + t, passing_threshold=30.0, status=True,
+        )
+        # the last test has no statistics yet
+        for mapping in TestTopicMapping.objects.filter(analysis_document=document).select_related("topic"):
+            if int(mapping.topic.test_number) < n_tests:
+                FormativeAssessmentStatistic.objects.create(
+                    analysis_document=document, formative_assessment_number=mapping.topic.test_number,
+                    fa_topic=mapping.topic, mean=25.0, standard_deviation=1.0, median=25.0, minimum=20.0,
+                    maximum=30.0, passing_rate=50.0, failing_rate=50.0, passing_threshold=28.0,
+                )
+        StudentScoresStatistic.objects.create(
+            analysis_document=document, student=self.student, mean=25.0, standard_deviation=1.0,
+            median=25.0, minimum=20.0, maximum=30.0, passing_rate=50.0, failing_rate=50.0,
+        )
+        PredictedScore.objects.create(
+            analysis_document=document, student_id=self.student, score=45.0, max_score=60.0,
+            test_number=str(n_tests), passing_threshold=0.7,
+        )
+        ActualPostTest.objects.create(analysis_document=document, student=self.student, score=48.0, max_score=60.0)
+        return document
+
+    def get_detail(self, document):
+        url = f"/api/analysis-document/{document.pk}/student_analysis_detail/"
+        # the first request also caches role lookups on the forced user, so measure a repeat
+        self.client.get(url, {"lrn": self.student.lrn})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, {"lrn": self.student.lrn})
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries.captured_queries)
+
+    def test_query_count_does_not_depend_on_the_number_of_scores(self):
+        small, small_queries = self.get_detail(self.make_document(3))
+        large, large_queries = self.get_detail(self.make_document(15))
+
+        self.assertEqual(len(small.data["scores"]), 3)
+        self.assertEqual(len(large.data["scores"]), 15)
+        self.assertEqual(small_queries, self.EXPECTED_QUERIES)
+        self.assertEqual(large_queries, self.EXPECTED_QUERIES)
+
+    def test_scores_carry_topic_names_and_max_scores(self):
+        response, _ = self.get_detail(self.make_document(3))
+
+        scores = response.data["scores"]
+        self.assertEqual([score["topic_name"] for score in scores], ["Detail 3 1", "Detail 3 2", "Test 3"])
+        self.assertEqual([score["max_score"] for score in scores], [41, 42, 43])
+        self.assertEqual([stat["fa_topic_name"] for stat in response.data["class_averages"]], ["Detail 3 1", "Detail 3 2"])
+        self.assertEqual(response.data["actual_post_test"]["student_name"], self.student.full_name)
+        self.assertEqual(response.data["prediction_score_percent"], 75.0)
+
+    def test_scores_are_read_through_the_document_student_index(self):
+        document = self.make_document(3)
+        plan = FormativeAssessmentScore.objects.filter(analysis_document=document, student_id=self.student).explain()
+
+        self.assertIn("fa_score_doc_student_test_idx", plan)
+
+    def test_scores_and_class_averages_are_in_numeric_test_order(self):
+        # test numbers are stored as text, where "10" sorts before "2"
+        response, _ = self.get_detail(self.make_document(11))
+
+        self.assertEqual(
+            [score["formative_assessment_number"] for score in response.data["scores"]],
+            [str(t) for t in range(1, 12)],
+        )
+        self.assertEqual(
+            [stat["formative_assessment_number"] for stat in response.data["class_averages"]],
+            [str(t) for t in range(1, 11)],
+        )
@@ -0,0 +1,144 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from Test_Management.models import Section, FormativeAssessmentScore, ActualPostTest
+from Test_Management.checks import check_full_details_cache_is_shared
+from Test_Management.services.full_details_service import (
+    build_full_details, get_full_details_cache, get_full_details_version, invalidate_full_details
+)
+from arima_model.arima_model import arima_driver
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document
+
+
+FULL_DETAILS_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default-tests"},
+    "full_details": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "full-details-tests"},
+}
+
+
+@override_settings(CACHES=FULL_DETAILS_CACHES)
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class FullDetailsCacheTests(TestCase):
+    def setUp(self):
+        get_full_details_cache().clear()
+        self.user = make_teacher("teacher_cache")
+        self.section = Section.objects.create(section_name="Section Cache")
+        self.students = make_students(self.section, "700000000", 3)
+        self.document = make_document(self.user, self.section, self.students, 1, lambda i, t: 30 + i * 5, title="Cache Doc")
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/analysis-document/{self.document.pk}/full_details/"
+
+    def analyze(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            arima_driver(self.document)
+
+    def get(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return response, len(queries.captured_queries)
+
+    def test_cached_payload_skips_the_payload_queries(self, _):
+        self.analyze()
+        get_full_details_cache().clear()
+
+        first, first_queries = self.get()
+        second, second_queries = self.get()
+
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(len(second.data["student_performance"]), 3)
+        self.assertLess(second_queries, first_queries)
+
+    def test_driver_prewarms_the_payload(self, _):
+        self.analyze()
+        version = get_full_details_version(self.document.pk)
+        cached = get_full_details_cache().get(f"full_details:{self.document.pk}:{version}")
+
+        self.assertIsNotNone(cached)
+        self.assertEqual(len(cached["student_performance"]), 3)
+        response, _ = self.get()
+        self.assertEqual(response.data, cached)
+
+    def test_signal_invalidates_on_actual_post_test(self, _):
+        self.analyze()
+        before, _ = self.get()
+        self.assertIsNone(before.data["student_performance"][0]["actual_score"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            for student in self.students:
+                ActualPostTest.objects.create(
+                    analysis_document=self.document, student=student, score=55, max_score=60, status="Pass"
+                )
+
+        after, _ = self.get()
+        self.assertEqual([row["actual_score"] for row in after.data["student_performance"]], [55, 55, 55])
+
+    def test_signal_invalidates_on_score_delete(self, _):
+        self.analyze()
+        version = get_full_details_version(self.document.pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FormativeAssessmentScore.objects.filter(student_id=self.students[0]).first().delete()
+
+        self.assertEqual(get_full_details_version(self.document.pk), version + 1)
+
+    def test_evicted_version_counter_does_not_reuse_versions(self, _):
+        version = get_full_details_version(self.document.pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_full_details(self.document.pk)
+        get_full_details_cache().delete(f"full_details:version:{self.document.pk}")
+
+        self.assertGreater(get_full_details_version(self.document.pk), version + 1)
+
+    def test_processing_document_is_not_cached(self, _):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["message"], "Document is still being processed")
+
+    def test_payload_queries_do_not_sort(self, _):
+        self.analyze()
+        with CaptureQueriesContext(connection) as queries:
+            build_full_details(self.document)
+
+        with connection.cursor() as cursor:
+            for query in queries.captured_queries:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                plan = " / ".join(row[-1] for row in cursor.fetchall())
+                self.assertNotIn("TEMP B-TREE", plan, query["sql"])
+
+
+LOCMEM = {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+REDIS = {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://localhost:6379/1"}
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    def errors(self):
+        return [error.id for error in check_full_details_cache_is_shared(None)]
+
+    @override_settings(ARIMA_JOBS={"BACKEND": "redis"}, CACHES={"default": LOCMEM, "full_details": LOCMEM})
+    def test_worker_process_needs_a_shared_cache(self):
+        self.assertEqual(self.errors(), ["Test_Management.E001"])
+
+    @override_settings(ARIMA_JOBS={"BACKEND": "redis"}, CACHES={"default": LOCMEM})
+    def test_default_cache_is_checked_without_a_full_details_cache(self):
+        self.assertEqual(self.errors(), ["Test_Management.E001"])
+
+    @override_settings(ARIMA_JOBS={"BACKEND": "redis"}, CACHES={"default": LOCMEM, "full_details": REDIS})
+    def test_shared_cache_passes(self):
+        self.assertEqual(self.errors(), [])
+
+    @override_settings(DEBUG=True, ARIMA_JOBS={"BACKEND": "local"}, CACHES={"default": LOCMEM, "full_details": LOCMEM})
+    def test_in_process_jobs_can_use_a_local_cache(self):
+        self.assertEqual(self.errors(), [])
+
+    @override_settings(DEBUG=False, ARIMA_JOBS={"BACKEND": "local"}, CACHES={"default": LOCMEM, "full_details": LOCMEM})
+    def test_local_cache_outside_debug_warns(self):
+        self.assertEqual(self.errors(), ["Test_Management.W001"])
+
+    @override_settings(DEBUG=False, ARIMA_JOBS={"BACKEND": "local"}, CACHES={"default": LOCMEM, "full_details": REDIS})
+    def test_shared_cache_outside_debug_passes(self):
+        self.assertEqual(self.errors(), [])
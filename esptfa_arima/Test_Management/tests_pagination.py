@@ -0,0 +1,154 @@
+from django.test import TestCase
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from Authentication.models import Teacher, Student
+from Test_Management.models import AnalysisDocument, Section, PredictedScore, ActualPostTest
+
+
+def predicted_score_selects(queries):
+    return [q["sql"] for q in queries.captured_queries if 'from "test_management_predictedscore"' in q["sql"].lower()]
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_pages", password="password")
+        Teacher.objects.create(user_id=self.user)
+        self.section = Section.objects.create(section_name="Section Pages")
+        self.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Pages Doc", teacher=self.user, section=self.section
+        )
+        self.students = [
+            Student.objects.create(lrn=f"8300000000{i:02d}", first_name=f"First{i}", last_name="Last", section=self.section)
+            for i in range(25)
+        ]
+        for i, student in enumerate(self.students):
+            PredictedScore.objects.create(
+                analysis_document=self.document, student_id=student, score=30 + i % 7,
+                test_number="5", passing_threshold=35.0, max_score=50.0,
+            )
+            ActualPostTest.objects.create(analysis_document=self.document, student=student, score=40, max_score=50)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, params):
+        pages = []
+        response = self.client.get(url, params)
+        while True:
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.json())
+            if not pages[-1]["next"]:
+                return pages
+            response = self.client.get(pages[-1]["next"])
+
+    def test_page_numbers_by_default(self):
+        payload = self.client.get("/api/predicted-score/", {"analysis_document_id": self.document.pk}).json()
+
+        self.assertEqual(payload["count"], 25)
+        self.assertEqual(len(payload["results"]), 25)
+
+    def test_cursor_pages_cover_every_row_once(self):
+        pages = self.walk("/api/predicted-score/", {"analysis_document_id": self.document.pk, "cursor": "", "page_size": 10})
+
+        self.assertEqual([len(page["results"]) for page in pages], [10, 10, 5])
+        self.assertNotIn("count", pages[0])
+        ids = [row["predicted_score_id"] for page in pages for row in page["results"]]
+        self.assertEqual(ids, sorted(PredictedScore.objects.values_list("pk", flat=True)))
+
+        # the way back returns the previous page unchanged
+        previous = self.client.get(pages[1]["previous"]).json()
+        self.assertEqual(previous["results"], pages[0]["results"])
+
+    def test_cursor_pages_seek_instead_of_counting(self):
+        first = self.client.get("/api/predicted-score/", {"cursor": "", "page_size": 10}).json()
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(first["next"])
+
+        [select] = predicted_score_selects(queries)
+        self.assertIn('"predicted_score_id" >', select)
+        self.assertNotIn("OFFSET", select)
+        self.assertFalse(any("COUNT(" in q["sql"] for q in queries.captured_queries))
+
+    def test_students_page_by_lrn(self):
+        pages = self.walk("/api/student/", {"section": self.section.pk, "cursor": "", "page_size": 10})
+
+        lrns = [row["lrn"] for page in pages for row in page["results"]]
+        self.assertEqual(lrns, sorted(student.lrn for student in self.students))
+
+
+class SparseFieldsetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_fields", password="password")
+        Teacher.objects.create(user_id=self.user)
+        self.section = Section.objects.create(section_name="Section Fields")
+        self.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Fields Doc", teacher=self.user, section=self.section
+        )
+        for i in range(3):
+            student = Student.objects.create(lrn=f"8400000000{i:02d}", first_name=f"First{i}", last_name="Last", section=self.section)
+            PredictedScore.objects.create(
+                analysis_document=self.document, student_id=student, score=30 + i,
+                test_number="5", passing_threshold=35.0, max_score=50.0,
+            )
+            ActualPostTest.objects.create(analysis_document=self.document, student=student, score=40 + i, max_score=50)
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_fields_trim_output_and_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/predicted-score/", {"fields": "student_id,score", "cursor": ""})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["results"],
+            [{"student_id": f"8400000000{i:02d}", "score": 30.0 + i} for i in range(3)],
+        )
+        [select] = predicted_score_selects(queries)
+        columns = select.split(" FROM ")[0]
+        self.assertIn('"student_id_id"', columns)
+        self.assertNotIn('"passing_threshold"', columns)
+        self.assertNotIn('"upper_bound"', columns)
+
+    def test_fields_on_a_single_object(self):
+        score = PredictedScore.objects.first()
+        response = self.client.get(f"/api/predicted-score/{score.pk}/", {"fields": "score"})
+
+        self.assertEqual(response.json(), {"score": score.score})
+
+    def test_fields_read_through_relations(self):
+        response = self.client.get(
+            "/api/actual-post-test/", {"analysis_document_id": self.document.pk, "fields": "student_name,score"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(response.json()["results"], key=lambda row: row["score"]),
+            [{"student_name": f"First{i} Last", "score": 40.0 + i} for i in range(3)],
+        )
+
+    def test_relation_fields_join_instead_of_querying_per_row(self):
+        # the count, then one page select joined to the students
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/actual-post-test/", {"analysis_document_id": self.document.pk, "fields": "student_name"}
+            )
+
+        self.assertEqual(
+            sorted(row["student_name"] for row in response.json()["results"]),
+            [f"First{i} Last" for i in range(3)],
+        )
+
+    def test_method_fields_keep_every_column(self):
+        response = self.client.get("/api/student/", {"section": self.section.pk, "fields": "lrn,initial_password"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.json()["results"][0]), {"lrn", "initial_password"})
+
+    def test_unknown_field(self):
+        response = self.client.get("/api/predicted-score/", {"fields": "score,secret"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("secret", response.json()["fields"])
@@ -0,0 +1,115 @@
+from django.test import TestCase, override_settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from Authentication.models import Student
+from Test_Management.models import Section, FormativeAssessmentScore
+from Test_Management.services.full_details_service import build_full_details, get_full_details_cache, invalidate_full_details
+from Test_Management.services.score_matrix_service import build_score_matrix
+from arima_model.arima_model import prepare_scores
+from arima_model.arima_statistics import compute_student_statistics
+from arima_model.score_loader import load_score_frame
+from arima_model.fixtures import make_teacher, make_document, add_score
+import gzip
+import json
+import msgpack
+import numpy as np
+
+
+SCORE_MATRIX_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "default-matrix-tests"},
+    "full_details": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "matrix-tests"},
+}
+
+
+@override_settings(CACHES=SCORE_MATRIX_CACHES)
+class ScoreMatrixTests(TestCase):
+    def setUp(self):
+        get_full_details_cache().clear()
+        self.user = make_teacher("teacher_matrix")
+        self.section = Section.objects.create(section_name="Section Matrix")
+        self.students = [
+            Student.objects.create(lrn=f"8200000000{i:02d}", first_name=f"First{i}", last_name="Last", section=self.section)
+            for i in (2, 0, 1)
+        ]
+        # test numbers sort numerically: 2 before 10; the second student missed test 10
+        self.document = make_document(
+            self.user, self.section, self.students, ("10", "1", "2"),
+            lambda i, t: None if t == "10" and i == 1 else int(t) + 0.5 * i,
+            title="Matrix Doc", max_score=lambda t: 40 + int(t), passing_threshold=30.0, status=True,
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.url = f"/api/analysis-document/{self.document.pk}/score_matrix/"
+
+    def test_matrix_layout(self):
+        matrix = build_score_matrix(self.document)
+
+        self.assertEqual(matrix["students"], ["820000000000", "820000000001", "820000000002"])
+        self.assertEqual(matrix["names"], ["First0 Last", "First1 Last", "First2 Last"])
+        self.assertEqual(matrix["tests"], ["1", "2", "10"])
+        self.assertEqual(matrix["max_scores"], [41, 42, 50])
+        np.testing.assert_array_equal(matrix["scores"], [[1.5, 2.5, np.nan], [2.0, 3.0, 11.0], [1.0, 2.0, 10.0]])
+
+    def test_json_matches_full_details_scores(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+
+        from_matrix = {
+            lrn: {test: score for test, score in zip(payload["tests"], row) if score is not None}
+            for lrn, row in zip(payload["students"], payload["scores"])
+        }
+        self.assertIsNone(payload["scores"][0][2])
+        # full_details lists the students with statistics; give every student some
+        compute_student_statistics(prepare_scores(load_score_frame(self.document)), self.document)
+        full = {row["lrn"]: row["scores"] for row in build_full_details(self.document)["student_performance"]}
+        self.assertEqual(from_matrix, full)
+
+    def test_repeated_score_resolves_to_the_newest_row(self):
+        add_score(self.document, self.students[1], 1, 7.0, passing_threshold=30.0)
+        compute_student_statistics(prepare_scores(load_score_frame(self.document)), self.document)
+
+        self.assertEqual(build_score_matrix(self.document)["scores"][0, 0], 7.0)
+        full = {row["lrn"]: row["scores"] for row in build_full_details(self.document)["student_performance"]}
+        self.assertEqual(full["820000000000"]["1"], 7.0)
+
+    def test_msgpack_and_gzip_decode_to_the_same_matrix(self):
+        expected = build_score_matrix(self.document)
+
+        packed = self.client.get(self.url, {"encoding": "msgpack"})
+        self.assertEqual(packed["Content-Type"], "application/x-msgpack")
+        payload = msgpack.unpackb(packed.content)
+        scores = np.frombuffer(payload["scores"], dtype=payload["dtype"]).reshape(payload["shape"])
+        np.testing.assert_array_equal(scores, expected["scores"])
+        self.assertEqual(payload["students"], expected["students"])
+        # half points fit float32 exactly
+        self.assertEqual(payload["dtype"], "<f4")
+
+        compressed = self.client.get(self.url, {"encoding": "gzip"})
+        self.assertEqual(compressed["Content-Encoding"], "gzip")
+        self.assertEqual(json.loads(gzip.decompress(compressed.content)), self.client.get(self.url).json())
+
+    def test_msgpack_keeps_float64_when_float32_would_round(self):
+        FormativeAssessmentScore.objects.filter(student_id=self.students[0], test_number="1").update(score=33.3)
+
+        payload = msgpack.unpackb(self.client.get(self.url, {"encoding": "msgpack"}).content)
+
+        self.assertEqual(payload["dtype"], "<f8")
+        self.assertEqual(np.frombuffer(payload["scores"], dtype=payload["dtype"])[6], 33.3)
+
+    def test_cached_until_invalidated(self):
+        self.client.get(self.url)
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        self.assertFalse(any("formativeassessmentscore" in q["sql"].lower() for q in queries.captured_queries))
+
+        FormativeAssessmentScore.objects.filter(student_id=self.students[0], test_number="1").update(score=0)
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_full_details(self.document.pk)
+        self.assertEqual(self.client.get(self.url).json()["scores"][2][0], 0.0)
+
+    def test_unknown_encoding(self):
+        response = self.client.get(self.url, {"encoding": "xml"})
+        self.assertEqual(response.status_code, 400)
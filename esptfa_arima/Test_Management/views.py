@@ -1,21 +1,26 @@
-from django.http import HttpRequest, JsonResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.forms import forms
 from arima_model.tasks import process_analysis_document
-from django.core.exceptions import ObjectDoesNotExist
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from .forms import AnalysisDocumentForm
 from django.contrib.auth.decorators import login_required
 from Authentication.models import Teacher
 from arima_model.arima_model import arima_driver, preprocess_data
+from arima_model.jobs import latest_job
+from arima_model.features import FEATURE_COLUMNS, FEATURE_VERSION
+from arima_model.models import AnalysisJob, StudentFeatureSnapshot
+from arima_model.serializers import AnalysisJobSerializer
 from django.views.generic import ListView, DetailView
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Avg, Max, Min, F, ExpressionWrapper, FloatField
+from django.db.models import Avg, Max, Min, F, ExpressionWrapper, FloatField, Prefetch
 import logging
 from django.db import transaction
 from django.core.files.base import ContentFile
 from utils.decorators.decorators import teacher_required
-from utils.mixins.mixins import TeacherRequiredMixin
+from utils.mixins.mixins import TeacherRequiredMixin, SparseFieldsetMixin
+from utils.pagination.pagination import PageNumberOrKeysetPagination
 from utils.insights import get_visualization_insights, get_gemini_insights
 
 logger = logging.getLogger("arima_model")
@@ -32,18 +37,22 @@ from .services.analysis_doc_service import (
     create_topics,
     get_or_create_draft,
     start_arima_model,
+    start_reanalysis,
+    start_batch_analysis,
+    update_formative_assessment_scores,
 )
+from .services.intervention_service import InterventionEnum, get_intervention
+from .services.full_details_service import get_full_details, invalidate_full_details, test_number_order
+from .services.score_matrix_service import (
+    SCORE_MATRIX_ENCODINGS,
+    MSGPACK_CONTENT_TYPE,
+    get_score_matrix,
+    score_matrix_json,
+    score_matrix_gzip,
+    score_matrix_msgpack,
+)
+from .services.document_query_service import with_statistics_summary
 from django_filters.rest_framework import DjangoFilterBackend
-from enum import Enum
-
-
-# enum for intervention
-class InterventionEnum(Enum):
-    REMEDIAL = "Remedial"
-    RE_TEACHING = "Re-teaching"
-    PRACTICE_ACTIVITY = "Practice Activity"
-    TUTORIAL = "Tutorial"
-    NA = "N/A"
 
 
 class AnalysisDocumentViewSet(viewsets.ModelViewSet):
@@ -67,6 +76,10 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
     ordering_fields = ["upload_date", "status"]
 
     def get_queryset(self):
+        # statistics summaries are annotated so serializing a page costs no query per document
+        return with_statistics_summary(self.get_visible_documents())
+
+    def get_visible_documents(self):
         user = self.request.user
 
         # Superusers can see everything
@@ -82,6 +95,10 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
         # Teachers see their own documents
         return AnalysisDocument.objects.filter(teacher=user).order_by("-upload_date")
 
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        invalidate_full_details(serializer.instance.pk)
+
     def get_permissions(self):
         # Actions allowed for both teachers and students
         if self.action in ["list", "retrieve", "student_analysis_detail"]:
@@ -106,21 +123,26 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
             # call the create_analysis_document function
             document = create_analysis_document(draft)
 
-            # Start ARIMA process
-            start_arima_model(document)
+            # Queue the ARIMA process; the document is analyzed in the background
+            job = start_arima_model(document)
 
             return Response(
                 {
                     "message": "Analysis document created successfully",
                     "analysis_document_id": document.analysis_document_id,
+                    "job": AnalysisJobSerializer(job).data,
                 },
-                status=status.HTTP_201_CREATED,
+                status=status.HTTP_202_ACCEPTED,
             )
 
         except TestDraft.DoesNotExist:
             return Response(
                 {"error": "Draft not found"}, status=status.HTTP_404_NOT_FOUND
             )
+        except ValidationError as e:
+            return Response(
+                {"error": " ".join(e.messages)}, status=status.HTTP_400_BAD_REQUEST
+            )
         except Exception as e:
             logger.error(f"Error creating analysis document: {e}")
             return Response(
@@ -132,134 +154,175 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
         try:
             document = self.get_object()
             if not document.status:
+                job = latest_job(document)
                 return Response(
-                    {"message": "Document is still being processed"},
-                    status=status.HTTP_202_ACCEPTED,
-                )
-
-            # 1. Base Stats
-            doc_stats = AnalysisDocumentStatistic.objects.filter(
-                analysis_document=document
-            ).first()
-            doc_stats_data = (
-                AnalysisDocumentStatisticSerializer(doc_stats).data
-                if doc_stats
-                else None
-            )
-
-            # 2. Topic Mapping
-            topics_mapping = TestTopicMapping.objects.filter(
-                analysis_document=document
-            ).select_related("topic")
-            topics_data = []
-            for tm in topics_mapping:
-                topics_data.append(
                     {
-                        "test_number": tm.topic.test_number,
-                        "topic_name": tm.topic.topic_name,
-                        "max_score": tm.topic.max_score,
-                    }
+                        "message": "Document is still being processed",
+                        "job": AnalysisJobSerializer(job).data if job else None,
+                    },
+                    status=status.HTTP_202_ACCEPTED,
                 )
 
-            # 3. Formative Assessment Statistics (Class level per test)
-            fa_stats = FormativeAssessmentStatistic.objects.filter(
-                analysis_document=document
-            ).order_by("formative_assessment_number")
-            fa_stats_data = FormativeAssessmentStatisticSerializer(
-                fa_stats, many=True
-            ).data
-
-            # 4. Student Statistics, Predictions, and raw scores
-            student_stats = StudentScoresStatistic.objects.filter(
-                analysis_document=document
-            ).select_related("student", "student__user_id")
-            predictions = PredictedScore.objects.filter(
-                analysis_document=document
-            ).select_related("student_id")
-            all_scores = FormativeAssessmentScore.objects.filter(
-                analysis_document=document
-            ).values("student_id__lrn", "test_number", "score", "passing_threshold")
-
-            # Create a lookup for predictions and actual scores
-            pred_lookup = {p.student_id.lrn: p for p in predictions}
-            actual_lookup = {
-                a.student.lrn: a
-                for a in ActualPostTest.objects.filter(analysis_document=document)
-            }
+            # analyzed documents barely change, so the payload is cached per document version
+            return Response(get_full_details(document))
+        except Exception as e:
+            logger.error(f"Error in full_details: {e}")
+            return Response(
+                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
-            # Group scores by student for the matrix
-            scores_by_student = {}
-            for s in all_scores:
-                lrn = s["student_id__lrn"]
-                if lrn not in scores_by_student:
-                    scores_by_student[lrn] = {}
-                scores_by_student[lrn][s["test_number"]] = s["score"]
-
-            # Combine student stats and predictions
-            student_performance = []
-            for ss in student_stats:
-                pred = pred_lookup.get(ss.student.lrn)
-                prediction_score_percent = (
-                    (pred.score / pred.max_score) * 100
-                    if pred and pred.max_score
-                    else 0
-                )
-                actual = actual_lookup.get(ss.student.lrn)
-                student_performance.append(
-                    {
-                        "lrn": ss.student.lrn,
-                        "name": ss.student.full_name,
-                        "mean": ss.mean,
-                        "passing_rate": ss.passing_rate,
-                        "failing_rate": ss.failing_rate,
-                        "predicted_score": pred.score if pred else None,
-                        "predicted_status": pred.predicted_status if pred else "N/A",
-                        "prediction_score_percent": prediction_score_percent,
-                        "actual_score": actual.score if actual else None,
-                        "actual_max": actual.max_score if actual else None,
-                        "actual_status": actual.status if actual else None,
-                        "prediction_intervention": self.get_intervention(
-                            prediction_score_percent, "analysis_document"
-                        )
-                        if pred
-                        else {InterventionEnum.NA.value: "No data"},
-                        "actual_intervention": self.get_intervention(
-                            (actual.score / actual.max_score) * 100, "analysis_document"
-                        )
-                        if actual and actual.max_score
-                        else {InterventionEnum.NA.value: "No data"},
-                        "scores": scores_by_student.get(ss.student.lrn, {}),
-                        "sum_scores": ss.sum_scores,
-                        "max_possible_score": ss.max_possible_score,
-                    }
-                )
+    @action(detail=True, methods=["get"])
+    def score_matrix(self, request, pk=None):
+        """
+        The document's scores as a students x tests matrix, a compact alternative to
+        the per-student ``scores`` dicts of full_details. ``?encoding=`` picks
+        ``json`` (default), ``gzip`` (gzip-compressed JSON) or ``msgpack``
+        (MessagePack with the scores as a raw float64 buffer).
+        """
+        document = self.get_object()
+        encoding = request.query_params.get("encoding", "json")
+        if encoding not in SCORE_MATRIX_ENCODINGS:
+            return Response(
+                {"error": f"encoding must be one of: {', '.join(SCORE_MATRIX_ENCODINGS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-            # 5. Insights
-            insights_obj = AnalysisDocumentInsights.objects.filter(
-                analysis_document=document
-            ).first()
-            insights_data = (
-                AnalysisDocumentInsightsSerializer(insights_obj).data
-                if insights_obj
-                else None
+        matrix = get_score_matrix(document)
+        if encoding == "msgpack":
+            return HttpResponse(score_matrix_msgpack(matrix), content_type=MSGPACK_CONTENT_TYPE)
+        if encoding == "gzip":
+            response = HttpResponse(score_matrix_gzip(matrix), content_type="application/json")
+            response["Content-Encoding"] = "gzip"
+            return response
+        return Response(score_matrix_json(matrix))
+
+    @action(detail=True, methods=["post"])
+    def scores(self, request, pk=None):
+        """
+        Add or correct formative assessment scores of an analyzed document.
+        Only the affected students and tests are recomputed, in the background.
+        """
+        document = self.get_object()
+        scores = request.data.get("scores", [])  # List of {lrn: ..., test_number: ..., score: ...}
+        if not scores:
+            return Response(
+                {"error": "scores is required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        if not document.status:
+            return Response(
+                {"error": "Document is still being processed"},
+                status=status.HTTP_409_CONFLICT,
             )
 
+        try:
+            with transaction.atomic():
+                students, test_numbers = update_formative_assessment_scores(document, scores)
+                # bulk writes send no signals
+                invalidate_full_details(document.pk)
+                job = start_reanalysis(document, students, test_numbers)
+
             return Response(
                 {
-                    "document": AnalysisDocumentSerializer(document).data,
-                    "statistics": doc_stats_data,
-                    "topics": topics_data,
-                    "formative_assessments": fa_stats_data,
-                    "student_performance": student_performance,
-                    "insights": insights_data,
-                }
+                    "message": f"Successfully updated {len(scores)} scores",
+                    "job": AnalysisJobSerializer(job).data,
+                },
+                status=status.HTTP_202_ACCEPTED,
+            )
+        except Student.DoesNotExist as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except (TypeError, ValueError) as e:
+            return Response(
+                {"error": f"Invalid score: {str(e)}"}, status=status.HTTP_400_BAD_REQUEST
             )
         except Exception as e:
-            logger.error(f"Error in full_details: {e}")
+            logger.error(f"Error updating scores: {e}")
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=True, methods=["get"])
+    def job_status(self, request, pk=None):
+        document = self.get_object()
+        job = latest_job(document)
+        if not job:
+            return Response(
+                {"error": "No processing job found for this document"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        return Response(AnalysisJobSerializer(job).data)
+
+    @action(detail=False, methods=["get", "post"])
+    def batch_analyze(self, request):
+        """
+        POST queues one prediction run for many documents, given as
+        ``analysis_document_ids`` or an ``analysis_group_id``. GET with ``job_id``
+        returns that run; its result reports the timing of every document.
+        """
+        if request.method == "GET":
+            return self.batch_analysis_status(request.query_params.get("job_id"))
+
+        document_ids = request.data.get("analysis_document_ids") or []
+        group_id = request.data.get("analysis_group_id")
+        if group_id:
+            groups = AnalysisGroup.objects.all()
+            if not request.user.is_superuser:
+                groups = groups.filter(teacher=request.user)
+            group = groups.filter(pk=group_id).first()
+            if group is None:
+                return Response(
+                    {"error": "Analysis group not found"}, status=status.HTTP_404_NOT_FOUND
+                )
+            document_ids = list(group.analysis_documents.values_list("pk", flat=True))
+
+        if not document_ids:
+            return Response(
+                {"error": "analysis_document_ids or analysis_group_id is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            document_ids = {int(document_id) for document_id in document_ids}
+        except (TypeError, ValueError):
+            return Response(
+                {"error": "analysis_document_ids must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        documents = list(self.get_visible_documents().filter(pk__in=document_ids))
+        missing = sorted(document_ids - {document.pk for document in documents})
+        if missing:
+            return Response(
+                {"error": f"Analysis documents not found: {missing}"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        with transaction.atomic():
+            job = start_batch_analysis(documents)
+        return Response(
+            {
+                "message": f"Queued analysis of {len(documents)} documents",
+                "job": AnalysisJobSerializer(job).data,
+            },
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+    def batch_analysis_status(self, job_id):
+        try:
+            job = AnalysisJob.objects.filter(pk=job_id, kind="batch_analysis").first()
+        except (ValueError, ValidationError):
+            job = None
+        # only visible to users who can see every document in the run
+        if job is not None:
+            document_ids = job.payload.get("documents", [])
+            if self.get_visible_documents().filter(pk__in=document_ids).count() != len(document_ids):
+                job = None
+        if job is None:
+            return Response(
+                {"error": "Batch analysis job not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(AnalysisJobSerializer(job).data)
+
     @action(detail=True, methods=["get"])
     def student_analysis_detail(self, request, pk=None):
         try:
@@ -292,21 +355,40 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
                 analysis_document=document, student_id=student
             ).first()
 
-            # Actual Post Test
-            actual = ActualPostTest.objects.filter(
-                analysis_document=document, student=student
-            ).first()
+            # Actual Post Test (with the student, for student_name)
+            actual = (
+                ActualPostTest.objects.filter(analysis_document=document, student=student)
+                .select_related("student")
+                .first()
+            )
 
-            # Individual scores
-            scores_objs = FormativeAssessmentScore.objects.filter(
-                analysis_document=document, student_id=student
-            ).order_by("test_number")
+            # the model features stored at the last analysis
+            features = StudentFeatureSnapshot.objects.filter(
+                analysis_document=document, student=student, feature_version=FEATURE_VERSION
+            ).values(*FEATURE_COLUMNS).first()
+
+            # Individual scores, with the topics their max_score comes from;
+            # test_number is text, so the numeric test order is applied here
+            scores_objs = sorted(
+                FormativeAssessmentScore.objects.filter(
+                    analysis_document=document, student_id=student
+                ).select_related("topic_mapping__topic"),
+                key=lambda score: test_number_order(score.test_number),
+            )
 
             # Class FA stats for comparison
             # We use the serializer we just updated for fa_topic_name
-            fa_stats = FormativeAssessmentStatistic.objects.filter(
-                analysis_document=document
-            ).order_by("formative_assessment_number")
+            fa_stats = sorted(
+                FormativeAssessmentStatistic.objects.filter(analysis_document=document)
+                .select_related("fa_topic"),
+                key=lambda stat: test_number_order(stat.formative_assessment_number),
+            )
+            # topic name of each test number, looked up once per score below
+            topic_names = {
+                stat.formative_assessment_number: stat.fa_topic.topic_name
+                for stat in fa_stats
+                if stat.fa_topic
+            }
 
             # prediction score percent
             prediction_score_percent = 0
@@ -316,24 +398,10 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
                 ) * 100
 
             # Format scores to include topic name
-            scores_data = []
-            for s in scores_objs:
-                data = FormativeAssessmentScoreSerializer(s).data
-                # Find topic name from fa_stats if possible
-                topic_stat = next(
-                    (
-                        stat
-                        for stat in fa_stats
-                        if stat.formative_assessment_number == s.test_number
-                    ),
-                    None,
-                )
-                data["topic_name"] = (
-                    topic_stat.fa_topic.topic_name
-                    if topic_stat and topic_stat.fa_topic
-                    else f"Test {s.test_number}"
-                )
-                scores_data.append(data)
+            scores_data = FormativeAssessmentScoreSerializer(scores_objs, many=True).data
+            for data in scores_data:
+                test_number = data["formative_assessment_number"]
+                data["topic_name"] = topic_names.get(test_number, f"Test {test_number}")
 
             return Response(
                 {
@@ -348,15 +416,16 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
                     if prediction
                     else None,
                     "prediction_score_percent": prediction_score_percent,
+                    "features": features,
                     "actual_post_test": ActualPostTestSerializer(actual).data
                     if actual
                     else None,
-                    "prediction_intervention": self.get_intervention(
+                    "prediction_intervention": get_intervention(
                         prediction_score_percent, "student"
                     )
                     if prediction
                     else "No intervention data available.",
-                    "actual_intervention": self.get_intervention(
+                    "actual_intervention": get_intervention(
                         (actual.score / actual.max_score) * 100, "student"
                     )
                     if actual and actual.max_score
@@ -378,53 +447,12 @@ class AnalysisDocumentViewSet(viewsets.ModelViewSet):
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def get_intervention(self, prediction_score_percent, type: str):
-        if prediction_score_percent is None:
-            return {InterventionEnum.NA.value: "N/A"}
-
-        # based on type, return different intervention
-        if type == "analysis_document":
-            if prediction_score_percent < 75:
-                return {
-                    InterventionEnum.REMEDIAL.value: "Intensive Intervention Required: Immediate one-on-one session and remedial materials."
-                }
-            elif prediction_score_percent <= 79:
-                return {
-                    InterventionEnum.RE_TEACHING.value: "Targeted Support: Peer tutoring and additional practice exercises on weak topics."
-                }
-            elif prediction_score_percent <= 89:
-                return {
-                    InterventionEnum.PRACTICE_ACTIVITY.value: "Regular Monitoring: Continue standard instruction with occasional check-ins."
-                }
-            else:
-                return {
-                    InterventionEnum.TUTORIAL.value: "Enrichment Activities: Provide advanced materials to further challenge the student."
-                }
-        # if type is student
-        elif type == "student":
-            if prediction_score_percent < 75:
-                return {
-                    InterventionEnum.REMEDIAL.value: "You need additional support to understand the lesson. Please review the basics."
-                }
-            elif prediction_score_percent <= 79:
-                return {
-                    InterventionEnum.RE_TEACHING.value: "You need further clarification of some lesson parts."
-                }
-            elif prediction_score_percent <= 89:
-                return {
-                    InterventionEnum.PRACTICE_ACTIVITY.value: "You are doing well. More practice will help you improve further."
-                }
-            else:
-                return {
-                    InterventionEnum.TUTORIAL.value: "You are performing very well. Try guided or enrichment activities to challenge you further."
-                }
-        return {InterventionEnum.NA.value: "N/A"}
-
 
-class PredictedScoreViewSet(viewsets.ModelViewSet):
+class PredictedScoreViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = PredictedScore.objects.all()
     serializer_class = PredictedScoreSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -435,6 +463,8 @@ class PredictedScoreViewSet(viewsets.ModelViewSet):
         )
         if analysis_document_id:
             queryset = queryset.filter(analysis_document_id=analysis_document_id)
+        # newest predictions first, the order pages were always served in
+        queryset = queryset.order_by("-date", "-predicted_score_id")
 
         if hasattr(user, "student"):
             return queryset.filter(student_id=user.student)
@@ -621,7 +651,7 @@ class AnalysisDocumentStatisticViewSet(viewsets.ModelViewSet):
         )
         return AnalysisDocumentStatistic.objects.filter(
             analysis_document_id=analysis_document_id
-        )
+        ).order_by("-analysis_document_statistic_id")
 
 
 class FormativeAssessmentStatisticViewSet(viewsets.ModelViewSet):
@@ -637,18 +667,19 @@ class FormativeAssessmentStatisticViewSet(viewsets.ModelViewSet):
         )
         return FormativeAssessmentStatistic.objects.filter(
             analysis_document_id=analysis_document_id
-        )
+        ).order_by("-formative_assessment_statistic_id")
 
 
-class StudentScoresStatisticViewSet(viewsets.ModelViewSet):
+class StudentScoresStatisticViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     serializer_class = StudentScoresStatisticSerializer
 
     # define the permissions
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PageNumberOrKeysetPagination
 
     def get_queryset(self):
         user = self.request.user
-        queryset = StudentScoresStatistic.objects.all()
+        queryset = StudentScoresStatistic.objects.order_by("-student_scores_statistic_id")
 
         analysis_document_id = self.request.query_params.get(
             "analysis_document_id", None
@@ -663,10 +694,11 @@ class StudentScoresStatisticViewSet(viewsets.ModelViewSet):
         return queryset
 
 
-class ActualPostTestViewSet(viewsets.ModelViewSet):
+class ActualPostTestViewSet(SparseFieldsetMixin, viewsets.ModelViewSet):
     queryset = ActualPostTest.objects.all()
     serializer_class = ActualPostTestSerializer
     permission_classes = [permissions.IsAuthenticated, IsTeacher]
+    pagination_class = PageNumberOrKeysetPagination
 
     def get_queryset(self):
         # Filter by analysis document if provided
@@ -694,44 +726,88 @@ class ActualPostTestViewSet(viewsets.ModelViewSet):
 
         try:
             document = AnalysisDocument.objects.get(pk=analysis_document_id)
+            max_score = document.post_test_max_score or 1
+
+            # validate every row up front so one upload reports every problem at once
+            rows, errors = [], []
+            for index, score_item in enumerate(scores):
+                lrn = str(score_item.get("lrn") or "").strip()
+                try:
+                    score = float(score_item.get("score"))
+                except (TypeError, ValueError):
+                    errors.append({"row": index, "lrn": lrn, "error": "score must be a number"})
+                    continue
+                if not lrn:
+                    errors.append({"row": index, "lrn": lrn, "error": "lrn is required"})
+                    continue
+                rows.append((index, lrn, score))
+
+            # resolve all LRNs with one query
+            lrns = {lrn for _, lrn, _ in rows}
+            found = set(Student.objects.filter(lrn__in=lrns).values_list("lrn", flat=True))
+            missing = sorted(lrns - found)
+            errors.extend(
+                {"row": index, "lrn": lrn, "error": "Student not found"}
+                for index, lrn, _ in rows
+                if lrn not in found
+            )
+
+            if errors:
+                errors.sort(key=lambda e: e["row"])
+                error = f"Student not found: {', '.join(missing)}" if missing else "Invalid scores"
+                return Response(
+                    {"error": error, "missing_lrns": missing, "errors": errors},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            existing = set(
+                ActualPostTest.objects.filter(
+                    analysis_document=document, student_id__in=lrns
+                ).values_list("student_id", flat=True)
+            )
+
+            # the last row wins when an LRN appears more than once
+            objects = {}
+            for _, lrn, score in rows:
+                objects[lrn] = ActualPostTest(
+                    analysis_document=document,
+                    student_id=lrn,
+                    score=score,
+                    max_score=max_score,
+                    status="Pass" if score >= (max_score * 0.75) else "Fail",
+                )
 
-            created_objects = []
             with transaction.atomic():
-                # Delete existing actual scores for this doc if any?
-                # Or just update? Let's update or create.
-                for score_item in scores:
-                    lrn = score_item.get("lrn")
-                    score = score_item.get("score")
-                    max_score = document.post_test_max_score or 1
-
-                    student = Student.objects.get(lrn=lrn)
-
-                    status_val = "Pass" if score >= (max_score * 0.75) else "Fail"
-
-                    obj, created = ActualPostTest.objects.update_or_create(
-                        analysis_document=document,
-                        student=student,
-                        defaults={
-                            "score": score,
-                            "max_score": max_score,
-                            "status": status_val,
-                        },
-                    )
-                    created_objects.append(obj)
+                ActualPostTest.objects.bulk_create(
+                    objects.values(),
+                    update_conflicts=True,
+                    unique_fields=["analysis_document", "student"],
+                    update_fields=["score", "max_score", "status"],
+                )
+                # bulk writes send no signals
+                invalidate_full_details(document.pk)
 
+            results = [
+                {
+                    "row": index,
+                    "lrn": lrn,
+                    "score": score,
+                    "status": objects[lrn].status,
+                    "result": "updated" if lrn in existing else "created",
+                }
+                for index, lrn, score in rows
+            ]
             return Response(
-                {"message": f"Successfully uploaded {len(created_objects)} scores"},
+                {
+                    "message": f"Successfully uploaded {len(objects)} scores",
+                    "results": results,
+                },
                 status=status.HTTP_201_CREATED,
             )
         except AnalysisDocument.DoesNotExist:
             return Response(
                 {"error": "Document not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Student.DoesNotExist as e:
-            return Response(
-                {"error": f"Student not found: {str(e)}"},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
         except Exception as e:
             return Response(
                 {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
@@ -749,10 +825,21 @@ class AnalysisGroupViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         if self.request.user.is_superuser:
-            return AnalysisGroup.objects.all().order_by("-created_at")
-        return AnalysisGroup.objects.filter(teacher=self.request.user).order_by(
-            "-created_at"
-        )
+            groups = AnalysisGroup.objects.all().order_by("-created_at")
+        else:
+            groups = AnalysisGroup.objects.filter(teacher=self.request.user).order_by(
+                "-created_at"
+            )
+
+        if self.action == "details":
+            # one query for all documents of the group, summaries included
+            groups = groups.prefetch_related(
+                Prefetch(
+                    "analysis_documents",
+                    queryset=with_statistics_summary(AnalysisDocument.objects.all()),
+                )
+            )
+        return groups
 
     def perform_create(self, serializer):
         serializer.save(teacher=self.request.user)
@@ -0,0 +1,126 @@
+import logging
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from statsmodels.tsa.arima.model import ARIMA
+
+from .features import build_score_matrix, PREDICTION_INTERVAL_LEVEL, FORECAST_COLUMNS
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_FORECASTER_SETTINGS = {
+    # series shorter than this are predicted by the XGBoost model instead
+    "MIN_SERIES_LENGTH": 6,
+    # order grid: p in 0..MAX_P, q in 0..MAX_Q, always differenced DIFFERENCING times
+    "MAX_P": 1,
+    "MAX_Q": 1,
+    "DIFFERENCING": 1,
+    "MAX_ITER": 50,
+    # worker processes; None uses every core
+    "WORKERS": None,
+    "CHUNK_SIZE": 100,
+    # "spawn" keeps the workers independent of the web process' threads and connections
+    "START_METHOD": "spawn",
+}
+
+
+def forecaster_settings():
+    return {**DEFAULT_FORECASTER_SETTINGS, **getattr(settings, "ARIMA_FORECASTER", {})}
+
+
+def candidate_orders(max_p, max_q, d=1):
+    return [(p, d, q) for p in range(max_p + 1) for q in range(max_q + 1)]
+
+
+def fit_series(series, orders, warm_start, max_iter=50, level=PREDICTION_INTERVAL_LEVEL):
+    """
+    Fit every order to one series and forecast the next value with the lowest-AIC fit.
+
+    ``warm_start`` maps orders to start parameters; it is updated in place with
+    the parameters of each successful fit. Returns ``((forecast, lower, upper), order)``,
+    or NaNs and ``None`` when no order could be fitted.
+    """
+    best_aic, best_forecast, best_order = np.inf, (np.nan, np.nan, np.nan), None
+    for order in orders:
+        try:
+            fitted = ARIMA(series, order=order).fit(
+                start_params=warm_start.get(order), method_kwargs={"maxiter": max_iter}
+            )
+        except (ValueError, np.linalg.LinAlgError):
+            warm_start.pop(order, None)
+            continue
+
+        if not np.all(np.isfinite(fitted.params)):
+            warm_start.pop(order, None)
+            continue
+        warm_start[order] = fitted.params
+
+        if fitted.aic < best_aic:
+            forecast = fitted.get_forecast(1)
+            lower, upper = forecast.conf_int(alpha=1 - level)[0]
+            best_aic, best_order = fitted.aic, order
+            best_forecast = (float(forecast.predicted_mean[0]), float(lower), float(upper))
+
+    return best_forecast, best_order
+
+
+def fit_chunk(series_list, orders, max_iter=50):
+    """Forecast a chunk of series, sharing warm-start parameters across them."""
+    forecasts = np.full((len(series_list), len(FORECAST_COLUMNS)), np.nan)
+    warm_start = {}
+
+    with warnings.catch_warnings():
+        # statsmodels warns about convergence and start values on most short series
+        warnings.simplefilter("ignore")
+        for i, series in enumerate(series_list):
+            forecasts[i], _ = fit_series(series, orders, warm_start, max_iter)
+
+    return forecasts
+
+
+def forecast_scores(scores, workers=None):
+    """
+    ARIMA forecast of each student's next normalized score.
+
+    Every series is fitted with each order of a small capped grid and the
+    lowest-AIC fit gives the forecast. Series are split into chunks fitted by
+    worker processes; within a chunk each order starts from the parameters of
+    its previous fit, which converges in fewer iterations than the defaults.
+
+    ``scores`` is a prepared score frame (see ``prepare_scores``). Returns a
+    frame of FORECAST_COLUMNS indexed by student id, NaN for students whose
+    series is shorter than ``MIN_SERIES_LENGTH`` or could not be fitted.
+    """
+    config = forecaster_settings()
+    orders = candidate_orders(config["MAX_P"], config["MAX_Q"], config["DIFFERENCING"])
+    matrix = build_score_matrix(scores)
+
+    eligible = np.flatnonzero(matrix.lengths >= max(config["MIN_SERIES_LENGTH"], 2))
+    series = [matrix.values[i, :matrix.lengths[i]] for i in eligible]
+    chunk_size = max(int(config["CHUNK_SIZE"]), 1)
+    chunks = [series[start:start + chunk_size] for start in range(0, len(series), chunk_size)]
+
+    workers = min(workers or config["WORKERS"] or os.cpu_count() or 1, len(chunks))
+    if workers <= 1:
+        results = [fit_chunk(chunk, orders, config["MAX_ITER"]) for chunk in chunks]
+    else:
+        context = multiprocessing.get_context(config["START_METHOD"])
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            results = list(pool.map(fit_chunk, chunks, repeat(orders), repeat(config["MAX_ITER"])))
+
+    forecasts = np.full((len(matrix.keys), len(FORECAST_COLUMNS)), np.nan)
+    if results:
+        forecasts[eligible] = np.concatenate(results)
+
+    fitted = int(np.isfinite(forecasts[:, 0]).sum())
+    logger.info(
+        f"ARIMA forecast {fitted} of {len(matrix.keys)} student(s) with {max(workers, 1)} worker(s); "
+        f"{len(matrix.keys) - len(eligible)} series too short"
+    )
+    return pd.DataFrame(forecasts, index=matrix.keys, columns=FORECAST_COLUMNS)
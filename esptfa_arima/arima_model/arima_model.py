@@ -1,27 +1,42 @@
 from itertools import product
 import pandas as pd
 import numpy as np
-import pickle
 from statsmodels.tsa.arima.model import ARIMA
 from sklearn.metrics import mean_absolute_error
 from django.db import transaction
 from django.db.models import Avg
-from Test_Management.models import Student, FormativeAssessmentScore, PredictedScore, AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic, TestTopicMapping
+from Test_Management.models import AnalysisDocument, Student, FormativeAssessmentScore, PredictedScore, AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic, TestTopicMapping
 from typing import List
 import logging
 import traceback
 import re
 import os
 from scipy.stats import mode
-from .arima_statistics import compute_document_statistics, compute_test_statistics, compute_student_statistics
+from .model_registry import get_model
+from .score_loader import load_score_frame
+from .features import build_student_features, feature_matrix, MASTERY_THRESHOLD, PASSING_THRESHOLD
+from .arima_statistics import compute_all_statistics
+from .statistics_writer import save_interval_calibration
+from .feature_store import save_feature_snapshots
+from .arima_forecaster import forecast_scores
+from .trend_forecaster import forecast_ar1, forecast_holt
+from .intervals import build_backtest, calibrate, prediction_bounds
+from .instrumentation import instrumented_run, pipeline_stage
+from Test_Management.services.full_details_service import refresh_full_details, invalidate_full_details
 
 
-MASTERY_THRESHOLD = 0.81
-PASSING_THRESHOLD = 0.70
 DEFAULT_POST_TEST_MAX_SCORE = 60.0
 
 logger = logging.getLogger("arima_model")
 
+# per-student time-series forecasters a document can use instead of the XGBoost model;
+# each returns a frame of FORECAST_COLUMNS (normalized) indexed by student id
+TIME_SERIES_FORECASTERS = {
+    AnalysisDocument.ARIMA: forecast_scores,
+    AnalysisDocument.AR1: forecast_ar1,
+    AnalysisDocument.HOLT: forecast_holt,
+}
+
 arima_results = []
 lstm_model = None  # Global LSTM model
 window_size = 5  # Number of past scores to use for LSTM predictions
@@ -31,37 +46,23 @@ def preprocess_data(analysis_document):
     """
     Preprocesses formative assessment scores from the database into a DataFrame suitable for ARIMA modeling.
     """
-    # get the formative assessment scores from the db
-    fa_scores = FormativeAssessmentScore.objects.filter(
-        analysis_document=analysis_document
-    ).select_related(
-        "student_id",
-        "student_id__section",
-        "topic_mapping__topic"
-    )
+    # load the scores column-wise (raises FormativeAssessmentScore.DoesNotExist when empty)
+    with pipeline_stage("load_scores") as stage:
+        df = prepare_scores(load_score_frame(analysis_document))
+        stage["rows"] = len(df)
 
-    if not fa_scores.exists():
-        logger.warning(f"No formative assessment scores found for analysis document {analysis_document.pk}")
-        raise FormativeAssessmentScore.DoesNotExist
-
-    data = []
-    for score in fa_scores:
-        student = score.student_id
-        topic = score.topic_mapping.topic if score.topic_mapping else None
-        
-        data.append({
-            "student_id": student.lrn,
-            "first_name": student.first_name,
-            "last_name": student.last_name,
-            "section": student.section.section_name if student.section else "N/A",
-            "test_number": int(score.test_number),
-            "score": score.score,
-            "max_score": topic.max_score if topic and topic.max_score else 100.0,
-            "date": score.date,
-        })
-    
-    df = pd.DataFrame(data)
+    # compute every student's features in one vectorized pass
+    with pipeline_stage("build_features") as stage:
+        feature_df = build_student_features(df)
+        stage["rows"] = len(feature_df)
+
+    return df, feature_df
 
+
+def prepare_scores(df):
+    """
+    Normalize a loaded score frame and order it for the time series features.
+    """
     # Handling missing values
     df["score"] = df["score"].ffill().bfill().fillna(0) # Forward/backward fill or 0
 
@@ -74,35 +75,8 @@ def preprocess_data(analysis_document):
     # make test number into int
     df["test_number"] = df["test_number"].astype(int)
 
-    # Sort by student and date for ARIMA processing
-    df = df.sort_values(["student_id", "date"])
-
-
-    # iterate over each student and transform into long format
-    features_list = []
-    for student_id, student_data in df.groupby("student_id"):
-        scores = student_data["normalized_scores"]
-        
-        # calculate the weighted mean of the scores
-        features_list.append({
-            "student_id": student_id,
-            "weighted_mean_score": weighted_mean_score(scores),
-            "std_score": score_std(scores),
-            "last_score": last_score(scores),
-            "trend_slope": trend_slope(scores),
-            "first_last_delta": first_last_delta(scores),
-            "recent_trend_slope": recent_trend_slope(scores),
-            "coefficient_of_variation": coefficient_of_variation(scores),
-            "mastery_consistency": mastery_consistency(scores),
-            "recent_decay": recent_decay(scores),
-            "downside_risk": downside_risk(scores),
-            "normalized_passing_threshold": 0.70, # adding this for predicted status
-            "test_number": student_data["test_number"].max() # use the last test number as ref
-        })
-        
-    feature_df = pd.DataFrame(features_list)
-
-    return df, feature_df
+    # Sort by student and date for ARIMA processing; scores from the same day keep test order
+    return df.sort_values(["student_id", "date", "test_number"])
 
 def mean_score(scores):
     scores = np.asarray(scores)
@@ -193,31 +167,65 @@ def make_stationary(student_data):
 
 
 
-def make_predictions(features_df, analysis_document):
+def make_predictions(features_df, analysis_document, scores=None, calibration=None):
     """
     Make predictions for all students using the features_df (aggregated) and analysis_document
     Returns features_df with predictions and status added.
+
+    Every prediction gets lower and upper bounds (``prediction_lower``/``prediction_upper``).
+    Unless a stored ``calibration`` is given, the model is backtested on each
+    student's held-out last score from ``scores`` (the prepared score frame) to
+    calibrate them; the backtest rows share the single ``predict`` call.
+
+    Documents set to a time-series forecast method (see TIME_SERIES_FORECASTERS)
+    forecast from ``scores`` and keep the XGBoost prediction for series too short
+    to fit; forecast students take the forecaster's own interval.
     """
-    # drop the non-feature columns
-    X = features_df.drop(columns=["student_id", "normalized_passing_threshold", "test_number"], errors='ignore')
-    x_numpy = X.to_numpy()
-
-    # get the model from the model file
-    model_path = os.path.join(os.path.dirname(__file__), "model", "esptfa_xgboost.pkl")
-    if not os.path.exists(model_path):
-        logger.error(f"Model not found at path: {model_path}")
-        raise FileNotFoundError(f"Model not found at path: {model_path}")
-    
-    try:
-        with open(model_path, "rb") as f:
-            model = pickle.load(f)
-    except Exception as e:
-        logger.error(f"Error loading model: {e}")
-        raise
+    with pipeline_stage("build_backtest") as stage:
+        x_numpy = feature_matrix(features_df)
+        backtest = build_backtest(scores) if calibration is None and scores is not None else None
+        if backtest is not None:
+            x_numpy = np.concatenate([x_numpy, feature_matrix(backtest.features)])
+            stage["rows"] = len(backtest)
+
+    # get the process-wide model (deserialized once, reloaded when the file changes)
+    with pipeline_stage("load_model"):
+        loaded_model = get_model()
+    logger.info(
+        f"Predicting {len(features_df)} students for analysis document {analysis_document.pk} "
+        f"with model version {loaded_model.version}"
+    )
 
     # make the predictions
-    # predictions is a numpy array of length = number of students
-    normalized_predictions = model.predict(x_numpy)
+    # predictions is a numpy array of length = number of students (then backtests)
+    with pipeline_stage("predict", rows=len(x_numpy)):
+        predictions = loaded_model.predict(x_numpy)
+    normalized_predictions = predictions[:len(features_df)]
+
+    with pipeline_stage("finish_predictions", rows=len(features_df)):
+        if backtest is not None:
+            calibration = calibrate(backtest, predictions[len(features_df):])
+        return finish_predictions(
+            features_df, analysis_document, normalized_predictions, loaded_model.version, scores, calibration
+        )
+
+
+def finish_predictions(features_df, analysis_document, normalized_predictions, model_version, scores=None, calibration=None):
+    """
+    Turn the model's normalized predictions for the students of ``features_df``
+    into the document's post-test scale, bound them with ``calibration``, apply
+    the document's time-series forecast method and assign the predicted status
+    (see ``make_predictions``).
+    """
+    lower, upper = prediction_bounds(calibration, features_df, normalized_predictions)
+    forecaster = TIME_SERIES_FORECASTERS.get(analysis_document.forecast_method)
+    if forecaster is not None and scores is not None:
+        forecasts = forecaster(scores).reindex(features_df["student_id"])
+        forecast = forecasts["forecast"].to_numpy()
+        covered = ~np.isnan(forecast)
+        normalized_predictions = np.where(covered, forecast, normalized_predictions)
+        lower = np.where(covered, forecasts["lower"].to_numpy(), lower)
+        upper = np.where(covered, forecasts["upper"].to_numpy(), upper)
     
     # set post test max score
     post_test_max_score = analysis_document.post_test_max_score if analysis_document.post_test_max_score else DEFAULT_POST_TEST_MAX_SCORE
@@ -227,7 +235,11 @@ def make_predictions(features_df, analysis_document):
     features_df["predictions"] = normalized_predictions * post_test_max_score
     # ensure that the predictions is between 0 and max score
     features_df["predictions"] = features_df["predictions"].clip(lower=0, upper=post_test_max_score)
+    features_df["prediction_lower"] = np.clip(lower * post_test_max_score, 0, post_test_max_score)
+    features_df["prediction_upper"] = np.clip(upper * post_test_max_score, 0, post_test_max_score)
     features_df["post_test_max_score"] = post_test_max_score
+    features_df.attrs["model_version"] = model_version
+    features_df.attrs["interval_calibration"] = calibration
 
     # assign the predicted status
     features_df = assign_predicted_status(features_df)
@@ -266,35 +278,74 @@ def assign_predicted_status(student_data):
 def save_predictions(student_data, analysis_document):
     """
         Save the predictions to db with PredictedScore
+
+        The rows are built column-wise and upserted on (analysis_document,
+        student, test_number) with one statement, so reruns update the existing
+        rows. A student keeps only their latest prediction: rows of the same
+        students for earlier test numbers are removed.
     """
+    lrns = student_data["student_id"].astype(str).to_numpy()
 
     # get the students by LRN (primary key)
-    unique_lrns = student_data["student_id"].unique()
-    students_query = Student.objects.filter(lrn__in=unique_lrns)
-    student_map = {s.lrn: s for s in students_query}
-
-    # pred scores to save arr
-    pred_scores = []
-
-    # save the predictions to db
-    for _, row in student_data.iterrows():
-        student = student_map.get(row["student_id"])
-        if not student:
-            logger.error(f"Student {row['student_id']} not found in database.")
-            continue
-
-        pred_scores.append(PredictedScore(
-            student_id=student,
-            score=row["predictions"],
-            max_score=row["post_test_max_score"],
-            passing_threshold=row["normalized_passing_threshold"],
-            predicted_status=row["predicted_status"],
-            analysis_document=analysis_document,
-            test_number=row["test_number"],
-        ))
+    known = set(Student.objects.filter(lrn__in=lrns.tolist()).values_list("lrn", flat=True))
+    found = np.fromiter((lrn in known for lrn in lrns), dtype=bool, count=len(lrns))
+    for lrn in lrns[~found]:
+        logger.error(f"Student {lrn} not found in database.")
+
+    def column(name):
+        values = student_data[name].to_numpy()[found]
+        return values.tolist()
+
+    def nullable(name):
+        if name not in student_data:
+            return [None] * int(found.sum())
+        values = student_data[name].to_numpy(dtype=float)[found]
+        return np.where(np.isnan(values), None, values).tolist()
+
+    test_numbers = [str(test_number) for test_number in column("test_number")]
+    pred_scores = [
+        PredictedScore(
+            analysis_document_id=analysis_document.pk,
+            student_id_id=lrn,
+            score=score,
+            lower_bound=lower,
+            upper_bound=upper,
+            max_score=max_score,
+            passing_threshold=threshold,
+            predicted_status=predicted_status,
+            test_number=test_number,
+        )
+        for lrn, score, lower, upper, max_score, threshold, predicted_status, test_number in zip(
+            lrns[found].tolist(),
+            column("predictions"),
+            nullable("prediction_lower"),
+            nullable("prediction_upper"),
+            column("post_test_max_score"),
+            column("normalized_passing_threshold"),
+            column("predicted_status"),
+            test_numbers,
+        )
+    ]
 
-    
-    PredictedScore.objects.bulk_create(pred_scores)
+    students_by_test = {}
+    for prediction in pred_scores:
+        students_by_test.setdefault(prediction.test_number, []).append(prediction.student_id_id)
+
+    with transaction.atomic():
+        PredictedScore.objects.bulk_create(
+            pred_scores,
+            update_conflicts=True,
+            unique_fields=["analysis_document", "student_id", "test_number"],
+            update_fields=[
+                "score", "lower_bound", "upper_bound", "max_score",
+                "passing_threshold", "predicted_status", "date",
+            ],
+        )
+        # one delete per distinct test number (usually one) drops superseded predictions
+        for test_number, students in students_by_test.items():
+            PredictedScore.objects.filter(
+                analysis_document=analysis_document, student_id__in=students
+            ).exclude(test_number=test_number).delete()
 
     
 
@@ -415,25 +466,73 @@ def save_predictions(student_data, analysis_document):
 # function for computing necessary statistics
 
 
-def arima_driver(analysis_document):
-    """ Driver function for the ARIMA model prediction. Starts the process of predicting scores for students."""
-    try:
-        processed_data, features_df = preprocess_data(analysis_document)
-        predictions_df = make_predictions(features_df, analysis_document)
+def store_analysis(analysis_document, processed_data, predictions_df):
+    """
+    Write everything an analysis produces for the document and mark it processed.
+    Returns the new document status.
+    """
+    with pipeline_stage("save_predictions", rows=len(predictions_df)):
         save_predictions(predictions_df, analysis_document)
 
-        compute_document_statistics(processed_data, analysis_document)
-        compute_test_statistics(processed_data, analysis_document)
-        compute_student_statistics(processed_data, analysis_document)
+    # keep the features, so the document can be re-predicted without its scores
+    with pipeline_stage("save_feature_snapshots", rows=len(predictions_df)):
+        save_feature_snapshots(analysis_document, predictions_df)
+
+    compute_all_statistics(processed_data, analysis_document)
+    # kept so reanalysis bounds its predictions the same way
+    save_interval_calibration(analysis_document, predictions_df.attrs.get("interval_calibration"))
+
+    return finish_analysis(analysis_document)
 
-        logger.info("Analysis document processed successfully for analysis document {}".format(analysis_document.analysis_document_id))
 
+def finish_analysis(analysis_document, prewarm=True):
+    """
+    Mark the document processed once its analysis is written. Returns the new document status.
+    Without ``prewarm`` the cached page payload is only invalidated, to be rebuilt on the next page load.
+    """
+    logger.info("Analysis document processed successfully for analysis document {}".format(analysis_document.analysis_document_id))
+
+
+    # Update the status of the analysis document to True (processed)
+    document_status = True
+    analysis_document.status = document_status
+    analysis_document.save()
+
+    # the statistics and predictions were bulk written, so refresh the cached page payload
+    with pipeline_stage("refresh_full_details"):
+        if prewarm:
+            refresh_full_details(analysis_document)
+        else:
+            invalidate_full_details(analysis_document.pk)
+    return document_status
 
-        # Update the status of the analysis document to True (processed)
-        document_status = True
-        analysis_document.status = document_status
-        analysis_document.save()
-        return document_status
+
+def arima_driver(analysis_document, profile=None):
+    """
+    Driver function for the ARIMA model prediction. Starts the process of predicting scores for students.
+    Documents with more students than the pipeline's CHUNK_STUDENTS are analysed in bounded chunks
+    (see ``chunked_pipeline.arima_chunked_driver``).
+
+    Every stage's time, rows, queries and memory are logged as JSON when the run ends
+    (see ``instrumentation.instrumented_run``); ``profile`` also profiles the run.
+    """
+    try:
+        from .chunked_pipeline import (
+            CHUNKED_PIPELINE, arima_chunked_driver, document_students, pipeline_settings
+        )
+
+        with instrumented_run(analysis_document, profile=profile) as run:
+            with pipeline_stage("list_students") as stage:
+                students = document_students(analysis_document)
+                stage["rows"] = len(students)
+            if len(students) > pipeline_settings()["CHUNK_STUDENTS"]:
+                # the chunked driver's stages land in this run, so it takes that pipeline's name
+                run.name = CHUNKED_PIPELINE
+                return arima_chunked_driver(analysis_document, students=students)
+
+            processed_data, features_df = preprocess_data(analysis_document)
+            predictions_df = make_predictions(features_df, analysis_document, processed_data)
+            return store_analysis(analysis_document, processed_data, predictions_df)
     
     except FormativeAssessmentScore.DoesNotExist:
         logger.error(
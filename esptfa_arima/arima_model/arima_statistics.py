@@ -1,165 +1,244 @@
+import math
 import pandas as pd
 import numpy as np
 import logging
-from django.db import transaction
-from django.db.models import Count, Sum, Avg, StdDev, Min, Max
-from Test_Management.models import AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic, TestTopicMapping, Student, PredictedScore
+from dataclasses import dataclass
+from django.db.models import Avg, Case, Count, F, FloatField, Max, Min, Sum, Value, When
+from Test_Management.models import FormativeAssessmentScore
+from .features import PASSING_THRESHOLD
+from .score_loader import DEFAULT_MAX_SCORE
+from .statistics_writer import save_document_statistics, save_test_statistics, save_student_statistics, save_all_statistics
+from .instrumentation import pipeline_stage
 
 logger = logging.getLogger("arima_model")
 
-def compute_document_statistics(processed_data, analysis_document):
+# per-group aggregates shared by every statistics level
+SUMMARY_AGGREGATES = ["count", "sum", "mean", "median", "std", "min", "max"]
+
+
+@dataclass
+class GroupStatistics:
+    """
+    Statistics of one level (tests or students) as parallel arrays:
+    ``columns[name][i]`` is the value of statistic ``name`` for ``keys[i]``.
+    """
+
+    keys: np.ndarray
+    columns: dict
+
+    def __len__(self):
+        return len(self.keys)
+
+    def rows(self):
+        """Yield ``(key, {statistic: value})`` pairs with plain Python values."""
+        names = list(self.columns)
+        values = [self.columns[name].tolist() for name in names]
+        for key, row in zip(self.keys.tolist(), zip(*values)):
+            row = dict(zip(names, row))
+            if "mode" in row and np.isnan(row["mode"]):
+                row["mode"] = None
+            yield key, row
+
+
+@dataclass
+class AnalysisStatistics:
+    document: dict
+    tests: GroupStatistics
+    students: GroupStatistics
+
+
+def group_mode(values, codes, n_groups):
+    """
+    Most frequent value of each group, picking the smallest one on ties like
+    ``Series.mode()[0]``. Groups without any non-NaN value get NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    codes = np.asarray(codes)
+    present = ~np.isnan(values)
+    values, codes = values[present], codes[present]
+
+    modes = np.full(n_groups, np.nan)
+    if values.size == 0:
+        return modes
+
+    # sort by group then value, so equal values form runs
+    order = np.lexsort((values, codes))
+    values, codes = values[order], codes[order]
+    run_starts = np.flatnonzero(np.r_[True, (codes[1:] != codes[:-1]) | (values[1:] != values[:-1])])
+    run_lengths = np.diff(np.r_[run_starts, values.size])
+    run_codes = codes[run_starts]
+    run_values = values[run_starts]
+
+    # longest run first within each group, smallest value first among equally long runs
+    order = np.lexsort((run_values, -run_lengths, run_codes))
+    run_codes, run_values = run_codes[order], run_values[order]
+    first = np.r_[True, run_codes[1:] != run_codes[:-1]]
+    modes[run_codes[first]] = run_values[first]
+    return modes
+
+
+def _summarize(processed_data, by, extra_aggregates):
+    """
+    One groupby().agg pass over ``processed_data`` plus the vectorized mode.
+    Returns the group keys, the aggregate frame and each row's group code.
+    """
+    grouped = processed_data.groupby(by, sort=True, observed=True)
+    aggregates = {name: ("score", name) for name in SUMMARY_AGGREGATES}
+    aggregates.update(extra_aggregates)
+    summary = grouped.agg(**aggregates)
+    codes = grouped.ngroup().to_numpy()
+
+    summary["mode"] = group_mode(processed_data["score"].to_numpy(dtype=float), codes, len(summary))
+    # a single score has no spread; pandas reports NaN for ddof=1
+    summary["std"] = summary["std"].fillna(0.0)
+    return np.asarray(summary.index), summary, codes
+
+
+def _columns(summary, extra):
+    columns = {
+        "mean": summary["mean"].to_numpy(dtype=float),
+        "median": summary["median"].to_numpy(dtype=float),
+        "mode": summary["mode"].to_numpy(dtype=float),
+        "standard_deviation": summary["std"].to_numpy(dtype=float),
+        "minimum": summary["min"].to_numpy(dtype=float),
+        "maximum": summary["max"].to_numpy(dtype=float),
+    }
+    columns.update(extra)
+    return columns
+
+
+def _rates(passing, counts):
+    counts = counts.astype(float)
+    return passing / counts * 100, (counts - passing) / counts * 100
+
+
+def document_statistics(processed_data):
     # get the necessary statistics for the analysis document
     # e.g., mean, median, standard deviation
+    _, summary, _ = _summarize(processed_data, np.zeros(len(processed_data), dtype=int), {})
+    values = {name: array[0].item() for name, array in _columns(summary, {}).items()}
+    if np.isnan(values["mode"]):
+        values["mode"] = None
 
-    scores = processed_data["score"]
-
-    # compute for mean using pandas
-    mean = scores.mean()
-
-    # compute for median
-    median = scores.median()
-
-    # compute for standard deviation
-    standard_deviation = scores.std()
-    if np.isnan(standard_deviation):
-        standard_deviation = 0.0
+    # total students in the document
+    values["total_students"] = processed_data["student_id"].nunique()
+    # mean passing threshold
+    values["mean_passing_threshold"] = PASSING_THRESHOLD * processed_data["max_score"].mean()
+    return values
+
+
+def document_statistics_from_db(analysis_document):
+    """
+    Document statistics aggregated by the database, so a partial recompute does not
+    have to load every score of the document. Returns None when it has no scores.
+    """
+    scores = FormativeAssessmentScore.objects.filter(analysis_document=analysis_document).order_by()
+    # same fallback as the score loader for topics without a max score
+    max_score = Case(
+        When(topic_mapping__topic__max_score__gt=0, then=F("topic_mapping__topic__max_score")),
+        default=Value(DEFAULT_MAX_SCORE),
+        output_field=FloatField(),
+    )
+    summary = scores.aggregate(
+        count=Count("score"),
+        mean=Avg("score"),
+        sum=Sum("score"),
+        square_sum=Sum(F("score") * F("score")),
+        minimum=Min("score"),
+        maximum=Max("score"),
+        total_students=Count("student_id", distinct=True),
+        mean_max_score=Avg(max_score),
+    )
+    count = summary.pop("count")
+    if not count:
+        return None
+
+    # the middle value, or the mean of the two middle values
+    middle = list(scores.order_by("score").values_list("score", flat=True)[(count - 1) // 2:count // 2 + 1])
+    # most frequent score, the smallest one on ties
+    mode = (
+        scores.values("score")
+        .annotate(frequency=Count("score"))
+        .order_by("-frequency", "score")
+        .values_list("score", flat=True)
+        .first()
+    )
 
-    # compute for minimum
-    minimum = scores.min()
+    summary["median"] = sum(middle) / len(middle)
+    summary["mode"] = mode
+    # sample (ddof=1) deviation from the sums; a single score has no spread
+    score_sum, square_sum = summary.pop("sum"), summary.pop("square_sum")
+    variance = (square_sum - score_sum * score_sum / count) / (count - 1) if count > 1 else 0.0
+    summary["standard_deviation"] = math.sqrt(max(variance, 0.0))
+    summary["mean_passing_threshold"] = PASSING_THRESHOLD * summary.pop("mean_max_score")
+    return summary
+
+
+def test_statistics(processed_data):
+    """Statistics for each formative assessment (test number)."""
+    keys, summary, codes = _summarize(processed_data, "test_number", {"max_score": ("max_score", "first")})
+    max_score = summary["max_score"].to_numpy(dtype=float)
+    passing_threshold = PASSING_THRESHOLD * max_score
+
+    # compare every score with the threshold of its own test
+    passed = processed_data["score"].to_numpy(dtype=float) >= passing_threshold[codes]
+    passing = np.bincount(codes, weights=passed, minlength=len(keys))
+    passing_rate, failing_rate = _rates(passing, summary["count"].to_numpy())
+
+    return GroupStatistics(keys, _columns(summary, {
+        "passing_rate": passing_rate,
+        "failing_rate": failing_rate,
+        "passing_threshold": passing_threshold,
+        "max_score": max_score,
+    }))
+
+
+def student_statistics(processed_data):
+    """Statistics for each student."""
+    keys, summary, codes = _summarize(processed_data, "student_id", {"max_possible_score": ("max_score", "sum")})
+
+    passed = (
+        processed_data["normalized_scores"].to_numpy(dtype=float)
+        >= processed_data["normalized_passing_threshold"].to_numpy(dtype=float)
+    )
+    passing = np.bincount(codes, weights=passed, minlength=len(keys))
+    passing_rate, failing_rate = _rates(passing, summary["count"].to_numpy())
 
-    # compute for maximum
-    maximum = scores.max()
+    return GroupStatistics(keys, _columns(summary, {
+        "passing_rate": passing_rate,
+        "failing_rate": failing_rate,
+        "sum_scores": summary["sum"].to_numpy(dtype=float),
+        "max_possible_score": summary["max_possible_score"].to_numpy(dtype=float),
+    }))
 
-    # Compute mode (handling cases where multiple modes exist)
-    mode_series = scores.mode()
-    mode_value = mode_series[0] if not mode_series.empty else None
 
-    # total students in the document
-    total_students = processed_data["student_id"].nunique()
+def analysis_statistics(processed_data):
+    rows = len(processed_data)
+    with pipeline_stage("document_statistics", rows=rows):
+        document = document_statistics(processed_data)
+    with pipeline_stage("test_statistics", rows=rows):
+        tests = test_statistics(processed_data)
+    with pipeline_stage("student_statistics", rows=rows):
+        students = student_statistics(processed_data)
+    return AnalysisStatistics(document=document, tests=tests, students=students)
 
-    # mean passing threshold
-    passing_threshold = 0.70 * processed_data["max_score"].mean()
-
-    # save statistics
-
-    analysis_document_statistic, _ = AnalysisDocumentStatistic.objects.update_or_create(
-        analysis_document=analysis_document,
-        defaults={
-            "mean": mean,
-            "median": median,
-            "standard_deviation": standard_deviation,
-            "minimum": minimum,
-            "maximum": maximum,
-            "mode": mode_value,
-            "total_students": total_students,
-            "mean_passing_threshold": passing_threshold
-        }
-    )
 
-    return analysis_document_statistic
+def compute_document_statistics(processed_data, analysis_document):
+    return save_document_statistics(analysis_document, document_statistics(processed_data))
 
 
 def compute_test_statistics(processed_data, analysis_document):
-    # group by test number
-    for fa_number, fa_data in processed_data.groupby("test_number"):
-
-        # compute for mean using pandas
-        scores = fa_data["score"]
-        max_score = fa_data["max_score"].iloc[0]
-        passing_threshold = 0.70 * max_score
-        total_scores = scores.count()
-        mean = scores.mean()
-        median = scores.median()
-        mode_series = scores.mode()
-        mode_value = mode_series[0] if not mode_series.empty else None
-
-        # check if std is NaN due to single test scores
-        standard_deviation = scores.std()
-        if np.isnan(standard_deviation):
-            standard_deviation = 0.0
-
-        minimum = scores.min()
-        maximum = scores.max()
-        passing_scores = len(scores[scores >= passing_threshold])
-        passing_rate = (passing_scores / total_scores) * 100
-        failing_rate = (total_scores - passing_scores) / total_scores * 100
-
-        mapping = TestTopicMapping.objects.filter(
-            analysis_document=analysis_document, 
-            topic__test_number=str(fa_number)
-        ).first()
-        fa_topic = mapping.topic if mapping else None
-        
-        # commit to db
-        with transaction.atomic():
-            _, _ = FormativeAssessmentStatistic.objects.update_or_create(
-                analysis_document=analysis_document,
-                formative_assessment_number=str(fa_number),
-                fa_topic=fa_topic,
-                defaults={
-                    "mean": mean,
-                    "median": median,
-                    "mode": mode_value,
-                    "standard_deviation": standard_deviation,
-                    "minimum": minimum,
-                    "maximum": maximum,
-                    "passing_rate": passing_rate,
-                    "failing_rate": failing_rate,
-                    "passing_threshold": passing_threshold,
-                    "max_score": max_score
-                }
-            )
-            
+    # one query for the topic mappings, one upsert for all tests
+    save_test_statistics(analysis_document, test_statistics(processed_data))
 
 
 def compute_student_statistics(processed_data, analysis_document):
-    # group by student id
-
-    for student_id, student_data in processed_data.groupby("student_id"):
-        # get student instance
-        student = Student.objects.get(lrn=student_id)
-        scores = student_data["score"]
-        normalized_scores = student_data["normalized_scores"]
-        normalized_passing_threshold = student_data["normalized_passing_threshold"]
-        total_scores = scores.count()
-        mean = scores.mean()
-        median = scores.median()
-        mode_series = scores.mode()
-        mode_value = mode_series[0] if not mode_series.empty else None
-
-        # check if std is NaN due to single test scores
-        standard_deviation = scores.std()
-        if np.isnan(standard_deviation):
-            standard_deviation = 0.0
-
-        minimum = scores.min()
-        maximum = scores.max()
-        passing_scores = (normalized_scores >= normalized_passing_threshold).sum() 
-        passing_rate = (passing_scores / total_scores) * 100
-        failing_rate = (total_scores - passing_scores) / total_scores * 100
-        sum_scores = student_data["score"].sum()
-        max_possible_score = student_data["max_score"].sum()
-
-        # commit to db
-        with transaction.atomic():
-            _, _ = StudentScoresStatistic.objects.update_or_create(
-                analysis_document=analysis_document,
-                student=student,
-                defaults={
-                    "mean": mean,
-                    "median": median,
-                    "mode": mode_value,
-                    "standard_deviation": standard_deviation,
-                    "minimum": minimum,
-                    "maximum": maximum,
-                    "passing_rate": passing_rate,
-                    "failing_rate": failing_rate,
-                    "sum_scores": sum_scores,
-                    "max_possible_score": max_possible_score
-                }
-            )
-            
-
-
+    # one query to validate the students, one upsert for all students
+    save_student_statistics(analysis_document, student_statistics(processed_data))
 
 
+def compute_all_statistics(processed_data, analysis_document):
+    """Compute the document, test and student statistics and write them in one transaction."""
+    statistics = analysis_statistics(processed_data)
+    with pipeline_stage("save_statistics", rows=len(statistics.tests) + len(statistics.students) + 1):
+        return save_all_statistics(analysis_document, statistics.document, statistics.tests, statistics.students)
@@ -0,0 +1,243 @@
+import logging
+import math
+import time
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+
+from Test_Management.models import FormativeAssessmentScore
+from .arima_model import prepare_scores, finish_predictions, save_predictions, finish_analysis
+from .arima_statistics import GroupStatistics, student_statistics
+from .feature_store import save_feature_snapshots
+from .features import build_student_features, feature_matrix, PASSING_THRESHOLD
+from .intervals import build_backtest, calibrate, INTERVAL_MAX_CALIBRATION
+from .instrumentation import instrumented_run, pipeline_stage
+from .model_registry import get_model
+from .score_loader import load_score_frame
+from .statistics_writer import (
+    save_document_statistics, save_test_statistics, save_student_statistics, save_interval_calibration
+)
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_PIPELINE_SETTINGS = {
+    # students loaded, predicted and summarized together; documents with more
+    # students than this are analysed in chunks by arima_driver
+    "CHUNK_STUDENTS": 5000,
+}
+
+# the pipeline name instrumented chunked runs are reported (and recorded) under
+CHUNKED_PIPELINE = "chunked_analysis"
+
+
+def pipeline_settings():
+    return {**DEFAULT_PIPELINE_SETTINGS, **getattr(settings, "ARIMA_PIPELINE", {})}
+
+
+def document_students(analysis_document):
+    """LRNs of every student with a score in the document, in LRN order (one query)."""
+    return list(
+        FormativeAssessmentScore.objects.filter(analysis_document=analysis_document)
+        .order_by("student_id").values_list("student_id", flat=True).distinct()
+    )
+
+
+class ScoreSummary:
+    """
+    Mergeable summary of a set of scores: count, mean and sum of squared
+    deviations (merged with Chan's formula), extremes and a histogram of the
+    distinct values, which gives the exact median and mode. Its size depends on
+    the number of distinct scores, not on the number of scores.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.histogram = {}
+
+    def add(self, scores):
+        scores = np.asarray(scores, dtype=float)
+        scores = scores[~np.isnan(scores)]
+        if not scores.size:
+            return
+        count, mean = scores.size, float(scores.mean())
+        m2 = float(((scores - mean) ** 2).sum())
+
+        total = self.count + count
+        delta = mean - self.mean
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.mean += delta * count / total
+        self.count = total
+        self.minimum = min(self.minimum, float(scores.min()))
+        self.maximum = max(self.maximum, float(scores.max()))
+        for value, frequency in zip(*np.unique(scores, return_counts=True)):
+            self.histogram[float(value)] = self.histogram.get(float(value), 0) + int(frequency)
+
+    def values(self):
+        """The statistics in the layout of ``arima_statistics._columns``."""
+        values = np.array(sorted(self.histogram))
+        frequencies = np.array([self.histogram[value] for value in values])
+        ends = np.cumsum(frequencies)
+        # pandas' median: the middle value, or the mean of the two middle values
+        middle = values[np.searchsorted(ends, [(self.count - 1) // 2, self.count // 2], side="right")]
+        return {
+            "mean": self.mean,
+            "median": float(middle.mean()),
+            # most frequent value, the smallest one on ties
+            "mode": float(values[np.argmax(frequencies)]),
+            # sample (ddof=1) deviation; a single score has no spread
+            "standard_deviation": math.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else 0.0,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+
+class StatisticsAccumulator:
+    """
+    Document and per-test statistics built from chunks of students, matching
+    ``document_statistics`` and ``test_statistics`` on the whole score frame.
+    """
+
+    def __init__(self):
+        self.document = ScoreSummary()
+        self.rows = 0
+        self.students = 0
+        self.max_score_sum = 0.0
+        self.tests = {}
+        self.test_max_scores = {}
+        self.test_passing = {}
+
+    def add(self, scores):
+        self.document.add(scores["score"])
+        self.rows += len(scores)
+        # chunks hold disjoint sets of students
+        self.students += scores["student_id"].nunique()
+        self.max_score_sum += float(scores["max_score"].sum())
+
+        for test_number, test_scores in scores.groupby("test_number", sort=True, observed=True):
+            # like groupby().first(): the max score of the test's first row in the document
+            max_score = self.test_max_scores.setdefault(test_number, float(test_scores["max_score"].iloc[0]))
+            self.tests.setdefault(test_number, ScoreSummary()).add(test_scores["score"])
+            passed = int((test_scores["score"].to_numpy(dtype=float) >= PASSING_THRESHOLD * max_score).sum())
+            self.test_passing[test_number] = self.test_passing.get(test_number, 0) + passed
+
+    def document_statistics(self):
+        values = self.document.values()
+        values["total_students"] = self.students
+        values["mean_passing_threshold"] = PASSING_THRESHOLD * self.max_score_sum / self.rows
+        return values
+
+    def test_statistics(self):
+        keys = np.array(sorted(self.tests))
+        rows = [self.tests[key].values() for key in keys]
+        counts = np.array([self.tests[key].count for key in keys], dtype=float)
+        passing = np.array([self.test_passing[key] for key in keys], dtype=float)
+        max_score = np.array([self.test_max_scores[key] for key in keys])
+
+        columns = {name: np.array([row[name] for row in rows], dtype=float) for name in rows[0]}
+        columns.update({
+            "passing_rate": passing / counts * 100,
+            "failing_rate": (counts - passing) / counts * 100,
+            "passing_threshold": PASSING_THRESHOLD * max_score,
+            "max_score": max_score,
+        })
+        return GroupStatistics(keys, columns)
+
+
+def _chunks(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def interval_calibration(analysis_document, students, loaded_model):
+    """
+    Calibrate the document's prediction intervals on an evenly spread sample of
+    at most INTERVAL_MAX_CALIBRATION students, loaded on their own.
+    """
+    if len(students) > INTERVAL_MAX_CALIBRATION:
+        positions = np.unique(np.linspace(0, len(students) - 1, INTERVAL_MAX_CALIBRATION).astype(int))
+        students = [students[i] for i in positions]
+    backtest = build_backtest(prepare_scores(load_score_frame(analysis_document, students=students)))
+    if not len(backtest):
+        return None
+    return calibrate(backtest, loaded_model.predict(feature_matrix(backtest.features)))
+
+
+def arima_chunked_driver(analysis_document, chunk_students=None, students=None, profile=None):
+    """
+    Run the prediction pipeline over a document ``chunk_students`` students at a
+    time, so memory stays bounded however many students it has.
+
+    Each chunk's scores are loaded, featurized, predicted and written (predictions,
+    feature snapshots, student statistics) on their own; the document and test
+    statistics are accumulated from every chunk and written at the end.
+    The results match ``arima_driver`` except that the interval calibration of
+    documents with more than INTERVAL_MAX_CALIBRATION students comes from a
+    sample spread over all students rather than over those with enough scores.
+    The full_details payload, which spans the whole document, is invalidated
+    rather than rebuilt here. Stages repeated per chunk are reported summed (see
+    ``instrumentation.instrumented_run``).
+    """
+    with instrumented_run(analysis_document, name=CHUNKED_PIPELINE, profile=profile):
+        return _run_chunks(analysis_document, chunk_students, students)
+
+
+def _run_chunks(analysis_document, chunk_students, students):
+    started = time.perf_counter()
+    chunk_students = chunk_students or pipeline_settings()["CHUNK_STUDENTS"]
+    if students is None:
+        with pipeline_stage("list_students") as stage:
+            students = document_students(analysis_document)
+            stage["rows"] = len(students)
+    if not students:
+        logger.warning(f"No formative assessment scores found for analysis document {analysis_document.pk}")
+        raise FormativeAssessmentScore.DoesNotExist
+
+    with pipeline_stage("load_model"):
+        loaded_model = get_model()
+    with pipeline_stage("calibrate_intervals"):
+        calibration = interval_calibration(analysis_document, students, loaded_model)
+    accumulator = StatisticsAccumulator()
+
+    for chunk in _chunks(students, chunk_students):
+        with pipeline_stage("load_scores") as stage:
+            scores = prepare_scores(load_score_frame(analysis_document, students=chunk))
+            stage["rows"] = len(scores)
+        with pipeline_stage("build_features", rows=len(chunk)):
+            features_df = build_student_features(scores)
+        with pipeline_stage("predict", rows=len(features_df)):
+            normalized_predictions = loaded_model.predict(feature_matrix(features_df))
+        with pipeline_stage("finish_predictions", rows=len(features_df)):
+            predictions_df = finish_predictions(
+                features_df, analysis_document, normalized_predictions, loaded_model.version, scores, calibration,
+            )
+
+        with pipeline_stage("save_predictions", rows=len(predictions_df)):
+            save_predictions(predictions_df, analysis_document)
+        with pipeline_stage("save_feature_snapshots", rows=len(predictions_df)):
+            save_feature_snapshots(analysis_document, predictions_df)
+        with pipeline_stage("student_statistics", rows=len(scores)):
+            statistics = student_statistics(scores)
+        with pipeline_stage("save_statistics", rows=len(statistics)):
+            save_student_statistics(analysis_document, statistics)
+        with pipeline_stage("accumulate_statistics", rows=len(scores)):
+            accumulator.add(scores)
+        del scores, features_df, predictions_df, statistics
+
+    with pipeline_stage("save_statistics") as stage:
+        test_statistics = accumulator.test_statistics()
+        with transaction.atomic():
+            save_document_statistics(analysis_document, accumulator.document_statistics())
+            save_test_statistics(analysis_document, test_statistics)
+        save_interval_calibration(analysis_document, calibration)
+        stage["rows"] = len(test_statistics) + 1
+
+    logger.info(
+        f"Analysed {len(students)} students of analysis document {analysis_document.pk} in chunks of "
+        f"{chunk_students} with model version {loaded_model.version} in {time.perf_counter() - started:.2f}s"
+    )
+    return finish_analysis(analysis_document, prewarm=False)
@@ -0,0 +1,79 @@
+import logging
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from .features import FEATURE_COLUMNS, FEATURE_VERSION, PASSING_THRESHOLD
+from .models import StudentFeatureSnapshot
+
+logger = logging.getLogger("arima_model")
+
+FEATURE_FRAME_COLUMNS = ["student_id", *FEATURE_COLUMNS, "normalized_passing_threshold", "test_number"]
+
+
+def save_feature_snapshots(analysis_document, features_df, version=FEATURE_VERSION):
+    """Upsert the features of every student in a feature frame with one statement."""
+    values = features_df[FEATURE_COLUMNS].to_numpy(dtype=float)
+    test_numbers = features_df["test_number"].to_numpy().astype(int)
+    objects = [
+        StudentFeatureSnapshot(
+            analysis_document=analysis_document,
+            student_id=str(lrn),
+            feature_version=version,
+            test_number=int(test_numbers[i]),
+            **dict(zip(FEATURE_COLUMNS, values[i].tolist())),
+        )
+        for i, lrn in enumerate(features_df["student_id"].tolist())
+    ]
+
+    with transaction.atomic():
+        StudentFeatureSnapshot.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=["analysis_document", "student", "feature_version"],
+            update_fields=[*FEATURE_COLUMNS, "test_number", "updated_at"],
+        )
+    return objects
+
+
+def load_feature_frames(analysis_documents, version=FEATURE_VERSION, students=None):
+    """
+    Load the stored features of several documents with one query, as one feature
+    frame per document id in the layout of ``build_student_features`` (students
+    in LRN order). Documents without snapshots of ``version`` are left out.
+    """
+    document_ids = sorted({getattr(document, "pk", document) for document in analysis_documents})
+    snapshots = StudentFeatureSnapshot.objects.filter(
+        analysis_document_id__in=document_ids, feature_version=version
+    )
+    if students is not None:
+        snapshots = snapshots.filter(student_id__in=[str(lrn) for lrn in students])
+    rows = list(
+        snapshots.order_by("analysis_document_id", "student_id")
+        .values_list("analysis_document_id", "student_id", *FEATURE_COLUMNS, "test_number")
+    )
+    if not rows:
+        return {}
+
+    columns = list(zip(*rows))
+    document_column = np.asarray(columns[0])
+    frame = pd.DataFrame({
+        "student_id": np.asarray(columns[1], dtype=object),
+        **{name: np.asarray(column, dtype=float) for name, column in zip(FEATURE_COLUMNS, columns[2:-1])},
+        "normalized_passing_threshold": PASSING_THRESHOLD,
+        "test_number": np.asarray(columns[-1], dtype=int),
+    })[FEATURE_FRAME_COLUMNS]
+
+    # rows come grouped by document, so each document is one contiguous slice
+    starts = np.flatnonzero(np.r_[True, document_column[1:] != document_column[:-1]])
+    ends = np.r_[starts[1:], len(rows)]
+    return {
+        int(document_column[start]): frame.iloc[start:end].reset_index(drop=True)
+        for start, end in zip(starts, ends)
+    }
+
+
+def load_feature_frame(analysis_document, version=FEATURE_VERSION, students=None):
+    """The stored feature frame of one document, or None when it has no snapshots of ``version``."""
+    return load_feature_frames([analysis_document], version, students).get(analysis_document.pk)
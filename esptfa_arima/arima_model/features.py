@@ -0,0 +1,168 @@
+import logging
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("arima_model")
+
+MASTERY_THRESHOLD = 0.81
+PASSING_THRESHOLD = 0.70
+WEIGHTED_MEAN_DECAY = 0.9
+RECENT_TREND_WINDOW = 5
+RECENT_DECAY_WINDOW = 3
+CV_EPSILON = 1e-8
+
+# time-series forecasters report a central prediction interval of this coverage
+PREDICTION_INTERVAL_LEVEL = 0.80
+FORECAST_COLUMNS = ["forecast", "lower", "upper"]
+
+# bump whenever the extraction below changes what a feature means, so stored
+# feature snapshots of the old extraction are not mixed with new ones
+FEATURE_VERSION = "1"
+
+# model input columns, in the order the model was trained on
+FEATURE_COLUMNS = [
+    "weighted_mean_score",
+    "std_score",
+    "last_score",
+    "trend_slope",
+    "first_last_delta",
+    "recent_trend_slope",
+    "coefficient_of_variation",
+    "mastery_consistency",
+    "recent_decay",
+    "downside_risk",
+]
+
+
+@dataclass
+class ScoreMatrix:
+    """
+    Students' score series packed into one left-aligned (students x tests) matrix.
+
+    Row i holds the series of ``keys[i]`` in its first ``lengths[i]`` columns;
+    the remaining columns are NaN padding.
+    """
+
+    keys: np.ndarray
+    values: np.ndarray
+    lengths: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return np.arange(self.values.shape[1]) < self.lengths[:, None]
+
+
+def build_score_matrix(df, group_col="student_id", value_col="normalized_scores") -> ScoreMatrix:
+    """
+    Pack ``df[value_col]`` into a padded matrix with one row per ``group_col`` value.
+    Rows follow the sorted group keys (the same order as ``df.groupby``) and each
+    row keeps the order the scores appear in ``df``.
+    """
+    grouped = df.groupby(group_col, sort=True, observed=True)
+    codes = grouped.ngroup().to_numpy()
+    positions = grouped.cumcount().to_numpy()
+    keys = np.asarray(list(grouped.groups.keys()), dtype=object)
+
+    lengths = np.bincount(codes, minlength=len(keys))
+    width = int(lengths.max()) if len(lengths) else 0
+
+    values = np.full((len(keys), width), np.nan)
+    values[codes, positions] = df[value_col].to_numpy(dtype=float)
+    return ScoreMatrix(keys=keys, values=values, lengths=lengths)
+
+
+def _masked_slope(values, valid, start, lengths):
+    """
+    OLS slope of each row over the columns in [start, length), with t = 1..n.
+    Rows with fewer than two points get a slope of 0.
+    """
+    columns = np.arange(values.shape[1])
+    window = valid & (columns >= start[:, None])
+    n = lengths - start
+
+    safe_n = np.maximum(n, 1)
+    t = np.where(window, columns - start[:, None] + 1.0, 0.0)
+    y = np.where(window, values, 0.0)
+
+    t_mean = (n + 1) / 2.0
+    y_mean = y.sum(axis=1) / safe_n
+
+    dt = np.where(window, t - t_mean[:, None], 0.0)
+    dy = np.where(window, y - y_mean[:, None], 0.0)
+    numerator = (dt * dy).sum(axis=1)
+    denominator = (dt**2).sum(axis=1)
+
+    slope = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+    return np.where(n < 2, 0.0, slope)
+
+
+def compute_features(matrix: ScoreMatrix) -> dict:
+    """
+    Compute every engineered feature for every row of ``matrix`` at once.
+    Matches the per-series functions in ``arima_model.arima_model`` (weighted_mean_score,
+    trend_slope, ...) up to floating point rounding.
+    """
+    values = matrix.values
+    lengths = matrix.lengths
+    valid = matrix.valid
+    n = lengths.astype(float)
+    rows = np.arange(len(lengths))
+    columns = np.arange(values.shape[1])
+
+    y = np.where(valid, values, 0.0)
+    mean = y.sum(axis=1) / n
+    std = np.sqrt((np.where(valid, values - mean[:, None], 0.0) ** 2).sum(axis=1) / n)
+    last = values[rows, lengths - 1]
+    first = values[:, 0]
+
+    # weights decay with the distance from the most recent score
+    distance_from_last = lengths[:, None] - 1 - columns
+    weights = np.where(valid, WEIGHTED_MEAN_DECAY ** np.maximum(distance_from_last, 0).astype(float), 0.0)
+    weighted_mean = (weights * y).sum(axis=1) / weights.sum(axis=1)
+
+    no_offset = np.zeros_like(lengths)
+    trend = _masked_slope(values, valid, no_offset, lengths)
+    recent_start = np.where(lengths < RECENT_TREND_WINDOW, 0, lengths - RECENT_TREND_WINDOW)
+    recent_trend = _masked_slope(values, valid, recent_start, lengths)
+
+    decay_window = valid & (columns >= (lengths - RECENT_DECAY_WINDOW)[:, None])
+    recent_mean = np.where(decay_window, values, 0.0).sum(axis=1) / RECENT_DECAY_WINDOW
+    recent_decay = np.where(lengths < RECENT_DECAY_WINDOW, 0.0, recent_mean - mean)
+
+    return {
+        "weighted_mean_score": weighted_mean,
+        "std_score": std,
+        "last_score": last,
+        "trend_slope": trend,
+        "first_last_delta": last - first,
+        "recent_trend_slope": recent_trend,
+        "coefficient_of_variation": std / (mean + CV_EPSILON),
+        "mastery_consistency": (valid & (values >= MASTERY_THRESHOLD)).sum(axis=1) / n,
+        "recent_decay": recent_decay,
+        "downside_risk": (valid & (values < PASSING_THRESHOLD)).sum(axis=1) / n,
+    }
+
+
+def build_student_features(df) -> pd.DataFrame:
+    """
+    Build the per-student feature frame from the preprocessed score frame in one
+    vectorized pass. ``df`` must already be sorted by student and date.
+    """
+    if df.empty:
+        return pd.DataFrame(columns=["student_id", *FEATURE_COLUMNS, "normalized_passing_threshold", "test_number"])
+
+    matrix = build_score_matrix(df)
+    features = compute_features(matrix)
+    last_test_numbers = df.groupby("student_id", sort=True, observed=True)["test_number"].max()
+
+    feature_df = pd.DataFrame({"student_id": matrix.keys, **features})
+    feature_df["normalized_passing_threshold"] = PASSING_THRESHOLD  # adding this for predicted status
+    feature_df["test_number"] = last_test_numbers.to_numpy()  # use the last test number as ref
+    return feature_df
+
+
+def feature_matrix(features_df) -> np.ndarray:
+    """The model input: the FEATURE_COLUMNS of a feature frame as one array."""
+    return features_df[FEATURE_COLUMNS].to_numpy(dtype=float)
@@ -0,0 +1,118 @@
+"""
+Fixtures shared by the arima_model and Test_Management tests: a stand-in for
+the XGBoost model, analysis documents with their topics and scores, and
+in-memory score frames.
+"""
+
+from django.contrib.auth.models import User
+from Authentication.models import Teacher, Student
+from Test_Management.models import AnalysisDocument, TestTopic, TestTopicMapping, FormativeAssessmentScore
+from .arima_model import prepare_scores
+import numpy as np
+import pandas as pd
+
+
+class FeatureModel:
+    """
+    Stands in for the XGBoost model: predicts one feature column (the weighted
+    mean score by default) and records the number of rows of every call.
+    """
+
+    def __init__(self, column=0, version="test"):
+        self.column = column
+        self.version = version
+        self.calls = []
+
+    def predict(self, X):
+        self.calls.append(len(X))
+        return X[:, self.column]
+
+
+# DATABASE FIXTURES
+def make_teacher(username):
+    user = User.objects.create_user(username=username, password="password")
+    Teacher.objects.create(user_id=user)
+    return user
+
+
+def make_students(section, lrn_prefix, count):
+    """``count`` students of ``section`` with LRNs ``lrn_prefix`` + a two-digit index."""
+    return Student.objects.bulk_create([
+        Student(lrn=f"{lrn_prefix}{i:02d}", section=section) for i in range(count)
+    ])
+
+
+def make_document(teacher, section, students, tests, score, title="Test Doc", max_score=50,
+                  passing_threshold=35.0, **fields):
+    """
+    An analysis document with one topic per test and the scores of ``students``.
+
+    ``tests`` is a count (tests 1 to n) or the test numbers, in the order their
+    topics are created. ``score(i, t)`` is the score of ``students[i]`` on test
+    ``t``, or None for a test the student missed; ``max_score`` is a number or a
+    function of the test number. ``fields`` are passed on to the document.
+    """
+    fields.setdefault("post_test_max_score", 60.0)
+    document = AnalysisDocument.objects.create(analysis_doc_title=title, teacher=teacher, section=section, **fields)
+    scores = []
+    for t in range(1, tests + 1) if isinstance(tests, int) else tests:
+        topic = TestTopic.objects.create(
+            topic_name=f"{title} {t}", test_number=str(t),
+            max_score=max_score(t) if callable(max_score) else max_score,
+        )
+        mapping = TestTopicMapping.objects.create(analysis_document=document, topic=topic)
+        for i, student in enumerate(students):
+            value = score(i, t)
+            if value is not None:
+                scores.append(FormativeAssessmentScore(
+                    analysis_document=document, student_id=student, score=value, test_number=str(t),
+                    topic_mapping=mapping, passing_threshold=passing_threshold,
+                ))
+    FormativeAssessmentScore.objects.bulk_create(scores)
+    return document
+
+
+def add_score(document, student, test_number, score, passing_threshold=35.0):
+    """Score ``student`` on a test of ``document`` made by ``make_document``."""
+    return FormativeAssessmentScore.objects.create(
+        analysis_document=document, student_id=student, score=score, test_number=str(test_number),
+        topic_mapping=TestTopicMapping.objects.get(analysis_document=document, topic__test_number=str(test_number)),
+        passing_threshold=passing_threshold,
+    )
+
+
+# SCORE FRAMES
+def score_frame(series_by_student, max_score=50.0):
+    """Prepared scores of the given per-student series of normalized scores, one test a day."""
+    rows = [
+        {
+            "student_id": lrn,
+            "test_number": t + 1,
+            "score": value * max_score,
+            "max_score": max_score,
+            "date": np.datetime64("2026-01-01") + np.timedelta64(t, "D"),
+        }
+        for lrn, series in series_by_student.items()
+        for t, value in enumerate(series)
+    ]
+    df = pd.DataFrame(rows)
+    df["student_id"] = pd.Categorical(df["student_id"])
+    return prepare_scores(df)
+
+
+def random_scores(n_students=25, max_tests=10, seed=3):
+    """Prepared scores of ``n_students`` students with 1 to ``max_tests`` - 1 tests each."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for student in range(n_students):
+        for test in range(1, rng.integers(1, max_tests) + 1):
+            rows.append({
+                "student_id": f"4{student:010d}",
+                "test_number": test,
+                "score": float(rng.integers(0, 51)),
+                "max_score": 50.0,
+                "date": np.datetime64("2026-01-01") + np.timedelta64(test, "D"),
+            })
+    df = pd.DataFrame(rows)
+    df["student_id"] = pd.Categorical(df["student_id"])
+    return prepare_scores(df)
@@ -0,0 +1,240 @@
+import contextvars
+import json
+import logging
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Unix only; Windows runs have no max RSS
+    resource = None
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_INSTRUMENTATION_SETTINGS = {
+    # also store every run's report as a PipelineRun row
+    "RECORD_RUNS": False,
+    # trace allocations for each stage's peak memory (slows allocation-heavy stages down)
+    "TRACE_MEMORY": False,
+    # documents (ids) whose runs are always profiled, and the profiler to use:
+    # "cprofile" (standard library) or "pyinstrument" (optional dependency)
+    "PROFILE_DOCUMENTS": [],
+    "PROFILER": "cprofile",
+    # where profiles are written; None uses logs/profiles under the project
+    "PROFILE_DIR": None,
+}
+
+_current_run = contextvars.ContextVar("arima_pipeline_run", default=None)
+
+
+def instrumentation_settings():
+    return {**DEFAULT_INSTRUMENTATION_SETTINGS, **getattr(settings, "ARIMA_INSTRUMENTATION", {})}
+
+
+def _max_rss_bytes():
+    if resource is None:
+        return None
+    # ru_maxrss is in KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RunRecorder:
+    """
+    Per-stage measurements of one pipeline run: wall time, rows processed, queries
+    and peak memory of every stage, in the order the stages first ran. A stage
+    that runs several times (once per chunk) is reported as the sum of its runs.
+    """
+
+    def __init__(self, analysis_document, name, trace_memory=False):
+        self.analysis_document = analysis_document
+        self.name = name
+        self.trace_memory = trace_memory
+        self.stages = {}
+        self.query_count = 0
+        self.status = "succeeded"
+        self.error = None
+        self.profile_path = None
+        self.started_at = timezone.now()
+        self._started = time.perf_counter()
+        self.seconds = None
+
+    def _count_query(self, execute, sql, params, many, context):
+        self.query_count += 1
+        return execute(sql, params, many, context)
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """
+        Measure the block as stage ``name``. ``rows`` may be given up front or
+        set on the yielded dict (``stage["rows"] = ...``) once it is known.
+        """
+        measured = {"rows": rows}
+        queries = self.query_count
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield measured
+        finally:
+            seconds = time.perf_counter() - started
+            entry = self.stages.setdefault(name, {
+                "seconds": 0.0, "rows": None, "queries": 0, "calls": 0,
+                "peak_memory_bytes": None, "max_rss_bytes": None,
+            })
+            entry["seconds"] += seconds
+            entry["queries"] += self.query_count - queries
+            entry["calls"] += 1
+            if measured["rows"] is not None:
+                entry["rows"] = (entry["rows"] or 0) + int(measured["rows"])
+            # the process high-water mark when the stage ended, so the stage that raised it stands out
+            entry["max_rss_bytes"] = _max_rss_bytes()
+            if self.trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                entry["peak_memory_bytes"] = max(entry["peak_memory_bytes"] or 0, peak)
+
+    def report(self):
+        peaks = [stage["peak_memory_bytes"] for stage in self.stages.values() if stage["peak_memory_bytes"] is not None]
+        return {
+            "event": "pipeline_run",
+            "pipeline": self.name,
+            "analysis_document": self.analysis_document.pk,
+            "status": self.status,
+            "error": self.error,
+            "seconds": round(self.seconds, 6) if self.seconds is not None else None,
+            "query_count": self.query_count,
+            "peak_memory_bytes": max(peaks) if peaks else None,
+            "max_rss_bytes": _max_rss_bytes(),
+            "profile": self.profile_path,
+            "stages": {
+                name: {**stage, "seconds": round(stage["seconds"], 6)} for name, stage in self.stages.items()
+            },
+        }
+
+
+@contextmanager
+def pipeline_stage(name, rows=None):
+    """Measure the block as a stage of the current pipeline run; does nothing outside one."""
+    run = _current_run.get()
+    if run is None:
+        yield {"rows": rows}
+        return
+    with run.stage(name, rows) as measured:
+        yield measured
+
+
+def _profile_path(analysis_document, extension):
+    directory = instrumentation_settings()["PROFILE_DIR"] or os.path.join(settings.BASE_DIR, "logs", "profiles")
+    os.makedirs(directory, exist_ok=True)
+    stamp = timezone.now().strftime("%Y%m%dT%H%M%S")
+    return os.path.join(directory, f"analysis-{analysis_document.pk}-{stamp}.{extension}")
+
+
+@contextmanager
+def _profiler(analysis_document, kind, run):
+    """Profile the block with cProfile or pyinstrument and record where the output went."""
+    if kind == "pyinstrument":
+        from pyinstrument import Profiler
+
+        profiler = Profiler()
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+            run.profile_path = _profile_path(analysis_document, "html")
+            with open(run.profile_path, "w") as f:
+                f.write(profiler.output_html())
+        return
+
+    import cProfile
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        run.profile_path = _profile_path(analysis_document, "prof")
+        profiler.dump_stats(run.profile_path)
+
+
+@contextmanager
+def instrumented_run(analysis_document, name="analysis", profile=None, trace_memory=None):
+    """
+    Instrument one pipeline run of ``analysis_document``: the stages measured
+    with ``pipeline_stage`` inside the block are logged to the ``arima_model``
+    logger as one JSON line when it ends (and stored as a PipelineRun when
+    RECORD_RUNS is set), whether it succeeds or raises.
+
+    ``profile`` (True, "cprofile" or "pyinstrument") profiles the whole run;
+    documents listed in PROFILE_DOCUMENTS are profiled by default.
+    ``trace_memory`` overrides TRACE_MEMORY. A run inside another run only adds
+    its stages to the outer one.
+    """
+    if _current_run.get() is not None:
+        yield _current_run.get()
+        return
+
+    options = instrumentation_settings()
+    if profile is None and analysis_document.pk in options["PROFILE_DOCUMENTS"]:
+        profile = True
+    if profile is True:
+        profile = options["PROFILER"]
+
+    if trace_memory is None:
+        trace_memory = options["TRACE_MEMORY"]
+    trace_memory = trace_memory and not tracemalloc.is_tracing()
+    run = RunRecorder(analysis_document, name, trace_memory=trace_memory)
+    token = _current_run.set(run)
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with connection.execute_wrapper(run._count_query):
+            if profile:
+                with _profiler(analysis_document, profile, run):
+                    yield run
+            else:
+                yield run
+    except BaseException as e:
+        run.status = "failed"
+        run.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        run.seconds = time.perf_counter() - run._started
+        if trace_memory:
+            tracemalloc.stop()
+        _current_run.reset(token)
+        _publish(run, options)
+
+
+def _publish(run, options):
+    report = run.report()
+    logger.info(json.dumps(report))
+    if not options["RECORD_RUNS"]:
+        return
+    from .models import PipelineRun
+
+    try:
+        PipelineRun.objects.create(
+            analysis_document_id=run.analysis_document.pk,
+            pipeline=run.name,
+            status=run.status,
+            error=run.error,
+            started_at=run.started_at,
+            seconds=report["seconds"],
+            query_count=run.query_count,
+            peak_memory_bytes=report["peak_memory_bytes"],
+            max_rss_bytes=report["max_rss_bytes"],
+            profile_path=run.profile_path,
+            stages=report["stages"],
+        )
+    except Exception as e:
+        # a failed run may have left the transaction unusable; the log line above still has the report
+        logger.warning(f"Could not record the pipeline run of analysis document {run.analysis_document.pk}: {e}")
@@ -0,0 +1,79 @@
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from .features import build_student_features, PREDICTION_INTERVAL_LEVEL
+
+# students need this many scores to give a backtest: two to build features from, one to check
+INTERVAL_MIN_HISTORY = 3
+# fewer backtests than this give no interval at all
+INTERVAL_MIN_CALIBRATION = 5
+# larger documents are calibrated on an evenly spread sample of students
+INTERVAL_MAX_CALIBRATION = 2000
+# lower bound on a student's score spread when scaling the interval
+VOLATILITY_FLOOR = 0.05
+
+
+@dataclass
+class Backtest:
+    """Features of students' score histories without their last score, and that held-out score."""
+
+    features: pd.DataFrame
+    targets: np.ndarray
+
+    def __len__(self):
+        return len(self.targets)
+
+
+def build_backtest(scores, max_students=INTERVAL_MAX_CALIBRATION) -> Backtest:
+    """
+    Hold out every eligible student's last score and build the features of the
+    rest of their history, all students in one vectorized pass. ``scores`` is a
+    prepared score frame (see ``prepare_scores``).
+    """
+    grouped = scores.groupby("student_id", sort=True, observed=True)
+    counts = grouped["normalized_scores"].size()
+    keys = counts.index[counts.to_numpy() >= INTERVAL_MIN_HISTORY]
+    if len(keys) > max_students:
+        keys = keys[np.unique(np.linspace(0, len(keys) - 1, max_students).astype(int))]
+
+    eligible = scores[scores["student_id"].isin(keys)]
+    from_end = eligible.groupby("student_id", sort=True, observed=True).cumcount(ascending=False)
+    features = build_student_features(eligible[from_end.to_numpy() > 0])
+    targets = grouped["normalized_scores"].last().reindex(keys).to_numpy(dtype=float)
+    return Backtest(features=features, targets=targets)
+
+
+def _volatility(features_df):
+    return np.maximum(features_df["std_score"].to_numpy(dtype=float), VOLATILITY_FLOOR)
+
+
+def calibrate(backtest, backtest_predictions, level=PREDICTION_INTERVAL_LEVEL):
+    """
+    Quantiles of the model's backtest errors, each scaled by the student's score
+    spread (locally weighted split conformal). Returns ``(lower, upper)``, or
+    None when there are too few backtests to calibrate on.
+    """
+    if len(backtest) < INTERVAL_MIN_CALIBRATION:
+        return None
+    errors = (backtest.targets - np.asarray(backtest_predictions, dtype=float)) / _volatility(backtest.features)
+    lower, upper = np.quantile(errors, [(1 - level) / 2, (1 + level) / 2])
+    return float(lower), float(upper)
+
+
+def prediction_bounds(calibration, features_df, normalized_predictions):
+    """
+    Normalized lower and upper bounds of every student's prediction under
+    ``calibration``; NaN when the document could not be calibrated. The bounds
+    always contain the prediction itself.
+    """
+    predictions = np.asarray(normalized_predictions, dtype=float)
+    if calibration is None:
+        nothing = np.full(len(predictions), np.nan)
+        return nothing, nothing.copy()
+
+    volatility = _volatility(features_df)
+    lower = predictions + calibration[0] * volatility
+    upper = predictions + calibration[1] * volatility
+    return np.minimum(lower, predictions), np.maximum(upper, predictions)
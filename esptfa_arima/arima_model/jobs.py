@@ -0,0 +1,297 @@
+import logging
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import close_old_connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import AnalysisJob
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_JOB_SETTINGS = {
+    # "local" runs jobs in a bounded in-process thread pool (fine for SQLite deployments),
+    # "redis" pushes job ids onto a Redis list consumed by `manage.py run_analysis_worker`,
+    # "eager" runs jobs inline (tests)
+    "BACKEND": "local",
+    "MAX_WORKERS": 2,
+    "MAX_ATTEMPTS": 3,
+    "RETRY_BACKOFF_SECONDS": 2.0,
+    "REDIS_URL": "redis://localhost:6379/0",
+    "QUEUE_NAME": "arima:jobs",
+    # a job still queued or running this long after it was queued/started is taken to be
+    # lost (web process restarted, worker killed) and is requeued, or failed once it has
+    # used all of its attempts; keep it above the longest analysis you expect to run
+    "STALE_AFTER_SECONDS": 3600,
+    # how often a running `run_analysis_worker` looks for stale jobs
+    "RECOVERY_INTERVAL_SECONDS": 300,
+}
+
+# failures that a retry cannot fix
+NON_RETRYABLE_ERRORS = (ObjectDoesNotExist, ValueError)
+
+
+def job_settings():
+    return {**DEFAULT_JOB_SETTINGS, **getattr(settings, "ARIMA_JOBS", {})}
+
+
+# JOB HANDLERS
+def run_analysis(job):
+    """Run the full prediction pipeline for the job's analysis document."""
+    from .tasks import process_analysis_document
+    from .model_registry import registry
+
+    process_analysis_document(job.analysis_document_id)
+    return {"model_version": registry.version()}
+
+
+def run_reanalysis(job):
+    """Refresh the predictions and statistics touched by the score changes in the job payload."""
+    from .reanalysis import recompute_students
+    from .model_registry import registry
+
+    result = recompute_students(
+        job.analysis_document, job.payload["students"], job.payload.get("test_numbers")
+    )
+    return {**result, "model_version": registry.version()}
+
+
+def run_batch_analysis(job):
+    """Run the prediction pipeline for every document in the job payload with one model call."""
+    from Test_Management.models import AnalysisDocument
+    from .batch_driver import arima_batch_driver
+
+    documents = AnalysisDocument.objects.filter(pk__in=job.payload["documents"])
+    return arima_batch_driver(documents)
+
+
+JOB_HANDLERS = {
+    "analysis": run_analysis,
+    "reanalysis": run_reanalysis,
+    "batch_analysis": run_batch_analysis,
+}
+
+
+# ENQUEUEING
+def enqueue_job(kind, analysis_document=None, payload=None):
+    """
+    Record a job and hand it to the configured backend once the surrounding
+    transaction commits, so the worker always sees the rows the job depends on.
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind: {kind}")
+
+    job = AnalysisJob.objects.create(
+        kind=kind,
+        analysis_document=analysis_document,
+        payload=payload or {},
+        max_attempts=job_settings()["MAX_ATTEMPTS"],
+    )
+    transaction.on_commit(lambda: get_backend().submit(job.job_id))
+    logger.info(f"Queued {kind} job {job.job_id}")
+    return job
+
+
+def enqueue_analysis(analysis_document):
+    return enqueue_job("analysis", analysis_document=analysis_document)
+
+
+def enqueue_reanalysis(analysis_document, students, test_numbers=None):
+    payload = {"students": sorted({str(lrn) for lrn in students})}
+    if test_numbers is not None:
+        payload["test_numbers"] = sorted({int(test_number) for test_number in test_numbers})
+    return enqueue_job("reanalysis", analysis_document=analysis_document, payload=payload)
+
+
+def enqueue_batch_analysis(analysis_documents):
+    payload = {"documents": sorted({document.pk for document in analysis_documents})}
+    return enqueue_job("batch_analysis", payload=payload)
+
+
+def latest_job(analysis_document, kind=None):
+    jobs = AnalysisJob.objects.filter(analysis_document=analysis_document)
+    if kind:
+        jobs = jobs.filter(kind=kind)
+    return jobs.order_by("-created_at").first()
+
+
+# EXECUTION
+def run_job(job_id):
+    """
+    Execute a queued job, retrying transient failures with a linear backoff.
+    Returns the job in its final state.
+    """
+    job = AnalysisJob.objects.filter(pk=job_id).first()
+    if job is None:
+        logger.error(f"Job {job_id} does not exist.")
+        return None
+    if job.is_finished:
+        return job
+
+    handler = JOB_HANDLERS[job.kind]
+    backoff = job_settings()["RETRY_BACKOFF_SECONDS"]
+
+    # claim the job; a requeued job can be submitted twice and only one run may win
+    started_at = timezone.now()
+    claimed = AnalysisJob.objects.filter(pk=job.pk, status=AnalysisJob.QUEUED).update(
+        status=AnalysisJob.RUNNING, started_at=started_at
+    )
+    if not claimed:
+        logger.info(f"{job.kind} job {job.job_id} was claimed by another run; skipping")
+        return job
+    job.status = AnalysisJob.RUNNING
+    job.started_at = started_at
+
+    while True:
+        job.attempts += 1
+        job.save(update_fields=["attempts"])
+        try:
+            result = handler(job)
+        except Exception as e:
+            retryable = not isinstance(e, NON_RETRYABLE_ERRORS)
+            if retryable and job.attempts < job.max_attempts:
+                logger.warning(
+                    f"{job.kind} job {job.job_id} failed on attempt {job.attempts}/{job.max_attempts}: {e}; retrying"
+                )
+                time.sleep(backoff * job.attempts)
+                continue
+
+            logger.error(f"{job.kind} job {job.job_id} failed: {e}")
+            job.status = AnalysisJob.FAILED
+            job.error = "".join(traceback.format_exception_only(type(e), e)).strip()
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "finished_at"])
+            return job
+
+        job.status = AnalysisJob.SUCCEEDED
+        job.result = result
+        job.error = None
+        job.finished_at = timezone.now()
+        job.save(update_fields=["status", "result", "error", "finished_at"])
+        logger.info(f"{job.kind} job {job.job_id} finished in {job.attempts} attempt(s)")
+        return job
+
+
+# RECOVERY
+def recover_stale_jobs(backend=None):
+    """
+    Requeue jobs that were lost with the process that held them: queued jobs that
+    were never picked up and running jobs that never finished. A lost running job
+    has used up an attempt; once it has none left it is failed instead.
+    Returns the (requeued, failed) job ids.
+    """
+    backend = backend or get_backend()
+    now = timezone.now()
+    cutoff = now - timedelta(seconds=job_settings()["STALE_AFTER_SECONDS"])
+    # jobs still waiting in the backend's own queue are not lost
+    waiting = backend.queued_ids() if hasattr(backend, "queued_ids") else set()
+
+    stale = AnalysisJob.objects.filter(
+        Q(status=AnalysisJob.QUEUED, created_at__lt=cutoff) | Q(status=AnalysisJob.RUNNING, started_at__lt=cutoff)
+    )
+    requeued, failed = [], []
+    for job in stale:
+        if str(job.job_id) in waiting:
+            continue
+        # only the process that moves the job out of its stale state recovers it
+        unchanged = AnalysisJob.objects.filter(pk=job.pk, status=job.status, started_at=job.started_at)
+        if job.status == AnalysisJob.RUNNING and job.attempts >= job.max_attempts:
+            if unchanged.update(
+                status=AnalysisJob.FAILED,
+                error=f"Job was lost while running (attempt {job.attempts}/{job.max_attempts})",
+                finished_at=now,
+            ):
+                logger.error(f"{job.kind} job {job.job_id} was lost while running; failed")
+                failed.append(job.job_id)
+        elif unchanged.update(status=AnalysisJob.QUEUED, started_at=None):
+            logger.warning(f"{job.kind} job {job.job_id} was lost while {job.status}; requeued")
+            backend.submit(job.job_id)
+            requeued.append(job.job_id)
+    return requeued, failed
+
+
+# BACKENDS
+class EagerBackend:
+    """Runs jobs inline in the calling thread."""
+
+    def submit(self, job_id):
+        run_job(job_id)
+
+
+class LocalBackend:
+    """Runs jobs in a bounded thread pool inside the web process."""
+
+    def __init__(self, max_workers):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="arima-job")
+
+    def submit(self, job_id):
+        self.executor.submit(self._run, job_id)
+
+    @staticmethod
+    def _run(job_id):
+        close_old_connections()
+        try:
+            run_job(job_id)
+        except Exception:
+            logger.error(f"Unhandled error in job {job_id}: {traceback.format_exc()}")
+        finally:
+            close_old_connections()
+
+
+class RedisBackend:
+    """Pushes job ids onto a Redis list; `manage.py run_analysis_worker` executes them."""
+
+    def __init__(self, url, queue_name):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.queue_name = queue_name
+
+    def submit(self, job_id):
+        self.client.lpush(self.queue_name, str(job_id))
+
+    def pop(self, timeout=5):
+        item = self.client.brpop(self.queue_name, timeout=timeout)
+        return item[1].decode() if item else None
+
+    def queued_ids(self):
+        return {item.decode() for item in self.client.lrange(self.queue_name, 0, -1)}
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    global _backend
+    config = job_settings()
+    name = config["BACKEND"]
+
+    if name == "eager":
+        return EagerBackend()
+
+    started = False
+    with _backend_lock:
+        if _backend is None or _backend.name != name:
+            if name == "redis":
+                backend = RedisBackend(config["REDIS_URL"], config["QUEUE_NAME"])
+            elif name == "local":
+                backend = LocalBackend(config["MAX_WORKERS"])
+                started = True
+            else:
+                raise ValueError(f"Unknown ARIMA_JOBS backend: {name}")
+            backend.name = name
+            _backend = backend
+        backend = _backend
+
+    # a fresh thread pool means this web process restarted: pick up what the old one lost
+    # (redis jobs are recovered by run_analysis_worker)
+    if started:
+        recover_stale_jobs(backend)
+    return backend
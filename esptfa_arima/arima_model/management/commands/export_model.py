@@ -0,0 +1,35 @@
+import os
+import pickle
+
+from django.core.management.base import BaseCommand, CommandError
+
+from arima_model.model_registry import save_model, DEFAULT_MODEL_PATH
+
+LEGACY_MODEL_PATH = os.path.splitext(DEFAULT_MODEL_PATH)[0] + ".pkl"
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert a pickled XGBoost model to XGBoost's native .ubj/.json format "
+        "and write its feature-schema sidecar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--source", default=LEGACY_MODEL_PATH, help="Pickled model to convert (trusted input only).")
+        parser.add_argument("--output", default=DEFAULT_MODEL_PATH, help="Native model path; the extension picks the format.")
+
+    def handle(self, *args, **options):
+        source, output = options["source"], options["output"]
+        if not output.endswith((".ubj", ".json")):
+            raise CommandError("--output must end in .ubj or .json")
+        try:
+            with open(source, "rb") as f:
+                model = pickle.load(f)
+        except FileNotFoundError:
+            raise CommandError(f"Model not found at path: {source}")
+
+        booster = model.get_booster() if hasattr(model, "get_booster") else model
+        schema = save_model(booster, output, {"source": os.path.basename(source)})
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote {output} ({schema['num_boosted_rounds']} rounds, features {', '.join(schema['feature_columns'])})"
+        ))
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Test_Management.models import AnalysisDocument
+from arima_model.arima_model import arima_driver
+from arima_model.instrumentation import instrumented_run
+
+
+class Command(BaseCommand):
+    help = (
+        "Analyse one document with the whole run profiled and every stage's memory traced, "
+        "then print the per-stage timings and where the profile was written."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("document_id", type=int, help="Document to analyse.")
+        parser.add_argument(
+            "--profiler", choices=["cprofile", "pyinstrument"], default=None,
+            help="Profiler to use (defaults to ARIMA_INSTRUMENTATION['PROFILER']).",
+        )
+        parser.add_argument("--no-trace-memory", action="store_true", help="Skip tracemalloc (faster, no stage peaks).")
+
+    def handle(self, *args, **options):
+        try:
+            document = AnalysisDocument.objects.get(pk=options["document_id"])
+        except AnalysisDocument.DoesNotExist:
+            raise CommandError(f"Analysis document {options['document_id']} does not exist")
+
+        with instrumented_run(
+            document, profile=options["profiler"] or True, trace_memory=not options["no_trace_memory"]
+        ) as run:
+            arima_driver(document)
+
+        report = run.report()
+        self.stdout.write(f"{'stage':<24}{'calls':>6}{'rows':>10}{'queries':>9}{'seconds':>10}{'peak MiB':>10}")
+        for name, stage in report["stages"].items():
+            rows = "-" if stage["rows"] is None else stage["rows"]
+            peak = "-" if stage["peak_memory_bytes"] is None else f"{stage['peak_memory_bytes'] / 2 ** 20:.1f}"
+            self.stdout.write(
+                f"{name:<24}{stage['calls']:>6}{rows:>10}{stage['queries']:>9}{stage['seconds']:>10.3f}{peak:>10}"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Analysed document {document.pk} in {report['seconds']:.2f}s with {report['query_count']} queries; "
+            f"profile written to {report['profile']}"
+        ))
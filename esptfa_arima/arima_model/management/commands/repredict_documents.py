@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from Test_Management.models import AnalysisDocument
+from arima_model.model_registry import get_model
+from arima_model.reanalysis import repredict_document
+
+
+class Command(BaseCommand):
+    help = (
+        "Redo the predictions of analysed documents with the installed model, from their "
+        "stored feature snapshots (e.g. after `train_model --install`)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("document_ids", nargs="*", type=int, help="Documents to re-predict.")
+        parser.add_argument("--all", action="store_true", help="Re-predict every analysed document.")
+
+    def handle(self, *args, **options):
+        if options["all"] == bool(options["document_ids"]):
+            raise CommandError("Pass document ids or --all")
+
+        documents = AnalysisDocument.objects.filter(status=True).order_by("pk")
+        if not options["all"]:
+            documents = documents.filter(pk__in=options["document_ids"])
+
+        self.stdout.write(f"Re-predicting with model version {get_model().version}")
+        counts = {"snapshots": 0, "scores": 0, "skipped": 0}
+        for document in documents.iterator():
+            result = repredict_document(document)
+            if result is None:
+                counts["skipped"] += 1
+                self.stdout.write(f"Document {document.pk}: no scores, skipped")
+                continue
+            counts["snapshots" if result["from_snapshots"] else "scores"] += 1
+            self.stdout.write(f"Document {document.pk}: {result['students']} student(s)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Re-predicted {counts['snapshots']} document(s) from feature snapshots and "
+            f"{counts['scores']} from their scores ({counts['skipped']} skipped)"
+        ))
@@ -0,0 +1,75 @@
+import logging
+import signal
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from arima_model.jobs import RedisBackend, job_settings, run_job, recover_stale_jobs
+
+logger = logging.getLogger("arima_model")
+
+
+class Command(BaseCommand):
+    help = "Consume analysis jobs from the Redis queue (ARIMA_JOBS BACKEND = 'redis')."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Number of jobs to run at the same time (defaults to ARIMA_JOBS MAX_WORKERS).",
+        )
+
+    def handle(self, *args, **options):
+        config = job_settings()
+        if config["BACKEND"] != "redis":
+            raise CommandError("run_analysis_worker requires ARIMA_JOBS['BACKEND'] = 'redis'")
+
+        concurrency = options["concurrency"] or config["MAX_WORKERS"]
+        backend = RedisBackend(config["REDIS_URL"], config["QUEUE_NAME"])
+        self.stopping = False
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT, self.stop)
+
+        self.stdout.write(f"Waiting for jobs on {config['QUEUE_NAME']} (concurrency {concurrency})")
+        running = set()
+        next_recovery = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="arima-worker") as executor:
+            while not self.stopping:
+                # on startup, then every RECOVERY_INTERVAL_SECONDS: requeue jobs a dead worker left behind
+                if time.monotonic() >= next_recovery:
+                    self.recover(backend)
+                    next_recovery = time.monotonic() + config["RECOVERY_INTERVAL_SECONDS"]
+
+                # never pull more jobs than there are free slots
+                if len(running) >= concurrency:
+                    _, running = wait(running, return_when=FIRST_COMPLETED)
+                    continue
+
+                job_id = backend.pop(timeout=5)
+                if job_id:
+                    running.add(executor.submit(self.run, job_id))
+                running = {future for future in running if not future.done()}
+
+        self.stdout.write("Worker stopped")
+
+    def recover(self, backend):
+        close_old_connections()
+        requeued, failed = recover_stale_jobs(backend)
+        if requeued or failed:
+            self.stdout.write(f"Recovered stale jobs: {len(requeued)} requeued, {len(failed)} failed")
+
+    def stop(self, *args):
+        self.stopping = True
+
+    @staticmethod
+    def run(job_id):
+        close_old_connections()
+        try:
+            run_job(job_id)
+        except Exception as e:
+            logger.error(f"Unhandled error in job {job_id}: {e}", exc_info=True)
+        finally:
+            close_old_connections()
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from arima_model.training import train_model, NoTrainingData
+
+
+class Command(BaseCommand):
+    help = (
+        "Train a new prediction model from the stored formative and actual post-test scores "
+        "and write a versioned artifact (settings in ARIMA_TRAINING)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output-dir", default=None, help="Directory for the artifact (defaults to the model directory).")
+        parser.add_argument(
+            "--install", action="store_true",
+            help="Also replace the model file the app loads (ARIMA_MODEL_PATH).",
+        )
+        parser.add_argument("--rounds", type=int, default=None, help="Maximum number of boosting rounds.")
+        parser.add_argument("--documents-per-chunk", type=int, default=None, help="Documents loaded per query.")
+        parser.add_argument("--validation-fraction", type=float, default=None, help="Share of documents held out.")
+        parser.add_argument(
+            "--external-memory", action="store_true", default=None,
+            help="Keep the quantized training data on disk instead of in memory.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            report = train_model(
+                output_dir=options["output_dir"],
+                install=options["install"],
+                num_boost_round=options["rounds"],
+                documents_per_chunk=options["documents_per_chunk"],
+                validation_fraction=options["validation_fraction"],
+                external_memory=options["external_memory"],
+            )
+        except NoTrainingData as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(
+            f"Trained {report['num_boosted_rounds']} rounds on {report['train_rows']} students "
+            f"of {report['train_documents']} documents in {report['train_seconds']:.1f}s"
+        )
+        for name, metrics in report["metrics"].items():
+            if metrics is None:
+                self.stdout.write(f"{name}: no held-out documents to evaluate on")
+                continue
+            self.stdout.write(
+                f"{name}: MAE {metrics['mae']:.4f}  RMSE {metrics['rmse']:.4f}  "
+                f"status accuracy {metrics['status_accuracy']:.1%} ({metrics['rows']} students)"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"Wrote model {report['version']} to {report['path']}" + (" and installed it" if report["installed"] else "")
+        ))
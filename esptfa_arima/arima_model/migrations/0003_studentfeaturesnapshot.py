@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-17 13:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Authentication', '0008_alter_student_lrn'),
+        ('Test_Management', '0020_prediction_intervals'),
+        ('arima_model', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentFeatureSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('feature_version', models.CharField(max_length=20)),
+                ('weighted_mean_score', models.FloatField()),
+                ('std_score', models.FloatField()),
+                ('last_score', models.FloatField()),
+                ('trend_slope', models.FloatField()),
+                ('first_last_delta', models.FloatField()),
+                ('recent_trend_slope', models.FloatField()),
+                ('coefficient_of_variation', models.FloatField()),
+                ('mastery_consistency', models.FloatField()),
+                ('recent_decay', models.FloatField()),
+                ('downside_risk', models.FloatField()),
+                ('test_number', models.IntegerField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('analysis_document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feature_snapshots', to='Test_Management.analysisdocument')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='Authentication.student')),
+            ],
+            options={
+                'unique_together': {('analysis_document', 'student', 'feature_version')},
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2 on 2026-10-17 13:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('Test_Management', '0021_unique_predicted_score'),
+        ('arima_model', '0003_studentfeaturesnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('pipeline', models.CharField(default='analysis', max_length=30)),
+                ('status', models.CharField(max_length=10)),
+                ('error', models.TextField(blank=True, null=True)),
+                ('started_at', models.DateTimeField()),
+                ('seconds', models.FloatField()),
+                ('query_count', models.PositiveIntegerField()),
+                ('peak_memory_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('max_rss_bytes', models.BigIntegerField(blank=True, null=True)),
+                ('profile_path', models.CharField(blank=True, max_length=500, null=True)),
+                ('stages', models.JSONField(default=dict)),
+                ('analysis_document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pipeline_runs', to='Test_Management.analysisdocument')),
+            ],
+            options={
+                'ordering': ['-started_at'],
+            },
+        ),
+    ]
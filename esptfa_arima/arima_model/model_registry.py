@@ -0,0 +1,248 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+from django.conf import settings
+
+from .features import FEATURE_COLUMNS
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(__file__), "model", "esptfa_xgboost.ubj")
+
+# XGBoost's own formats, by file extension; anything else is read as a pickle
+NATIVE_FORMATS = {".ubj": "ubj", ".json": "json"}
+SCHEMA_SUFFIX = ".schema.json"
+# feature frame columns that identify a student rather than feed the model
+DROPPED_COLUMNS = ["student_id", "normalized_passing_threshold", "test_number"]
+
+
+def model_format(path: str) -> str:
+    return NATIVE_FORMATS.get(os.path.splitext(path)[1].lower(), "pickle")
+
+
+def schema_path(path: str) -> str:
+    """The feature-schema sidecar of a model file (``model.ubj`` -> ``model.schema.json``)."""
+    return os.path.splitext(path)[0] + SCHEMA_SUFFIX
+
+
+class NativeModel:
+    """
+    An XGBoost booster loaded from its native format. ``predict`` takes the
+    feature matrix in FEATURE_COLUMNS order and reorders it to the columns the
+    booster was trained on.
+    """
+
+    def __init__(self, booster, feature_columns):
+        self.booster = booster
+        self.feature_columns = list(feature_columns)
+        order = [FEATURE_COLUMNS.index(column) for column in self.feature_columns]
+        self._order = None if order == list(range(len(order))) else order
+
+    def predict(self, x):
+        x = np.asarray(x, dtype=float)
+        if self._order is not None:
+            x = x[:, self._order]
+        return self.booster.inplace_predict(x)
+
+
+@dataclass(frozen=True)
+class LoadedModel:
+    """A deserialized model together with the file identity it was loaded from."""
+
+    model: Any
+    path: str
+    version: str
+    mtime_ns: int
+    size: int
+    loaded_at: float = field(default_factory=time.time)
+    load_seconds: float = 0.0
+    format: str = "pickle"
+
+    def predict(self, x):
+        return self.model.predict(x)
+
+
+class ModelRegistry:
+    """
+    Process-wide cache of the prediction model.
+
+    The model file is deserialized on first use and reused by every analysis.
+    Each lookup does a cheap ``os.stat`` and reloads the model when the file's
+    mtime or size changes, so replacing the artifact on disk is picked up
+    without a restart.
+
+    ``.ubj``/``.json`` files are XGBoost's native formats: xgboost reads them
+    straight from the path, they are checked against their feature-schema sidecar
+    and need no matching xgboost/scikit-learn versions. Other files are unpickled (the
+    legacy format).
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self._path = path
+        self._lock = threading.Lock()
+        self._loaded: Optional[LoadedModel] = None
+
+    @property
+    def path(self) -> str:
+        return self._path or getattr(settings, "ARIMA_MODEL_PATH", None) or DEFAULT_MODEL_PATH
+
+    def get(self) -> LoadedModel:
+        path = self.path
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            logger.error(f"Model not found at path: {path}")
+            raise FileNotFoundError(f"Model not found at path: {path}")
+
+        loaded = self._loaded
+        if loaded and self._is_current(loaded, path, stat):
+            return loaded
+
+        with self._lock:
+            # another thread may have reloaded while we waited for the lock
+            loaded = self._loaded
+            if loaded and self._is_current(loaded, path, stat):
+                return loaded
+
+            previous_version = loaded.version if loaded else None
+            self._loaded = self._load(path, stat)
+            if previous_version and previous_version != self._loaded.version:
+                logger.info(
+                    f"Model file changed, reloaded {path} "
+                    f"(version {previous_version} -> {self._loaded.version})"
+                )
+            return self._loaded
+
+    def version(self) -> Optional[str]:
+        """Version of the currently loaded model, without triggering a load."""
+        return self._loaded.version if self._loaded else None
+
+    def clear(self):
+        with self._lock:
+            self._loaded = None
+
+    @staticmethod
+    def _is_current(loaded: LoadedModel, path: str, stat: os.stat_result) -> bool:
+        return loaded.path == path and loaded.mtime_ns == stat.st_mtime_ns and loaded.size == stat.st_size
+
+    @staticmethod
+    def _load(path: str, stat: os.stat_result) -> LoadedModel:
+        start = time.perf_counter()
+        file_format = model_format(path)
+        try:
+            with open(path, "rb") as f:
+                version = hashlib.file_digest(f, "sha256").hexdigest()[:12]
+                if file_format == "pickle":
+                    f.seek(0)
+                    model = pickle.load(f)
+                else:
+                    # xgboost reads the file itself, no copy of it in Python
+                    model = _load_native(path)
+        except Exception as e:
+            logger.error(f"Error loading model: {e}")
+            raise
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Loaded model {os.path.basename(path)} version {version} in {elapsed:.3f}s")
+        return LoadedModel(
+            model=model,
+            path=path,
+            version=version,
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            load_seconds=elapsed,
+            format=file_format,
+        )
+
+
+def _load_native(path) -> NativeModel:
+    import xgboost
+
+    booster = xgboost.Booster()
+    booster.load_model(str(path))
+
+    sidecar = schema_path(path)
+    if os.path.exists(sidecar):
+        with open(sidecar) as f:
+            feature_columns = json.load(f)["feature_columns"]
+    else:
+        logger.warning(f"No feature schema at {sidecar}, using the booster's feature names")
+        feature_columns = booster.feature_names or FEATURE_COLUMNS
+
+    if sorted(feature_columns) != sorted(FEATURE_COLUMNS) or booster.num_features() != len(feature_columns):
+        raise ValueError(
+            f"Model {os.path.basename(path)} expects features {feature_columns}, "
+            f"the feature extraction provides {FEATURE_COLUMNS}"
+        )
+    return NativeModel(booster, feature_columns)
+
+
+def _write_atomic(path, payload):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        # mkstemp creates the file private to its owner
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def save_model(booster, path, metadata=None):
+    """
+    Write an XGBoost booster to ``path`` in the format its extension names,
+    together with its feature-schema sidecar (plus any ``metadata``). The
+    sidecar is written first so a registry reloading the model always finds it.
+    """
+    file_format = model_format(path)
+    schema = {
+        "format": file_format,
+        "feature_columns": booster.feature_names or FEATURE_COLUMNS,
+        "dropped_columns": DROPPED_COLUMNS,
+        "num_boosted_rounds": booster.num_boosted_rounds(),
+        **(metadata or {}),
+    }
+    _write_atomic(schema_path(path), json.dumps(schema, indent=2).encode())
+
+    if file_format == "pickle":
+        import xgboost
+
+        model = xgboost.XGBRegressor()
+        model.load_model(bytearray(booster.save_raw("json")))
+        payload = pickle.dumps(model)
+    else:
+        payload = bytes(booster.save_raw(file_format))
+    _write_atomic(path, payload)
+    return schema
+
+
+registry = ModelRegistry()
+
+
+def get_model() -> LoadedModel:
+    return registry.get()
+
+
+def warm_model_registry():
+    """
+    Load the model ahead of the first request (called from the ASGI entrypoint).
+    Failures are logged instead of raised so a missing artifact never blocks startup.
+    """
+    if not getattr(settings, "ARIMA_MODEL_WARMUP", True):
+        return None
+    try:
+        return registry.get()
+    except Exception as e:
+        logger.error(f"Model warmup failed: {e}")
+        return None
@@ -1,3 +1,106 @@
 from django.db import models
+from Authentication.models import Student
+from Test_Management.models import AnalysisDocument
+import uuid
 
 # Create your models here.
+
+
+class AnalysisJob(models.Model):
+    """A unit of background pipeline work (e.g. analysing one document) and its outcome."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    job_id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    analysis_document = models.ForeignKey(
+        AnalysisDocument, on_delete=models.CASCADE, null=True, blank=True, related_name="analysis_jobs"
+    )
+    kind = models.CharField(max_length=30, default="analysis")
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    error = models.TextField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} job {self.job_id} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.SUCCEEDED, self.FAILED)
+
+    class Meta:
+        ordering = ["-created_at"]
+
+
+class StudentFeatureSnapshot(models.Model):
+    """
+    The model features of one student in a document, as computed by one version
+    of the feature extraction, so predictions can be redone (or a new model
+    trained) without reading the raw scores again.
+    """
+
+    analysis_document = models.ForeignKey(AnalysisDocument, on_delete=models.CASCADE, related_name="feature_snapshots")
+    student = models.ForeignKey(Student, on_delete=models.CASCADE)
+    # features.FEATURE_VERSION of the extraction that produced the row
+    feature_version = models.CharField(max_length=20)
+    weighted_mean_score = models.FloatField()
+    std_score = models.FloatField()
+    last_score = models.FloatField()
+    trend_slope = models.FloatField()
+    first_last_delta = models.FloatField()
+    recent_trend_slope = models.FloatField()
+    coefficient_of_variation = models.FloatField()
+    mastery_consistency = models.FloatField()
+    recent_decay = models.FloatField()
+    downside_risk = models.FloatField()
+    # the last test the features cover
+    test_number = models.IntegerField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Features ({self.feature_version}) of {self.student_id} in document {self.analysis_document_id}"
+
+    class Meta:
+        unique_together = ("analysis_document", "student", "feature_version")
+
+
+class PipelineRun(models.Model):
+    """
+    Stage-by-stage measurements of one pipeline run over a document, recorded
+    when ARIMA_INSTRUMENTATION["RECORD_RUNS"] is set (see arima_model.instrumentation).
+    """
+
+    analysis_document = models.ForeignKey(AnalysisDocument, on_delete=models.CASCADE, related_name="pipeline_runs")
+    pipeline = models.CharField(max_length=30, default="analysis")
+    status = models.CharField(max_length=10)
+    error = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField()
+    seconds = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    # peak traced memory of the costliest stage; only measured with TRACE_MEMORY
+    peak_memory_bytes = models.BigIntegerField(null=True, blank=True)
+    # the process high-water mark when the run ended
+    max_rss_bytes = models.BigIntegerField(null=True, blank=True)
+    profile_path = models.CharField(max_length=500, null=True, blank=True)
+    # {stage: {"seconds", "rows", "queries", "calls", "peak_memory_bytes", "max_rss_bytes"}}
+    stages = models.JSONField(default=dict)
+
+    def __str__(self):
+        return f"{self.pipeline} run of document {self.analysis_document_id} ({self.status}, {self.seconds:.2f}s)"
+
+    class Meta:
+        ordering = ["-started_at"]
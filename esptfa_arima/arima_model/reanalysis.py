@@ -0,0 +1,126 @@
+import logging
+
+from django.db import transaction
+
+from Test_Management.models import (
+    FormativeAssessmentScore, PredictedScore, StudentScoresStatistic, FormativeAssessmentStatistic
+)
+from Test_Management.services.full_details_service import refresh_full_details
+from .arima_model import prepare_scores, preprocess_data, make_predictions, save_predictions, TIME_SERIES_FORECASTERS
+from .arima_statistics import document_statistics_from_db, test_statistics, student_statistics
+from .feature_store import save_feature_snapshots, load_feature_frame
+from .features import build_student_features
+from .models import StudentFeatureSnapshot
+from .score_loader import load_score_frame
+from .statistics_writer import (
+    save_document_statistics, save_test_statistics, save_student_statistics,
+    load_interval_calibration, save_interval_calibration,
+)
+
+logger = logging.getLogger("arima_model")
+
+
+def _load_prepared(analysis_document, **filters):
+    try:
+        return prepare_scores(load_score_frame(analysis_document, **filters))
+    except FormativeAssessmentScore.DoesNotExist:
+        return None
+
+
+def recompute_students(analysis_document, students, test_numbers=None):
+    """
+    Refresh predictions and statistics after the scores of ``students`` changed,
+    without recomputing the rest of the document: the affected students' scores
+    are reloaded in full and their features, predictions and statistics rebuilt,
+    then only the changed tests' statistics and the document summary.
+
+    ``test_numbers`` lists the tests whose scores changed; when omitted, every
+    test the students took is treated as changed. Every write is an upsert or a
+    replacement, so running the same recompute twice leaves the same rows.
+    """
+    students = sorted({str(lrn) for lrn in students})
+    scores = _load_prepared(analysis_document, students=students)
+    scored_students = set() if scores is None else set(scores["student_id"].astype(str))
+
+    if test_numbers is None and scores is not None:
+        test_numbers = sorted(scores["test_number"].unique().tolist())
+    test_numbers = [int(test_number) for test_number in test_numbers or []]
+
+    with transaction.atomic():
+        # students without any remaining score drop out of the document's results
+        removed = [lrn for lrn in students if lrn not in scored_students]
+        if removed:
+            for model, field in (
+                (PredictedScore, "student_id__in"),
+                (StudentScoresStatistic, "student__in"),
+                (StudentFeatureSnapshot, "student__in"),
+            ):
+                model.objects.filter(analysis_document=analysis_document, **{field: removed}).delete()
+
+        if scores is not None:
+            predictions_df = make_predictions(
+                build_student_features(scores), analysis_document, scores, load_interval_calibration(analysis_document)
+            )
+            save_predictions(predictions_df, analysis_document)
+            save_feature_snapshots(analysis_document, predictions_df)
+            save_student_statistics(analysis_document, student_statistics(scores))
+
+        test_scores = _load_prepared(analysis_document, test_numbers=test_numbers) if test_numbers else None
+        remaining_tests = set() if test_scores is None else set(test_scores["test_number"].tolist())
+        FormativeAssessmentStatistic.objects.filter(
+            analysis_document=analysis_document,
+            formative_assessment_number__in=[str(t) for t in test_numbers if t not in remaining_tests],
+        ).delete()
+        if test_scores is not None:
+            save_test_statistics(analysis_document, test_statistics(test_scores))
+
+        document_values = document_statistics_from_db(analysis_document)
+        if document_values is not None:
+            save_document_statistics(analysis_document, document_values)
+
+    refresh_full_details(analysis_document)
+
+    logger.info(
+        f"Recomputed {len(students)} student(s) and {len(test_numbers)} test(s) of analysis document "
+        f"{analysis_document.pk}"
+    )
+    return {"students": len(students), "tests": len(test_numbers)}
+
+
+def repredict_document(analysis_document):
+    """
+    Redo a document's predictions with the currently installed model from its
+    stored feature snapshots, without reading its raw scores. A document
+    analysed before snapshots existed has them built from its scores first.
+    Documents forecast with a time-series method still load their scores for
+    the forecaster. The intervals keep the document's stored calibration.
+
+    Returns ``{"students", "from_snapshots"}``, or None when the document has
+    no scores.
+    """
+    features_df = load_feature_frame(analysis_document)
+    from_snapshots = features_df is not None
+    scores = None
+    if not from_snapshots:
+        try:
+            scores, features_df = preprocess_data(analysis_document)
+        except FormativeAssessmentScore.DoesNotExist:
+            return None
+    elif analysis_document.forecast_method in TIME_SERIES_FORECASTERS:
+        scores = _load_prepared(analysis_document)
+
+    predictions_df = make_predictions(
+        features_df, analysis_document, scores, load_interval_calibration(analysis_document)
+    )
+    with transaction.atomic():
+        save_predictions(predictions_df, analysis_document)
+        if not from_snapshots:
+            save_feature_snapshots(analysis_document, predictions_df)
+            save_interval_calibration(analysis_document, predictions_df.attrs.get("interval_calibration"))
+    refresh_full_details(analysis_document)
+
+    logger.info(
+        f"Re-predicted {len(predictions_df)} student(s) of analysis document {analysis_document.pk} "
+        f"({'from feature snapshots' if from_snapshots else 'from scores'})"
+    )
+    return {"students": len(predictions_df), "from_snapshots": from_snapshots}
@@ -0,0 +1,173 @@
+import logging
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+
+from Authentication.models import Student
+from Test_Management.models import FormativeAssessmentScore
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_CHUNK_SIZE = 5000
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_SCORE = 100.0
+
+# columns pulled per score row; student details are fetched once per student
+SCORE_ROW_FIELDS = (
+    "student_id",
+    "test_number",
+    "score",
+    "topic_mapping__topic__max_score",
+    "date",
+)
+
+
+class ScoreLoadLimitExceeded(Exception):
+    """Raised when a document's scores would not fit in the loader's memory budget."""
+
+
+class _ColumnBuffer:
+    """Accumulates typed column chunks and tracks how many bytes they hold."""
+
+    def __init__(self):
+        self.chunks = []
+        self.nbytes = 0
+
+    def append(self, array):
+        self.chunks.append(array)
+        self.nbytes += array.nbytes
+
+    def concat(self, dtype):
+        if not self.chunks:
+            return np.empty(0, dtype=dtype)
+        return np.concatenate(self.chunks)
+
+
+def load_score_frame(analysis_document, chunk_size=None, max_bytes=None, students=None, test_numbers=None):
+    """
+    Load a document's formative assessment scores straight into a column-wise DataFrame.
+    ``students`` (LRNs) and ``test_numbers`` restrict the load to those rows.
+
+    Rows are read with ``values_list`` in chunks of ``chunk_size`` and converted to
+    typed arrays per chunk, so no model instances are created. Student details are
+    fetched with one extra query and attached through categorical columns.
+    Raises ``FormativeAssessmentScore.DoesNotExist`` when the document has no scores
+    and ``ScoreLoadLimitExceeded`` when the typed columns outgrow ``max_bytes``.
+    """
+    chunk_size = chunk_size or getattr(settings, "ARIMA_SCORE_LOADER_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    max_bytes = max_bytes or getattr(settings, "ARIMA_SCORE_LOADER_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+    scores_qs = FormativeAssessmentScore.objects.filter(analysis_document=analysis_document)
+    if students is not None:
+        scores_qs = scores_qs.filter(student_id__in=[str(lrn) for lrn in students])
+    if test_numbers is not None:
+        scores_qs = scores_qs.filter(test_number__in=[str(test_number) for test_number in test_numbers])
+
+    return _load_frame(scores_qs, f"analysis document {analysis_document.pk}", chunk_size, max_bytes)
+
+
+def load_documents_score_frame(analysis_documents, chunk_size=None, max_bytes=None):
+    """
+    Load the scores of several documents with one query, like ``load_score_frame``,
+    adding an ``analysis_document_id`` column. Raises
+    ``FormativeAssessmentScore.DoesNotExist`` when none of the documents has scores.
+    """
+    chunk_size = chunk_size or getattr(settings, "ARIMA_SCORE_LOADER_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+    max_bytes = max_bytes or getattr(settings, "ARIMA_SCORE_LOADER_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+    document_ids = sorted({getattr(document, "pk", document) for document in analysis_documents})
+    scores_qs = FormativeAssessmentScore.objects.filter(analysis_document_id__in=document_ids)
+    return _load_frame(
+        scores_qs, f"analysis documents {document_ids}", chunk_size, max_bytes, with_documents=True
+    )
+
+
+def _load_frame(scores_qs, label, chunk_size, max_bytes, with_documents=False):
+    fields = SCORE_ROW_FIELDS + (("analysis_document_id",) if with_documents else ())
+    rows = (
+        scores_qs.order_by()
+        .values_list(*fields)
+        .iterator(chunk_size=chunk_size)
+    )
+
+    student_codes = {}
+    buffers = [_ColumnBuffer() for _ in fields]
+    codes, test_numbers, scores, max_scores, dates = buffers[:5]
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        lrns, chunk_tests, chunk_scores, chunk_max_scores, chunk_dates, *chunk_documents = zip(*chunk)
+
+        codes.append(np.fromiter(
+            (student_codes.setdefault(lrn, len(student_codes)) for lrn in lrns),
+            dtype=np.int32, count=len(lrns)
+        ))
+        test_numbers.append(np.asarray(chunk_tests).astype(np.int32))
+        scores.append(np.asarray(chunk_scores, dtype=float))
+        # None and 0 both fall back to the default max score
+        chunk_max = np.asarray(chunk_max_scores, dtype=float)
+        max_scores.append(np.where(np.isnan(chunk_max) | (chunk_max == 0), DEFAULT_MAX_SCORE, chunk_max))
+        dates.append(np.asarray(chunk_dates, dtype="datetime64[D]"))
+        if with_documents:
+            buffers[5].append(np.asarray(chunk_documents[0], dtype=np.int64))
+
+        loaded_bytes = sum(buffer.nbytes for buffer in buffers)
+        if loaded_bytes > max_bytes:
+            raise ScoreLoadLimitExceeded(
+                f"Scores for {label} exceed the loader budget of {max_bytes} bytes"
+            )
+
+    if not student_codes:
+        logger.warning(f"No formative assessment scores found for {label}")
+        raise FormativeAssessmentScore.DoesNotExist
+
+    frame = pd.DataFrame({
+        **_student_columns(codes.concat(np.int32), student_codes),
+        "test_number": test_numbers.concat(np.int32).astype(int),
+        "score": scores.concat(float),
+        "max_score": max_scores.concat(float),
+        "date": dates.concat("datetime64[D]"),
+    })
+    if with_documents:
+        frame["analysis_document_id"] = buffers[5].concat(np.int64)
+    return frame
+
+
+def _student_columns(codes, student_codes):
+    """Build the categorical student columns from per-row codes and one student lookup."""
+    lrns = np.array(list(student_codes), dtype=object)
+
+    details = {
+        lrn: (first_name, last_name, section_name)
+        for lrn, first_name, last_name, section_name in Student.objects.filter(lrn__in=lrns)
+        .order_by()
+        .values_list("lrn", "first_name", "last_name", "section__section_name")
+    }
+
+    # categories are sorted so grouping by student follows the LRN order
+    order = np.argsort(lrns)
+    remap = np.empty_like(order)
+    remap[order] = np.arange(len(order))
+    sorted_lrns = lrns[order]
+    row_codes = remap[codes]
+
+    def categorical(values):
+        values = pd.Series(values, dtype=object)
+        value_codes, uniques = pd.factorize(values)
+        return pd.Categorical.from_codes(value_codes[row_codes], categories=uniques)
+
+    missing = ("", "", None)
+    first_names = [details.get(lrn, missing)[0] for lrn in sorted_lrns]
+    last_names = [details.get(lrn, missing)[1] for lrn in sorted_lrns]
+    sections = [details.get(lrn, missing)[2] or "N/A" for lrn in sorted_lrns]
+
+    return {
+        "student_id": pd.Categorical.from_codes(row_codes, categories=sorted_lrns),
+        "first_name": categorical(first_names),
+        "last_name": categorical(last_names),
+        "section": categorical(sections),
+    }
@@ -0,0 +1,20 @@
+from rest_framework import serializers
+from .models import AnalysisJob
+
+
+class AnalysisJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = AnalysisJob
+        fields = [
+            "job_id",
+            "analysis_document",
+            "kind",
+            "status",
+            "attempts",
+            "max_attempts",
+            "error",
+            "result",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
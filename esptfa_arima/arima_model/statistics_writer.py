@@ -0,0 +1,145 @@
+import logging
+
+from django.db import transaction
+
+from Test_Management.models import (
+    AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic, TestTopicMapping, Student
+)
+
+logger = logging.getLogger("arima_model")
+
+TEST_STATISTIC_FIELDS = [
+    "fa_topic",
+    "mean",
+    "median",
+    "mode",
+    "standard_deviation",
+    "minimum",
+    "maximum",
+    "passing_rate",
+    "failing_rate",
+    "passing_threshold",
+    "max_score",
+]
+
+STUDENT_STATISTIC_FIELDS = [
+    "mean",
+    "median",
+    "mode",
+    "standard_deviation",
+    "minimum",
+    "maximum",
+    "passing_rate",
+    "failing_rate",
+    "sum_scores",
+    "max_possible_score",
+]
+
+
+def topics_by_test_number(analysis_document):
+    """Map each test number of the document to its topic with a single query."""
+    topics = {}
+    mappings = TestTopicMapping.objects.filter(analysis_document=analysis_document).select_related("topic")
+    for mapping in mappings.order_by("-mapping_id"):
+        # newest mapping wins, like the previous per-test .first() lookup
+        topics.setdefault(str(mapping.topic.test_number), mapping.topic)
+    return topics
+
+
+def existing_student_lrns(lrns):
+    """Return the set of ``lrns`` that exist, raising Student.DoesNotExist if any are missing."""
+    lrns = [str(lrn) for lrn in lrns]
+    found = set(Student.objects.filter(lrn__in=lrns).values_list("lrn", flat=True))
+    missing = [lrn for lrn in lrns if lrn not in found]
+    if missing:
+        logger.error(f"Students not found in database: {', '.join(missing)}")
+        raise Student.DoesNotExist(f"Students not found: {', '.join(missing)}")
+    return found
+
+
+def save_document_statistics(analysis_document, values):
+    analysis_document_statistic, _ = AnalysisDocumentStatistic.objects.update_or_create(
+        analysis_document=analysis_document,
+        defaults=values,
+    )
+    return analysis_document_statistic
+
+
+def save_interval_calibration(analysis_document, calibration):
+    """Store the document's prediction interval calibration (see ``intervals.calibrate``) on its statistics row."""
+    lower, upper = calibration if calibration is not None else (None, None)
+    AnalysisDocumentStatistic.objects.filter(analysis_document=analysis_document).update(
+        prediction_error_lower=lower, prediction_error_upper=upper
+    )
+
+
+def load_interval_calibration(analysis_document):
+    """The calibration stored by ``save_interval_calibration``, or None."""
+    stored = (
+        AnalysisDocumentStatistic.objects.filter(analysis_document=analysis_document)
+        .values_list("prediction_error_lower", "prediction_error_upper")
+        .first()
+    )
+    if stored is None or None in stored:
+        return None
+    return stored
+
+
+def save_test_statistics(analysis_document, statistics):
+    """
+    Upsert one FormativeAssessmentStatistic per test in a single statement.
+    ``statistics`` is the GroupStatistics of the document's tests.
+    """
+    topics = topics_by_test_number(analysis_document)
+    objects = [
+        FormativeAssessmentStatistic(
+            analysis_document=analysis_document,
+            formative_assessment_number=str(test_number),
+            fa_topic=topics.get(str(test_number)),
+            **values,
+        )
+        for test_number, values in statistics.rows()
+    ]
+
+    with transaction.atomic():
+        FormativeAssessmentStatistic.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=["analysis_document", "formative_assessment_number"],
+            update_fields=TEST_STATISTIC_FIELDS,
+        )
+    return objects
+
+
+def save_student_statistics(analysis_document, statistics):
+    """
+    Upsert one StudentScoresStatistic per student in a single statement.
+    ``statistics`` is the GroupStatistics of the document's students.
+    """
+    existing_student_lrns(statistics.keys)
+    objects = [
+        StudentScoresStatistic(
+            analysis_document=analysis_document,
+            student_id=str(lrn),
+            **values,
+        )
+        for lrn, values in statistics.rows()
+    ]
+
+    with transaction.atomic():
+        StudentScoresStatistic.objects.bulk_create(
+            objects,
+            update_conflicts=True,
+            unique_fields=["analysis_document", "student"],
+            update_fields=STUDENT_STATISTIC_FIELDS,
+        )
+    return objects
+
+
+def save_all_statistics(analysis_document, document_values, test_statistics, student_statistics):
+    """Write the document, test and student statistics of one analysis in a single transaction."""
+    with transaction.atomic():
+        document_statistic = save_document_statistics(analysis_document, document_values)
+        save_test_statistics(analysis_document, test_statistics)
+        save_student_statistics(analysis_document, student_statistics)
+    return document_statistic
@@ -0,0 +1,64 @@
+from django.test import TestCase, SimpleTestCase, override_settings
+from unittest.mock import patch
+from Test_Management.models import AnalysisDocument, Section, PredictedScore
+from arima_model.arima_forecaster import forecast_scores, candidate_orders
+from arima_model.arima_model import arima_driver
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document, score_frame
+import numpy as np
+
+
+class ArimaForecasterTests(SimpleTestCase):
+    def test_order_grid_is_capped(self):
+        self.assertEqual(candidate_orders(1, 1), [(0, 1, 0), (0, 1, 1), (1, 1, 0), (1, 1, 1)])
+
+    def test_trend_is_extrapolated_and_short_series_are_skipped(self):
+        forecasts = forecast_scores(score_frame({
+            "a": np.linspace(0.2, 0.8, 10),
+            "b": [0.5, 0.6, 0.7],
+        }), workers=1)
+
+        self.assertAlmostEqual(forecasts.loc["a", "forecast"], 0.8667, places=2)
+        self.assertLess(forecasts.loc["a", "lower"], forecasts.loc["a", "forecast"])
+        self.assertGreater(forecasts.loc["a", "upper"], forecasts.loc["a", "forecast"])
+        self.assertTrue(forecasts.loc["b"].isna().all())
+
+    @override_settings(ARIMA_FORECASTER={"CHUNK_SIZE": 4})
+    def test_process_pool_matches_serial_fits(self):
+        rng = np.random.default_rng(1)
+        scores = score_frame({
+            f"s{i:02d}": np.clip(rng.uniform(0.4, 0.9) + rng.normal(0, 0.1, 12), 0, 1) for i in range(10)
+        })
+
+        serial = forecast_scores(scores, workers=1)
+        parallel = forecast_scores(scores, workers=2)
+
+        self.assertFalse(serial.isna().any().any())
+        np.testing.assert_allclose(parallel.to_numpy(), serial.to_numpy())
+
+
+@override_settings(ARIMA_FORECASTER={"MIN_SERIES_LENGTH": 6, "WORKERS": 1})
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class ArimaForecastMethodTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_forecaster")
+        self.section = Section.objects.create(section_name="Section Forecaster")
+        self.long, self.short = make_students(self.section, "930000000", 2)
+        # the long series has all eight tests, the short one the first three
+        self.document = make_document(
+            self.user, self.section, [self.long, self.short], 8, lambda i, t: 10 + 5 * t if i == 0 or t <= 3 else None,
+            title="Forecaster Doc", post_test_max_score=50.0, forecast_method=AnalysisDocument.ARIMA,
+        )
+
+    def predicted(self, student):
+        return PredictedScore.objects.get(analysis_document=self.document, student_id=student).score
+
+    def test_long_series_use_arima_and_short_series_fall_back(self, _):
+        arima_driver(self.document)
+        xgboost_fallback = self.predicted(self.short)
+        # the long series rises by 5 points a test, so its forecast continues the trend
+        self.assertAlmostEqual(self.predicted(self.long), 50.0, delta=1.0)
+
+        self.document.forecast_method = AnalysisDocument.XGBOOST
+        arima_driver(self.document)
+        self.assertEqual(self.predicted(self.short), xgboost_fallback)
+        self.assertLess(self.predicted(self.long), 45.0)
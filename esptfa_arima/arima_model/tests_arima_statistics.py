@@ -1,4 +1,4 @@
-from django.test import TestCase
+from django.test import TestCase, SimpleTestCase
 from django.contrib.auth.models import User
 from Authentication.models import Student
 from Test_Management.models import (
@@ -9,7 +9,11 @@ from Test_Management.models import (
 from arima_model.arima_statistics import (
     compute_document_statistics, 
     compute_test_statistics, 
-    compute_student_statistics
+    compute_student_statistics,
+    document_statistics,
+    test_statistics,
+    student_statistics,
+    group_mode
 )
 import pandas as pd
 import numpy as np
@@ -155,3 +159,87 @@ class ArimaStatisticsTests(TestCase):
         stat = compute_document_statistics(multi_mode_data, self.analysis_doc)
         # pandas .mode() returns sorted values, so 10.0 should be index 0
         self.assertEqual(stat.mode, 10.0)
+
+
+class StatisticsKernelTests(SimpleTestCase):
+    """The vectorized kernel must match the per-group pandas computations it replaced."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        rows = []
+        for student in range(60):
+            # uneven series lengths, integer scores so that modes tie often
+            for test in range(1, rng.integers(1, 9) + 1):
+                max_score = [20.0, 50.0, 100.0][test % 3]
+                score = float(rng.integers(0, max_score + 1))
+                rows.append({
+                    "student_id": f"2{student:010d}",
+                    "test_number": test,
+                    "score": score,
+                    "max_score": max_score,
+                    "normalized_scores": score / max_score,
+                    "normalized_passing_threshold": 0.70,
+                })
+        self.data = pd.DataFrame(rows)
+
+    @staticmethod
+    def reference(scores):
+        std = scores.std()
+        mode = scores.mode()
+        return {
+            "mean": scores.mean(),
+            "median": scores.median(),
+            "mode": mode[0] if not mode.empty else None,
+            "standard_deviation": 0.0 if np.isnan(std) else std,
+            "minimum": scores.min(),
+            "maximum": scores.max(),
+        }
+
+    def assertRowMatches(self, row, expected):
+        for name, value in expected.items():
+            self.assertAlmostEqual(row[name], value, places=10, msg=name)
+
+    def test_group_mode_picks_smallest_of_tied_modes(self):
+        values = np.array([3.0, 1.0, 1.0, 3.0, 2.0, 5.0, 4.0, np.nan])
+        codes = np.array([0, 0, 0, 0, 0, 1, 1, 2])
+        modes = group_mode(values, codes, 3)
+        self.assertEqual(modes[0], 1.0)
+        self.assertEqual(modes[1], 4.0)
+        self.assertTrue(np.isnan(modes[2]))
+
+    def test_document_statistics_match_reference(self):
+        values = document_statistics(self.data)
+        self.assertRowMatches(values, self.reference(self.data["score"]))
+        self.assertEqual(values["total_students"], 60)
+
+    def test_test_statistics_match_reference(self):
+        statistics = test_statistics(self.data)
+        rows = dict(statistics.rows())
+        self.assertEqual(list(rows), sorted(self.data["test_number"].unique()))
+
+        for test_number, group in self.data.groupby("test_number"):
+            row = rows[test_number]
+            threshold = 0.70 * group["max_score"].iloc[0]
+            passing = len(group[group["score"] >= threshold])
+            self.assertRowMatches(row, {
+                **self.reference(group["score"]),
+                "passing_threshold": threshold,
+                "passing_rate": passing / len(group) * 100,
+                "failing_rate": (len(group) - passing) / len(group) * 100,
+            })
+
+    def test_student_statistics_match_reference(self):
+        statistics = student_statistics(self.data)
+        rows = dict(statistics.rows())
+        self.assertEqual(len(rows), 60)
+
+        for student_id, group in self.data.groupby("student_id"):
+            row = rows[student_id]
+            passing = (group["normalized_scores"] >= group["normalized_passing_threshold"]).sum()
+            self.assertRowMatches(row, {
+                **self.reference(group["score"]),
+                "passing_rate": passing / len(group) * 100,
+                "failing_rate": (len(group) - passing) / len(group) * 100,
+                "sum_scores": group["score"].sum(),
+                "max_possible_score": group["max_score"].sum(),
+            })
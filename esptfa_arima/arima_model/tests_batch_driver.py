@@ -0,0 +1,140 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from Test_Management.models import AnalysisDocument, AnalysisGroup, Section, PredictedScore, StudentScoresStatistic
+from arima_model.arima_model import arima_driver
+from arima_model.batch_driver import arima_batch_driver
+from arima_model.models import AnalysisJob
+from arima_model.score_loader import load_documents_score_frame
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document
+
+
+class BatchFixtureMixin:
+    def setUp(self):
+        self.user = make_teacher("teacher_batch")
+        self.section = Section.objects.create(section_name="Section Batch")
+        # the same students sit in every document
+        self.students = make_students(self.section, "940000000", 5)
+        self.documents = [
+            self.make_document("Batch Doc A", offset=0),
+            self.make_document("Batch Doc B", offset=7, forecast_method=AnalysisDocument.AR1),
+            self.make_document("Batch Doc C", offset=3, n_tests=2),
+        ]
+
+    def make_document(self, title, offset, n_tests=6, **fields):
+        return make_document(
+            self.user, self.section, self.students, n_tests, lambda i, t: (offset + 7 * i + 3 * t) % 51,
+            title=title, **fields
+        )
+
+    def results(self):
+        return {
+            "predictions": sorted(PredictedScore.objects.values_list(
+                "analysis_document_id", "student_id_id", "score", "predicted_status", "test_number",
+                "lower_bound", "upper_bound",
+            )),
+            "students": sorted(StudentScoresStatistic.objects.values_list(
+                "analysis_document_id", "student_id", "mean", "passing_rate"
+            )),
+        }
+
+
+class BatchDriverTests(BatchFixtureMixin, TestCase):
+    def test_batch_matches_per_document_runs(self):
+        model = FeatureModel()
+        with patch("arima_model.arima_model.get_model", return_value=model):
+            for document in self.documents:
+                arima_driver(document)
+        expected = self.results()
+        PredictedScore.objects.all().delete()
+        StudentScoresStatistic.objects.all().delete()
+
+        batch_model = FeatureModel()
+        with patch("arima_model.batch_driver.get_model", return_value=batch_model):
+            report = arima_batch_driver(self.documents)
+
+        self.assertEqual(self.results(), expected)
+        # 15 students plus the 10 interval backtests of the two six-test documents
+        self.assertEqual(batch_model.calls, [25])
+        self.assertEqual(
+            [(entry["analysis_document_id"], entry["students"]) for entry in report["documents"]],
+            [(document.pk, 5) for document in self.documents],
+        )
+        self.assertTrue(all(entry["seconds"] >= 0 for entry in report["documents"]))
+
+    def test_scores_of_all_documents_load_with_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            scores = load_documents_score_frame(self.documents)
+
+        # one query for the scores, one for the student details
+        self.assertEqual(len(queries.captured_queries), 2)
+        self.assertEqual(len(scores), 5 * (6 + 6 + 2))
+        self.assertEqual(sorted(scores["analysis_document_id"].unique()), [d.pk for d in self.documents])
+
+    def test_documents_without_scores_are_reported(self):
+        empty = AnalysisDocument.objects.create(analysis_doc_title="Empty", teacher=self.user, section=self.section)
+        with patch("arima_model.batch_driver.get_model", return_value=FeatureModel()):
+            report = arima_batch_driver([self.documents[0], empty])
+
+        self.assertEqual(report["documents"][1], {
+            "analysis_document_id": empty.pk, "error": "No formative assessment scores found"
+        })
+        self.assertTrue(AnalysisDocument.objects.get(pk=self.documents[0].pk).status)
+        self.assertFalse(AnalysisDocument.objects.get(pk=empty.pk).status)
+
+
+@override_settings(ARIMA_JOBS={"BACKEND": "eager", "MAX_ATTEMPTS": 1, "RETRY_BACKOFF_SECONDS": 0})
+@patch("arima_model.batch_driver.get_model", return_value=FeatureModel())
+class BatchAnalysisApiTests(BatchFixtureMixin, TestCase):
+    url = "/api/analysis-document/batch_analyze/"
+
+    def setUp(self):
+        super().setUp()
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def post(self, data):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(self.url, data, format="json")
+
+    def test_batch_by_document_ids(self, _):
+        response = self.post({"analysis_document_ids": [d.pk for d in self.documents]})
+
+        self.assertEqual(response.status_code, 202)
+        job = AnalysisJob.objects.get(pk=response.data["job"]["job_id"])
+        self.assertEqual(job.kind, "batch_analysis")
+        self.assertEqual(job.status, AnalysisJob.SUCCEEDED)
+        self.assertEqual(len(job.result["documents"]), 3)
+        self.assertEqual(PredictedScore.objects.count(), 15)
+
+        status_response = self.client.get(self.url, {"job_id": str(job.job_id)})
+        self.assertEqual(status_response.status_code, 200)
+        self.assertEqual(status_response.data["result"]["documents"], job.result["documents"])
+
+    def test_batch_by_group(self, _):
+        group = AnalysisGroup.objects.create(group_name="Grade 7", teacher=self.user)
+        group.analysis_documents.set(self.documents[:2])
+
+        response = self.post({"analysis_group_id": group.pk})
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(
+            AnalysisJob.objects.get(pk=response.data["job"]["job_id"]).payload,
+            {"documents": sorted(d.pk for d in self.documents[:2])},
+        )
+
+    def test_other_teachers_documents_are_rejected(self, _):
+        other = User.objects.create_user(username="other_batch", password="password")
+        foreign = AnalysisDocument.objects.create(analysis_doc_title="Foreign", teacher=other, section=self.section)
+
+        response = self.post({"analysis_document_ids": [self.documents[0].pk, foreign.pk]})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertIn(str(foreign.pk), response.data["error"])
+        self.assertFalse(AnalysisJob.objects.exists())
+
+    def test_unknown_job(self, _):
+        self.assertEqual(self.client.get(self.url, {"job_id": "not-a-uuid"}).status_code, 404)
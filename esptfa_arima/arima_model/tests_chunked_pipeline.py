@@ -0,0 +1,133 @@
+from django.test import TestCase, SimpleTestCase, override_settings
+from unittest.mock import patch
+from Test_Management.models import (
+    AnalysisDocument, Section, FormativeAssessmentScore, PredictedScore,
+    AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic,
+)
+from arima_model.arima_model import arima_driver, prepare_scores
+from arima_model.arima_statistics import document_statistics, test_statistics
+from arima_model.chunked_pipeline import arima_chunked_driver, StatisticsAccumulator
+from arima_model.models import StudentFeatureSnapshot
+from arima_model.score_loader import load_score_frame
+from arima_model.features import FEATURE_COLUMNS
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document
+import numpy as np
+
+
+def model_rows(queryset, fields):
+    return sorted(queryset.values_list(*fields))
+
+
+@patch("arima_model.chunked_pipeline.get_model", return_value=FeatureModel())
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class ChunkedPipelineTests(TestCase):
+    n_students = 23
+
+    def setUp(self):
+        self.user = make_teacher("teacher_chunked")
+        self.section = Section.objects.create(section_name="Section Chunked")
+        students = make_students(self.section, "7500000000", self.n_students)
+        self.documents = [self.make_document(f"Chunked Doc {d}", students, seed=d) for d in range(2)]
+
+    def make_document(self, title, students, seed):
+        rng = np.random.default_rng(seed)
+        # a few students miss the later tests
+        return make_document(
+            self.user, self.section, students, 6,
+            lambda i, t: None if t > 3 and i % 7 == 0 else float(rng.integers(0, 41 + t)),
+            title=title, max_score=lambda t: 40 + t, passing_threshold=30.0,
+        )
+
+    def results(self, document):
+        return {
+            "predictions": model_rows(
+                PredictedScore.objects.filter(analysis_document=document),
+                ["student_id_id", "test_number", "score", "lower_bound", "upper_bound", "predicted_status"],
+            ),
+            "snapshots": model_rows(
+                StudentFeatureSnapshot.objects.filter(analysis_document=document),
+                ["student_id", "test_number", *FEATURE_COLUMNS],
+            ),
+            "students": model_rows(
+                StudentScoresStatistic.objects.filter(analysis_document=document),
+                ["student_id", "mean", "median", "mode", "standard_deviation", "passing_rate", "sum_scores"],
+            ),
+            "tests": model_rows(
+                FormativeAssessmentStatistic.objects.filter(analysis_document=document),
+                ["formative_assessment_number", "mean", "median", "mode", "standard_deviation",
+                 "minimum", "maximum", "passing_rate", "failing_rate", "passing_threshold"],
+            ),
+            "document": model_rows(
+                AnalysisDocumentStatistic.objects.filter(analysis_document=document),
+                ["mean", "median", "mode", "standard_deviation", "minimum", "maximum",
+                 "total_students", "mean_passing_threshold"],
+            ),
+        }
+
+    def assertResultsMatch(self, chunked, full):
+        self.assertEqual(chunked.keys(), full.keys())
+        for name in full:
+            self.assertEqual(len(chunked[name]), len(full[name]), name)
+            for chunked_row, full_row in zip(chunked[name], full[name]):
+                for chunked_value, full_value in zip(chunked_row, full_row):
+                    if isinstance(full_value, float):
+                        self.assertAlmostEqual(chunked_value, full_value, places=9, msg=name)
+                    else:
+                        self.assertEqual(chunked_value, full_value, name)
+
+    def test_chunks_match_the_full_analysis(self, *_):
+        arima_driver(self.documents[0])
+        full = self.results(self.documents[0])
+
+        for chunk_students in (1, 5, 100):
+            with self.subTest(chunk_students=chunk_students):
+                self.assertTrue(arima_chunked_driver(self.documents[0], chunk_students=chunk_students))
+                self.assertResultsMatch(self.results(self.documents[0]), full)
+
+        self.assertEqual(len(full["predictions"]), self.n_students)
+        self.assertTrue(all(row[3] is not None for row in full["predictions"]))
+
+    @override_settings(ARIMA_PIPELINE={"CHUNK_STUDENTS": 4})
+    def test_driver_chunks_large_documents(self, *_):
+        with patch("arima_model.chunked_pipeline.arima_chunked_driver", wraps=arima_chunked_driver) as chunked:
+            arima_driver(self.documents[1])
+
+        chunked.assert_called_once()
+        self.documents[1].refresh_from_db()
+        self.assertTrue(self.documents[1].status)
+        self.assertEqual(PredictedScore.objects.filter(analysis_document=self.documents[1]).count(), self.n_students)
+
+    def test_document_without_scores(self, *_):
+        empty = AnalysisDocument.objects.create(analysis_doc_title="Empty", teacher=self.user, section=self.section)
+        with self.assertRaises(FormativeAssessmentScore.DoesNotExist):
+            arima_chunked_driver(empty, chunk_students=2)
+
+
+class StatisticsAccumulatorTests(SimpleTestCase):
+    def test_merged_chunks_match_the_whole_frame(self):
+        import pandas as pd
+
+        rng = np.random.default_rng(3)
+        n = 400
+        scores = prepare_scores(pd.DataFrame({
+            "student_id": pd.Categorical([f"s{i // 8:03d}" for i in range(n)]),
+            "score": rng.integers(0, 30, n).astype(float),
+            "max_score": np.tile([30.0, 30.0, 25.0, 30.0, 40.0, 30.0, 30.0, 30.0], n // 8),
+            "test_number": np.tile(np.arange(1, 9).astype(str), n // 8),
+            "date": pd.Timestamp("2025-01-01"),
+        }))
+
+        accumulator = StatisticsAccumulator()
+        students = scores["student_id"].cat.categories
+        for start in range(0, len(students), 7):
+            accumulator.add(scores[scores["student_id"].isin(students[start:start + 7])])
+
+        expected = document_statistics(scores)
+        for name, value in accumulator.document_statistics().items():
+            self.assertAlmostEqual(value, expected[name], places=9, msg=name)
+
+        expected_tests = test_statistics(scores)
+        merged_tests = accumulator.test_statistics()
+        np.testing.assert_array_equal(merged_tests.keys, expected_tests.keys)
+        for name, column in expected_tests.columns.items():
+            np.testing.assert_allclose(merged_tests.columns[name], column, rtol=1e-9, err_msg=name)
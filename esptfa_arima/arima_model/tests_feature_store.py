@@ -0,0 +1,127 @@
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from Test_Management.models import (
+    Section, FormativeAssessmentScore, PredictedScore, ActualPostTest
+)
+from arima_model.arima_model import arima_driver, preprocess_data
+from arima_model.feature_store import load_feature_frames, load_feature_frame, FEATURE_FRAME_COLUMNS
+from arima_model.features import FEATURE_COLUMNS
+from arima_model.models import StudentFeatureSnapshot
+from arima_model.reanalysis import recompute_students, repredict_document
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document
+from arima_model.training import iter_training_chunks
+import numpy as np
+import os
+
+
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class FeatureStoreTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_features")
+        self.section = Section.objects.create(section_name="Section Features")
+        self.students = make_students(self.section, "730000000", 6)
+        self.documents = [
+            make_document(
+                self.user, self.section, self.students, 5, lambda i, t, offset=5 * d: (offset + 9 * i + 4 * t) % 51,
+                title=f"Feature Doc {d}",
+            )
+            for d in range(2)
+        ]
+
+    def assertFramesMatch(self, stored, expected):
+        self.assertEqual(list(stored.columns), FEATURE_FRAME_COLUMNS)
+        self.assertEqual(stored["student_id"].tolist(), expected["student_id"].astype(str).tolist())
+        np.testing.assert_allclose(stored[FEATURE_COLUMNS].to_numpy(), expected[FEATURE_COLUMNS].to_numpy(dtype=float))
+        np.testing.assert_array_equal(stored["test_number"].to_numpy(), expected["test_number"].to_numpy())
+
+    def test_driver_stores_snapshots_once(self, _):
+        arima_driver(self.documents[0])
+        arima_driver(self.documents[0])
+
+        self.assertEqual(StudentFeatureSnapshot.objects.filter(analysis_document=self.documents[0]).count(), 6)
+        _, expected = preprocess_data(self.documents[0])
+        self.assertFramesMatch(load_feature_frame(self.documents[0]), expected)
+
+    def test_frames_of_many_documents_load_with_one_query(self, _):
+        for document in self.documents:
+            arima_driver(document)
+
+        with CaptureQueriesContext(connection) as queries:
+            frames = load_feature_frames(self.documents)
+
+        self.assertEqual(len(queries.captured_queries), 1)
+        self.assertEqual(sorted(frames), [d.pk for d in self.documents])
+        for document in self.documents:
+            self.assertFramesMatch(frames[document.pk], preprocess_data(document)[1])
+        self.assertEqual(load_feature_frames(self.documents, version="0"), {})
+
+    def test_repredict_reads_no_scores(self, _):
+        arima_driver(self.documents[0])
+
+        with patch("arima_model.arima_model.get_model", return_value=FeatureModel(column=2, version="new")):
+            with CaptureQueriesContext(connection) as queries:
+                result = repredict_document(self.documents[0])
+
+        self.assertEqual(result, {"students": 6, "from_snapshots": True})
+        self.assertFalse(any("formativeassessmentscore" in q["sql"].lower() for q in queries.captured_queries))
+        # the new model predicts each student's last score
+        _, features_df = preprocess_data(self.documents[0])
+        expected = dict(zip(features_df["student_id"].astype(str), features_df["last_score"] * 60))
+        for lrn, score in PredictedScore.objects.filter(analysis_document=self.documents[0]).values_list("student_id_id", "score"):
+            self.assertAlmostEqual(score, expected[lrn])
+        self.assertEqual(PredictedScore.objects.filter(analysis_document=self.documents[0]).count(), 6)
+
+    def test_repredict_builds_missing_snapshots(self, _):
+        result = repredict_document(self.documents[1])
+
+        self.assertEqual(result, {"students": 6, "from_snapshots": False})
+        self.assertEqual(StudentFeatureSnapshot.objects.filter(analysis_document=self.documents[1]).count(), 6)
+
+    def test_reanalysis_refreshes_the_students_snapshot(self, _):
+        arima_driver(self.documents[0])
+        student = self.students[2]
+        FormativeAssessmentScore.objects.filter(
+            analysis_document=self.documents[0], student_id=student, test_number="5"
+        ).update(score=0)
+
+        recompute_students(self.documents[0], [student.lrn], [5])
+
+        snapshot = StudentFeatureSnapshot.objects.get(analysis_document=self.documents[0], student=student)
+        self.assertEqual(snapshot.last_score, 0)
+
+    def test_training_reads_snapshots(self, _):
+        for i, student in enumerate(self.students):
+            ActualPostTest.objects.create(analysis_document=self.documents[0], student=student, score=30 + i, max_score=60)
+        from_scores = list(iter_training_chunks([self.documents[0].pk], 10))
+        arima_driver(self.documents[0])
+
+        with CaptureQueriesContext(connection) as queries:
+            from_snapshots = list(iter_training_chunks([self.documents[0].pk], 10))
+
+        self.assertFalse(any("formativeassessmentscore" in q["sql"].lower() for q in queries.captured_queries))
+        np.testing.assert_allclose(from_snapshots[0].features, from_scores[0].features)
+        np.testing.assert_array_equal(from_snapshots[0].targets, from_scores[0].targets)
+
+    def test_student_detail_includes_features(self, _):
+        arima_driver(self.documents[0])
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(
+            f"/api/analysis-document/{self.documents[0].pk}/student_analysis_detail/", {"lrn": self.students[1].lrn}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.data["features"]), FEATURE_COLUMNS)
+        snapshot = StudentFeatureSnapshot.objects.get(analysis_document=self.documents[0], student=self.students[1])
+        self.assertEqual(response.data["features"]["trend_slope"], snapshot.trend_slope)
+
+    def test_repredict_command(self, _):
+        arima_driver(self.documents[0])
+        with patch("arima_model.management.commands.repredict_documents.get_model", return_value=FeatureModel()):
+            call_command("repredict_documents", "--all", stdout=open(os.devnull, "w"))
+        self.assertEqual(PredictedScore.objects.filter(analysis_document=self.documents[0]).count(), 6)
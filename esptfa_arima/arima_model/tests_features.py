@@ -0,0 +1,88 @@
+from django.test import SimpleTestCase
+from arima_model.features import FEATURE_COLUMNS, build_score_matrix, build_student_features
+from arima_model.arima_model import (
+    weighted_mean_score, score_std, last_score, trend_slope, first_last_delta,
+    recent_trend_slope, coefficient_of_variation, mastery_consistency,
+    recent_decay, downside_risk
+)
+import pandas as pd
+import numpy as np
+
+
+def per_series_features(df):
+    """The original per-student loop from preprocess_data, kept as the parity reference."""
+    features_list = []
+    for student_id, student_data in df.groupby("student_id"):
+        scores = student_data["normalized_scores"]
+        features_list.append({
+            "student_id": student_id,
+            "weighted_mean_score": weighted_mean_score(scores),
+            "std_score": score_std(scores),
+            "last_score": last_score(scores),
+            "trend_slope": trend_slope(scores),
+            "first_last_delta": first_last_delta(scores),
+            "recent_trend_slope": recent_trend_slope(scores),
+            "coefficient_of_variation": coefficient_of_variation(scores),
+            "mastery_consistency": mastery_consistency(scores),
+            "recent_decay": recent_decay(scores),
+            "downside_risk": downside_risk(scores),
+            "normalized_passing_threshold": 0.70,
+            "test_number": student_data["test_number"].max()
+        })
+    return pd.DataFrame(features_list)
+
+
+def random_score_frame(n_students, max_tests, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n_students):
+        # cover the edge cases: 1 and 2 points, shorter and longer than both windows
+        n_tests = (i % max_tests) + 1
+        for t in range(n_tests):
+            rows.append({
+                "student_id": f"{100000000000 + i}",
+                "test_number": t + 1,
+                # round so exact threshold hits (0.70, 0.81) are exercised
+                "normalized_scores": round(float(rng.uniform(0.3, 1.0)), 2),
+            })
+    # shuffle students so the engine has to group them itself
+    return pd.DataFrame(rows).sample(frac=1.0, random_state=seed).sort_values("student_id", kind="stable")
+
+
+class FeatureEngineParityTests(SimpleTestCase):
+    def assert_frames_match(self, df):
+        expected = per_series_features(df)
+        actual = build_student_features(df)
+
+        self.assertEqual(list(actual.columns), list(expected.columns))
+        self.assertEqual(list(actual["student_id"]), list(expected["student_id"]))
+        self.assertEqual(list(actual["test_number"]), list(expected["test_number"]))
+        for column in FEATURE_COLUMNS:
+            np.testing.assert_allclose(
+                actual[column].to_numpy(dtype=float),
+                expected[column].to_numpy(dtype=float),
+                rtol=1e-12, atol=1e-12, err_msg=column
+            )
+
+    def test_parity_with_per_series_functions(self):
+        """The vectorized engine matches the per-student functions for every feature."""
+        self.assert_frames_match(random_score_frame(n_students=200, max_tests=12))
+
+    def test_parity_single_student_single_score(self):
+        df = pd.DataFrame([{"student_id": "1", "test_number": 1, "normalized_scores": 0.75}])
+        self.assert_frames_match(df)
+
+    def test_series_order_is_preserved(self):
+        """Scores keep the order they have in the frame, which the trend features depend on."""
+        df = pd.DataFrame({
+            "student_id": ["1", "1", "1"],
+            "test_number": [1, 2, 3],
+            "normalized_scores": [0.2, 0.5, 0.9],
+        })
+        matrix = build_score_matrix(df)
+        np.testing.assert_array_equal(matrix.values[0], [0.2, 0.5, 0.9])
+        self.assertGreater(build_student_features(df)["trend_slope"].iloc[0], 0)
+
+    def test_empty_frame(self):
+        empty = pd.DataFrame(columns=["student_id", "test_number", "normalized_scores"])
+        self.assertTrue(build_student_features(empty).empty)
@@ -0,0 +1,132 @@
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from unittest.mock import patch
+from Test_Management.models import AnalysisDocument, Section, FormativeAssessmentScore
+from arima_model.arima_model import arima_driver
+from arima_model.chunked_pipeline import arima_chunked_driver
+from arima_model.instrumentation import instrumented_run, pipeline_stage
+from arima_model.models import PipelineRun
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document
+import io
+import json
+import os
+import pstats
+import tempfile
+
+SINGLE_PASS_STAGES = [
+    "list_students", "load_scores", "build_features", "build_backtest", "load_model", "predict",
+    "finish_predictions", "save_predictions", "save_feature_snapshots",
+    "document_statistics", "test_statistics", "student_statistics", "save_statistics", "refresh_full_details",
+]
+
+
+def logged_runs(logs):
+    return [json.loads(line.split(":", 2)[2]) for line in logs.output if '"event": "pipeline_run"' in line]
+
+
+@patch("arima_model.chunked_pipeline.get_model", return_value=FeatureModel())
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class PipelineInstrumentationTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_instrumented")
+        self.section = Section.objects.create(section_name="Section Instrumented")
+        self.document = make_document(
+            self.user, self.section, make_students(self.section, "7600000000", 8), 5,
+            lambda i, t: (7 * i + 3 * t) % 51, title="Instrumented Doc",
+        )
+
+    def test_driver_logs_every_stage_as_json(self, *_):
+        with self.assertLogs("arima_model", level="INFO") as logs:
+            arima_driver(self.document)
+
+        [report] = logged_runs(logs)
+        self.assertEqual(report["pipeline"], "analysis")
+        self.assertEqual(report["status"], "succeeded")
+        self.assertEqual(report["analysis_document"], self.document.pk)
+        self.assertEqual(list(report["stages"]), SINGLE_PASS_STAGES)
+        self.assertEqual(report["stages"]["load_scores"]["rows"], 40)
+        self.assertEqual(report["stages"]["predict"]["rows"], 16)  # students, then their backtests
+        self.assertEqual(report["stages"]["list_students"]["queries"], 1)
+        self.assertLessEqual(sum(stage["queries"] for stage in report["stages"].values()), report["query_count"])
+        self.assertIsNone(report["peak_memory_bytes"])
+        self.assertFalse(PipelineRun.objects.exists())
+
+    @override_settings(ARIMA_PIPELINE={"CHUNK_STUDENTS": 3})
+    def test_chunk_stages_are_summed(self, *_):
+        with self.assertLogs("arima_model", level="INFO") as logs:
+            arima_driver(self.document)
+
+        [report] = logged_runs(logs)
+        self.assertEqual(report["pipeline"], "chunked_analysis")
+        self.assertEqual(report["stages"]["load_scores"]["calls"], 3)
+        self.assertEqual(report["stages"]["load_scores"]["rows"], 40)
+        self.assertEqual(report["stages"]["save_predictions"]["rows"], 8)
+
+    @override_settings(ARIMA_INSTRUMENTATION={"RECORD_RUNS": True, "TRACE_MEMORY": True})
+    def test_runs_are_recorded(self, *_):
+        arima_driver(self.document)
+        empty = AnalysisDocument.objects.create(analysis_doc_title="Empty", teacher=self.user, section=self.section)
+        with self.assertRaises(FormativeAssessmentScore.DoesNotExist):
+            arima_driver(empty)
+
+        run = PipelineRun.objects.get(analysis_document=self.document)
+        self.assertEqual(run.status, "succeeded")
+        self.assertEqual(list(run.stages), SINGLE_PASS_STAGES)
+        self.assertGreater(run.peak_memory_bytes, 0)
+        self.assertGreater(run.stages["build_features"]["peak_memory_bytes"], 0)
+
+        failed = PipelineRun.objects.get(analysis_document=empty)
+        self.assertEqual(failed.status, "failed")
+        self.assertIn("DoesNotExist", failed.error)
+
+    @override_settings(ARIMA_INSTRUMENTATION={"RECORD_RUNS": True}, ARIMA_PIPELINE={"CHUNK_STUDENTS": 3})
+    def test_chunked_runs_are_recorded_under_their_pipeline(self, *_):
+        arima_driver(self.document)
+        arima_chunked_driver(self.document)
+
+        self.assertEqual(
+            list(PipelineRun.objects.order_by("started_at").values_list("pipeline", flat=True)),
+            ["chunked_analysis", "chunked_analysis"],
+        )
+
+    def test_profile_command_writes_a_profile(self, *_):
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with override_settings(ARIMA_INSTRUMENTATION={"PROFILE_DIR": profile_dir}):
+                output = io.StringIO()
+                call_command("profile_analysis", str(self.document.pk), stdout=output)
+
+            [profile] = os.listdir(profile_dir)
+            self.assertTrue(profile.startswith(f"analysis-{self.document.pk}-"))
+            self.assertGreater(pstats.Stats(os.path.join(profile_dir, profile)).total_calls, 0)
+        self.assertIn("save_predictions", output.getvalue())
+        self.assertIn(profile, output.getvalue())
+
+    def test_listed_documents_are_profiled(self, *_):
+        with tempfile.TemporaryDirectory() as profile_dir:
+            with override_settings(ARIMA_INSTRUMENTATION={"PROFILE_DIR": profile_dir, "PROFILE_DOCUMENTS": [self.document.pk]}):
+                with self.assertLogs("arima_model", level="INFO") as logs:
+                    arima_driver(self.document)
+                self.assertEqual(len(os.listdir(profile_dir)), 1)
+        self.assertTrue(logged_runs(logs)[0]["profile"].endswith(".prof"))
+
+    @override_settings(ARIMA_INSTRUMENTATION={"RECORD_RUNS": True})
+    def test_runs_log_without_the_resource_module(self, *_):
+        # Windows has no resource module
+        with patch("arima_model.instrumentation.resource", None):
+            with self.assertLogs("arima_model", level="INFO") as logs:
+                arima_driver(self.document)
+
+        [report] = logged_runs(logs)
+        self.assertEqual(report["status"], "succeeded")
+        self.assertIsNone(report["max_rss_bytes"])
+        self.assertIsNone(report["stages"]["predict"]["max_rss_bytes"])
+        self.assertIsNone(PipelineRun.objects.get(analysis_document=self.document).max_rss_bytes)
+
+    def test_stages_outside_a_run_are_not_measured(self, *_):
+        with pipeline_stage("orphan", rows=3) as stage:
+            stage["rows"] = 4
+
+        with instrumented_run(self.document, name="outer") as run:
+            with pipeline_stage("inner"):
+                pass
+        self.assertEqual(list(run.stages), ["inner"])
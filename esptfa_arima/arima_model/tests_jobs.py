@@ -0,0 +1,254 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from Authentication.models import Teacher, Student
+from Test_Management.models import AnalysisDocument, Subject, Quarter, Section, TestDraft
+from arima_model.models import AnalysisJob
+from arima_model.jobs import enqueue_job, run_job, latest_job, recover_stale_jobs
+
+
+EAGER_JOBS = {"BACKEND": "eager", "MAX_ATTEMPTS": 3, "RETRY_BACKOFF_SECONDS": 0}
+
+
+@override_settings(ARIMA_JOBS=EAGER_JOBS)
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_jobs", password="password")
+        self.section = Section.objects.create(section_name="Section Jobs")
+        self.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Jobs Doc", teacher=self.user, section=self.section
+        )
+
+    def test_job_runs_after_commit(self):
+        calls = []
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": lambda job: calls.append(job.pk) or {"ok": True}}):
+            with self.captureOnCommitCallbacks(execute=True):
+                job = enqueue_job("analysis", analysis_document=self.document)
+                # nothing runs until the transaction commits
+                self.assertEqual(calls, [])
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [job.pk])
+        self.assertEqual(job.status, AnalysisJob.SUCCEEDED)
+        self.assertEqual(job.result, {"ok": True})
+        self.assertEqual(job.attempts, 1)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_transient_failure_is_retried(self):
+        attempts = []
+
+        def flaky(job):
+            attempts.append(job.attempts)
+            if len(attempts) < 3:
+                raise RuntimeError("database is locked")
+            return {}
+
+        job = AnalysisJob.objects.create(analysis_document=self.document, max_attempts=3)
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": flaky}):
+            job = run_job(job.pk)
+
+        self.assertEqual(attempts, [1, 2, 3])
+        self.assertEqual(job.status, AnalysisJob.SUCCEEDED)
+
+    def test_job_fails_after_max_attempts(self):
+        def broken(job):
+            raise RuntimeError("boom")
+
+        job = AnalysisJob.objects.create(analysis_document=self.document, max_attempts=2)
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": broken}):
+            job = run_job(job.pk)
+
+        self.assertEqual(job.status, AnalysisJob.FAILED)
+        self.assertEqual(job.attempts, 2)
+        self.assertIn("boom", job.error)
+
+    def test_permanent_failure_is_not_retried(self):
+        def missing(job):
+            raise AnalysisDocument.DoesNotExist("gone")
+
+        job = AnalysisJob.objects.create(analysis_document=self.document, max_attempts=3)
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": missing}):
+            job = run_job(job.pk)
+
+        self.assertEqual(job.status, AnalysisJob.FAILED)
+        self.assertEqual(job.attempts, 1)
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            enqueue_job("not-a-job")
+
+    def test_latest_job(self):
+        first = AnalysisJob.objects.create(analysis_document=self.document)
+        second = AnalysisJob.objects.create(analysis_document=self.document)
+        self.assertEqual(latest_job(self.document), second)
+        self.assertNotEqual(latest_job(self.document), first)
+
+
+class RecordingBackend:
+    def __init__(self, queued=()):
+        self.submitted = []
+        self.queued = {str(job_id) for job_id in queued}
+
+    def submit(self, job_id):
+        self.submitted.append(job_id)
+
+    def queued_ids(self):
+        return self.queued
+
+
+@override_settings(ARIMA_JOBS={**EAGER_JOBS, "STALE_AFTER_SECONDS": 600})
+class StaleJobRecoveryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_stale_jobs", password="password")
+        self.section = Section.objects.create(section_name="Section Stale Jobs")
+        self.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Stale Jobs Doc", teacher=self.user, section=self.section
+        )
+        self.long_ago = timezone.now() - timedelta(hours=2)
+
+    def job(self, status, attempts=0, max_attempts=3, age=None):
+        job = AnalysisJob.objects.create(
+            analysis_document=self.document, status=status, attempts=attempts, max_attempts=max_attempts,
+            started_at=(age or self.long_ago) if status == AnalysisJob.RUNNING else None,
+        )
+        AnalysisJob.objects.filter(pk=job.pk).update(created_at=age or self.long_ago)
+        return job
+
+    def test_lost_running_job_is_requeued_and_runs_again(self):
+        job = self.job(AnalysisJob.RUNNING, attempts=1)
+        backend = RecordingBackend()
+
+        requeued, failed = recover_stale_jobs(backend)
+
+        self.assertEqual((requeued, failed), ([job.pk], []))
+        self.assertEqual(backend.submitted, [job.pk])
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.QUEUED)
+        self.assertIsNone(job.started_at)
+
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": lambda job: {}}):
+            job = run_job(job.pk)
+        self.assertEqual(job.status, AnalysisJob.SUCCEEDED)
+        # the lost run still counts
+        self.assertEqual(job.attempts, 2)
+
+    def test_lost_running_job_without_attempts_left_fails(self):
+        job = self.job(AnalysisJob.RUNNING, attempts=3, max_attempts=3)
+        backend = RecordingBackend()
+
+        self.assertEqual(recover_stale_jobs(backend), ([], [job.pk]))
+        self.assertEqual(backend.submitted, [])
+        job.refresh_from_db()
+        self.assertEqual(job.status, AnalysisJob.FAILED)
+        self.assertIn("lost while running", job.error)
+        self.assertIsNotNone(job.finished_at)
+
+    def test_queued_job_missing_from_the_queue_is_resubmitted(self):
+        lost = self.job(AnalysisJob.QUEUED)
+        waiting = self.job(AnalysisJob.QUEUED)
+        backend = RecordingBackend(queued=[waiting.pk])
+
+        self.assertEqual(recover_stale_jobs(backend), ([lost.pk], []))
+        self.assertEqual(backend.submitted, [lost.pk])
+
+    def test_recent_and_finished_jobs_are_left_alone(self):
+        recent = timezone.now() - timedelta(minutes=1)
+        self.job(AnalysisJob.RUNNING, attempts=1, age=recent)
+        self.job(AnalysisJob.QUEUED, age=recent)
+        self.job(AnalysisJob.SUCCEEDED)
+        self.job(AnalysisJob.FAILED)
+        backend = RecordingBackend()
+
+        self.assertEqual(recover_stale_jobs(backend), ([], []))
+        self.assertEqual(backend.submitted, [])
+
+    def test_a_job_is_only_run_once(self):
+        job = self.job(AnalysisJob.RUNNING, attempts=1, age=timezone.now())
+        calls = []
+
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": lambda job: calls.append(job.pk) or {}}):
+            skipped = run_job(job.pk)
+
+        self.assertEqual(calls, [])
+        self.assertEqual(skipped.status, AnalysisJob.RUNNING)
+        self.assertEqual(skipped.attempts, 1)
+
+    def test_worker_recovers_on_startup(self):
+        from arima_model.management.commands.run_analysis_worker import Command
+
+        job = self.job(AnalysisJob.RUNNING, attempts=1)
+        backend = RecordingBackend()
+        command = Command()
+        with patch.object(command.stdout, "write") as write:
+            command.recover(backend)
+
+        self.assertEqual(backend.submitted, [job.pk])
+        write.assert_called_once_with("Recovered stale jobs: 1 requeued, 0 failed")
+
+
+@override_settings(ARIMA_JOBS=EAGER_JOBS)
+class AnalysisDocumentJobApiTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="teacher_jobs_api", password="password")
+        Teacher.objects.create(user_id=self.user)
+        self.section = Section.objects.create(section_name="Section Jobs API")
+        self.subject = Subject.objects.create(subject_name="Math")
+        self.quarter = Quarter.objects.create(quarter_name="1st Quarter")
+        Student.objects.create(lrn="30000000001", section=self.section)
+
+        self.draft = TestDraft.objects.create(
+            user_teacher=self.user,
+            title="Queued Doc",
+            quarter=self.quarter,
+            subject=self.subject,
+            section_id=self.section,
+            test_content={
+                "topics": [{"name": "Algebra", "max_score": 50, "test_number": "1"}],
+                "scores": {"30000000001": {"topic-1": {"score": 40, "max_score": 50, "test_number": "1"}}},
+            },
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_create_returns_202_and_job_status_tracks_the_job(self):
+        def finish(job):
+            job.analysis_document.status = True
+            job.analysis_document.save()
+            return {"model_version": "test"}
+
+        with patch.dict("arima_model.jobs.JOB_HANDLERS", {"analysis": finish}):
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                response = self.client.post(
+                    "/api/analysis-document/", {"test_draft_id": str(self.draft.pk)}, format="json"
+                )
+
+            self.assertEqual(response.status_code, 202)
+            document_id = response.data["analysis_document_id"]
+            self.assertEqual(response.data["job"]["status"], AnalysisJob.QUEUED)
+
+            # until the job runs, full_details reports the document as processing
+            details = self.client.get(f"/api/analysis-document/{document_id}/full_details/")
+            self.assertEqual(details.status_code, 202)
+            self.assertEqual(details.data["message"], "Document is still being processed")
+
+            for callback in callbacks:
+                callback()
+
+        job_status = self.client.get(f"/api/analysis-document/{document_id}/job_status/")
+        self.assertEqual(job_status.status_code, 200)
+        self.assertEqual(job_status.data["status"], AnalysisJob.SUCCEEDED)
+        self.assertEqual(job_status.data["result"], {"model_version": "test"})
+
+    def test_unknown_forecast_method_is_a_bad_request(self):
+        self.draft.test_content["forecast_method"] = "prophet"
+        self.draft.save()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/analysis-document/", {"test_draft_id": str(self.draft.pk)}, format="json")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("forecast_method", response.data["error"])
+        self.assertFalse(AnalysisJob.objects.exists())
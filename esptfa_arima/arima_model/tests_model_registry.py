@@ -0,0 +1,132 @@
+from django.core.management import call_command
+from django.test import SimpleTestCase, override_settings
+from arima_model.features import FEATURE_COLUMNS
+from arima_model.management.commands.export_model import LEGACY_MODEL_PATH
+from arima_model.model_registry import (
+    ModelRegistry, NativeModel, warm_model_registry, save_model, schema_path, DEFAULT_MODEL_PATH
+)
+import json
+import numpy as np
+import os
+import pickle
+import tempfile
+
+
+class StubModel:
+    def __init__(self, value):
+        self.value = value
+
+    def predict(self, x):
+        return [self.value] * len(x)
+
+
+class ModelRegistryTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.model_path = os.path.join(self.tmp_dir.name, "model.pkl")
+        self.write_model(StubModel(0.5))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_model(self, model, mtime_ns=None):
+        with open(self.model_path, "wb") as f:
+            pickle.dump(model, f)
+        if mtime_ns is not None:
+            os.utime(self.model_path, ns=(mtime_ns, mtime_ns))
+
+    def test_model_is_loaded_once(self):
+        """Repeated lookups reuse the same deserialized model."""
+        registry = ModelRegistry(self.model_path)
+        first = registry.get()
+        second = registry.get()
+
+        self.assertIs(first, second)
+        self.assertIs(first.model, second.model)
+        self.assertEqual(first.predict([[1], [2]]), [0.5, 0.5])
+        self.assertEqual(registry.version(), first.version)
+
+    def test_reload_when_file_changes(self):
+        """Replacing the file on disk is picked up on the next lookup."""
+        registry = ModelRegistry(self.model_path)
+        first = registry.get()
+
+        self.write_model(StubModel(0.9), mtime_ns=first.mtime_ns + 1_000_000_000)
+        second = registry.get()
+
+        self.assertIsNot(first, second)
+        self.assertNotEqual(first.version, second.version)
+        self.assertEqual(second.predict([[1]]), [0.9])
+
+    def test_missing_model_raises(self):
+        registry = ModelRegistry(os.path.join(self.tmp_dir.name, "missing.pkl"))
+        with self.assertRaises(FileNotFoundError):
+            registry.get()
+
+    def test_path_from_settings(self):
+        with override_settings(ARIMA_MODEL_PATH=self.model_path):
+            registry = ModelRegistry()
+            self.assertEqual(registry.path, self.model_path)
+            self.assertEqual(registry.get().path, self.model_path)
+
+    def test_warmup_swallows_errors(self):
+        """A missing artifact must not break application startup."""
+        with override_settings(ARIMA_MODEL_PATH=os.path.join(self.tmp_dir.name, "missing.pkl")):
+            self.assertIsNone(warm_model_registry())
+
+
+class NativeModelFormatTests(SimpleTestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        with open(LEGACY_MODEL_PATH, "rb") as f:
+            self.pickled = pickle.load(f)
+        self.booster = self.pickled.get_booster()
+        self.x = np.random.default_rng(0).random((50, len(FEATURE_COLUMNS)))
+
+    def path(self, name):
+        return os.path.join(self.tmp_dir.name, name)
+
+    def test_native_formats_predict_like_the_pickle(self):
+        for name in ["model.ubj", "model.json"]:
+            save_model(self.booster, self.path(name))
+            loaded = ModelRegistry(self.path(name)).get()
+
+            self.assertEqual(loaded.format, os.path.splitext(name)[1][1:])
+            np.testing.assert_array_equal(loaded.predict(self.x), self.pickled.predict(self.x))
+
+    def test_shipped_model_matches_the_pickle(self):
+        loaded = ModelRegistry(DEFAULT_MODEL_PATH).get()
+        np.testing.assert_array_equal(loaded.predict(self.x), self.pickled.predict(self.x))
+
+    def test_schema_column_order_is_applied(self):
+        save_model(self.booster, self.path("model.ubj"))
+        with open(schema_path(self.path("model.ubj"))) as f:
+            schema = json.load(f)
+        self.assertEqual(schema["feature_columns"], FEATURE_COLUMNS)
+
+        # a model trained on the columns in reverse order gets them reversed
+        reordered = NativeModel(self.booster, FEATURE_COLUMNS[::-1])
+        np.testing.assert_array_equal(
+            reordered.predict(self.x[:, ::-1]), self.pickled.predict(self.x)
+        )
+
+    def test_schema_with_unknown_features_is_rejected(self):
+        save_model(self.booster, self.path("model.ubj"))
+        with open(schema_path(self.path("model.ubj")), "w") as f:
+            json.dump({"feature_columns": FEATURE_COLUMNS[:-1] + ["attendance"]}, f)
+
+        with self.assertRaises(ValueError):
+            ModelRegistry(self.path("model.ubj")).get()
+
+    def test_missing_schema_falls_back_to_booster_feature_names(self):
+        save_model(self.booster, self.path("model.ubj"))
+        os.remove(schema_path(self.path("model.ubj")))
+
+        loaded = ModelRegistry(self.path("model.ubj")).get()
+        self.assertEqual(loaded.model.feature_columns, FEATURE_COLUMNS)
+
+    def test_export_command(self):
+        call_command("export_model", "--output", self.path("exported.ubj"), stdout=open(os.devnull, "w"))
+        with open(self.path("exported.ubj"), "rb") as exported, open(DEFAULT_MODEL_PATH, "rb") as shipped:
+            self.assertEqual(exported.read(), shipped.read())
@@ -0,0 +1,106 @@
+from django.test import TestCase, SimpleTestCase
+from unittest.mock import patch
+from Test_Management.models import Section, FormativeAssessmentScore, PredictedScore, AnalysisDocumentStatistic
+from arima_model.arima_model import arima_driver
+from arima_model.features import build_student_features
+from arima_model.intervals import build_backtest, calibrate, prediction_bounds, INTERVAL_MIN_CALIBRATION
+from arima_model.reanalysis import recompute_students
+from arima_model.statistics_writer import load_interval_calibration
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document, add_score, random_scores
+import numpy as np
+
+
+class IntervalTests(SimpleTestCase):
+    def test_backtest_holds_out_each_students_last_score(self):
+        df = random_scores(n_students=40)
+        backtest = build_backtest(df)
+
+        counts = df.groupby("student_id", observed=True).size()
+        eligible = counts[counts >= 3].index
+        self.assertEqual(len(backtest), len(eligible))
+        self.assertEqual(backtest.features["student_id"].tolist(), sorted(eligible))
+        np.testing.assert_array_equal(
+            backtest.features["test_number"].to_numpy(), df.groupby("student_id", observed=True)["test_number"].max()[eligible] - 1
+        )
+
+    def test_backtest_samples_large_documents(self):
+        backtest = build_backtest(random_scores(n_students=60), max_students=10)
+        self.assertEqual(len(backtest), 10)
+
+    def test_too_few_backtests_give_no_bounds(self):
+        backtest = build_backtest(random_scores(n_students=3))
+        self.assertLess(len(backtest), INTERVAL_MIN_CALIBRATION)
+        self.assertIsNone(calibrate(backtest, backtest.targets))
+
+        features_df = build_student_features(random_scores(n_students=3))
+        lower, upper = prediction_bounds(None, features_df, np.full(len(features_df), 0.5))
+        self.assertTrue(np.isnan(lower).all() and np.isnan(upper).all())
+
+    def test_bounds_contain_the_prediction_and_cover_held_out_scores(self):
+        df = random_scores(n_students=400, max_tests=12, seed=2)
+        backtest = build_backtest(df)
+        predictions = backtest.features["weighted_mean_score"].to_numpy()
+        half = len(backtest) // 2
+        calibration_set, check = backtest.features.index[:half], backtest.features.index[half:]
+
+        calibration = calibrate(
+            type(backtest)(backtest.features.loc[calibration_set], backtest.targets[:half]), predictions[:half]
+        )
+        lower, upper = prediction_bounds(calibration, backtest.features.loc[check], predictions[half:])
+
+        self.assertTrue((lower <= predictions[half:]).all() and (predictions[half:] <= upper).all())
+        coverage = np.mean((lower <= backtest.targets[half:]) & (backtest.targets[half:] <= upper))
+        self.assertGreater(coverage, 0.7)
+
+
+class DriverIntervalTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_intervals")
+        self.section = Section.objects.create(section_name="Section Intervals")
+        self.students = make_students(self.section, "610000000", 8)
+        # test 5 is scored later
+        self.document = make_document(
+            self.user, self.section, self.students, 5, lambda i, t: (11 * i + 17 * t) % 51 if t < 5 else None,
+            title="Interval Doc",
+        )
+
+    def test_driver_stores_bounds_with_one_predict_call(self):
+        model = FeatureModel()
+        with patch("arima_model.arima_model.get_model", return_value=model):
+            arima_driver(self.document)
+
+        # eight students, then their eight backtests
+        self.assertEqual(model.calls, [16])
+        predictions = PredictedScore.objects.filter(analysis_document=self.document)
+        self.assertEqual(predictions.count(), 8)
+        for prediction in predictions:
+            self.assertLessEqual(prediction.lower_bound, prediction.score)
+            self.assertGreaterEqual(prediction.upper_bound, prediction.score)
+            self.assertLess(prediction.lower_bound, prediction.upper_bound)
+
+        statistic = AnalysisDocumentStatistic.objects.get(analysis_document=self.document)
+        self.assertLessEqual(statistic.prediction_error_lower, statistic.prediction_error_upper)
+
+    def test_reanalysis_reuses_the_stored_calibration(self):
+        with patch("arima_model.arima_model.get_model", return_value=FeatureModel()):
+            arima_driver(self.document)
+        calibration = load_interval_calibration(self.document)
+
+        add_score(self.document, self.students[0], 5, 50)
+        model = FeatureModel()
+        with patch("arima_model.arima_model.get_model", return_value=model):
+            recompute_students(self.document, [self.students[0].lrn], [5])
+
+        self.assertEqual(model.calls, [1])
+        self.assertEqual(load_interval_calibration(self.document), calibration)
+        prediction = PredictedScore.objects.get(analysis_document=self.document, student_id=self.students[0])
+        self.assertLessEqual(prediction.lower_bound, prediction.score)
+        self.assertGreaterEqual(prediction.upper_bound, prediction.score)
+
+    def test_small_documents_have_no_bounds(self):
+        FormativeAssessmentScore.objects.filter(student_id__in=self.students[4:]).delete()
+        with patch("arima_model.arima_model.get_model", return_value=FeatureModel()):
+            arima_driver(self.document)
+
+        self.assertFalse(PredictedScore.objects.filter(lower_bound__isnull=False).exists())
+        self.assertIsNone(load_interval_calibration(self.document))
@@ -0,0 +1,140 @@
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from unittest.mock import patch
+from Authentication.models import Student
+from Test_Management.models import (
+    Subject, Quarter, Section, FormativeAssessmentScore, PredictedScore, AnalysisDocumentStatistic,
+    FormativeAssessmentStatistic, StudentScoresStatistic
+)
+from arima_model.arima_model import arima_driver, prepare_scores
+from arima_model.arima_statistics import document_statistics, document_statistics_from_db
+from arima_model.models import AnalysisJob
+from arima_model.reanalysis import recompute_students
+from arima_model.score_loader import load_score_frame
+from arima_model.fixtures import FeatureModel, make_teacher, make_students, make_document, add_score
+
+
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class ReanalysisTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_reanalysis")
+        self.section = Section.objects.create(section_name="Section Reanalysis")
+        self.students = make_students(self.section, "500000000", 4)
+        # test 4 is scored by the tests
+        self.document = make_document(
+            self.user, self.section, self.students, 4, lambda i, t: 20 + 5 * i + 3 * t if t < 4 else None,
+            title="Reanalysis Doc",
+            subject=Subject.objects.create(subject_name="Math Reanalysis"),
+            quarter=Quarter.objects.create(quarter_name="1st Quarter"),
+        )
+
+    def snapshot(self):
+        """Everything a full analysis writes, in a comparable form."""
+        def rows(queryset, key, fields):
+            return {
+                getattr(obj, key): tuple(round(getattr(obj, f), 9) if getattr(obj, f) is not None else None for f in fields)
+                for obj in queryset.filter(analysis_document=self.document)
+            }
+
+        stat_fields = ["mean", "median", "mode", "standard_deviation", "minimum", "maximum"]
+        return {
+            "predictions": rows(PredictedScore.objects.all(), "student_id_id", ["score"]),
+            "prediction_tests": {p.student_id_id: p.test_number for p in PredictedScore.objects.filter(analysis_document=self.document)},
+            "students": rows(StudentScoresStatistic.objects.all(), "student_id", stat_fields + ["passing_rate", "sum_scores"]),
+            "tests": rows(FormativeAssessmentStatistic.objects.all(), "formative_assessment_number", stat_fields + ["passing_rate"]),
+            "document": rows(AnalysisDocumentStatistic.objects.all(), "analysis_document_id", stat_fields + ["total_students", "mean_passing_threshold"]),
+        }
+
+    def full_snapshot(self):
+        arima_driver(self.document)
+        return self.snapshot()
+
+    def test_rerunning_the_driver_does_not_duplicate_predictions(self, _):
+        arima_driver(self.document)
+        arima_driver(self.document)
+        self.assertEqual(PredictedScore.objects.filter(analysis_document=self.document).count(), 4)
+
+    def test_new_score_matches_full_recompute(self, _):
+        arima_driver(self.document)
+        add_score(self.document, self.students[0], 4, 49)
+
+        recompute_students(self.document, [self.students[0].lrn], [4])
+        recomputed = self.snapshot()
+
+        self.assertEqual(recomputed, self.full_snapshot())
+        self.assertEqual(recomputed["prediction_tests"][self.students[0].lrn], "4")
+
+    def test_edited_score_matches_full_recompute(self, _):
+        arima_driver(self.document)
+        FormativeAssessmentScore.objects.filter(
+            analysis_document=self.document, student_id=self.students[2], test_number="1"
+        ).update(score=2)
+
+        recompute_students(self.document, [self.students[2].lrn], [1])
+        recomputed = self.snapshot()
+
+        self.assertEqual(recomputed, self.full_snapshot())
+
+    def test_reanalysis_is_idempotent(self, _):
+        arima_driver(self.document)
+        add_score(self.document, self.students[1], 4, 10)
+
+        recompute_students(self.document, [self.students[1].lrn], [4])
+        first = self.snapshot()
+        recompute_students(self.document, [self.students[1].lrn], [4])
+
+        self.assertEqual(self.snapshot(), first)
+        self.assertEqual(PredictedScore.objects.filter(analysis_document=self.document).count(), 4)
+
+    def test_document_statistics_from_db_match_frame(self, _):
+        FormativeAssessmentScore.objects.filter(
+            analysis_document=self.document, student_id=self.students[3]
+        ).update(score=30)
+        frame = prepare_scores(load_score_frame(self.document))
+
+        expected = document_statistics(frame)
+        stored = document_statistics_from_db(self.document)
+        for name, value in expected.items():
+            self.assertAlmostEqual(stored[name], value, places=9, msg=name)
+
+
+@override_settings(ARIMA_JOBS={"BACKEND": "eager", "MAX_ATTEMPTS": 1, "RETRY_BACKOFF_SECONDS": 0})
+@patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+class ScoreUpdateApiTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_scores_api")
+        self.section = Section.objects.create(section_name="Section Scores API")
+        self.student = Student.objects.create(lrn="60000000001", section=self.section)
+        self.document = make_document(
+            self.user, self.section, [self.student], 1, lambda i, t: 20, title="Scores API Doc", status=True
+        )
+
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_score_update_queues_reanalysis(self, _):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f"/api/analysis-document/{self.document.pk}/scores/",
+                {"scores": [{"lrn": "60000000001", "test_number": "1", "score": 45}]},
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, 202)
+        job = AnalysisJob.objects.get(pk=response.data["job"]["job_id"])
+        self.assertEqual(job.kind, "reanalysis")
+        self.assertEqual(job.payload, {"students": ["60000000001"], "test_numbers": [1]})
+        self.assertEqual(job.status, AnalysisJob.SUCCEEDED)
+
+        self.assertEqual(FormativeAssessmentScore.objects.get(analysis_document=self.document).score, 45)
+        self.assertEqual(StudentScoresStatistic.objects.get(analysis_document=self.document).mean, 45)
+
+    def test_unknown_students_are_rejected(self, _):
+        response = self.client.post(
+            f"/api/analysis-document/{self.document.pk}/scores/",
+            {"scores": [{"lrn": "69999999999", "test_number": "1", "score": 45}]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("69999999999", response.data["error"])
+        self.assertFalse(AnalysisJob.objects.exists())
@@ -0,0 +1,85 @@
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from Authentication.models import Student
+from Test_Management.models import AnalysisDocument, Section, PredictedScore
+from arima_model.arima_model import save_predictions
+import numpy as np
+import pandas as pd
+
+
+class SavePredictionsTests(TestCase):
+    n_students = 2000
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(username="teacher_predictions", password="password")
+        cls.section = Section.objects.create(section_name="Section Predictions")
+        cls.document = AnalysisDocument.objects.create(
+            analysis_doc_title="Prediction Doc", teacher=cls.user, section=cls.section
+        )
+        Student.objects.bulk_create([
+            Student(lrn=f"74{i:010d}", section=cls.section) for i in range(cls.n_students)
+        ])
+
+    def predictions(self, scores, test_number=5, lrns=None):
+        lrns = lrns if lrns is not None else [f"74{i:010d}" for i in range(len(scores))]
+        return pd.DataFrame({
+            "student_id": pd.Categorical(lrns),
+            "predictions": scores,
+            "prediction_lower": np.asarray(scores) - 5,
+            "prediction_upper": np.asarray(scores) + 5,
+            "post_test_max_score": 60.0,
+            "normalized_passing_threshold": 0.7,
+            "predicted_status": "Monitoring Learners",
+            "test_number": test_number,
+        })
+
+    def test_reruns_upsert_in_flat_time(self):
+        rng = np.random.default_rng(0)
+        timings, query_counts = [], []
+        for _ in range(5):
+            started = time.perf_counter()
+            with CaptureQueriesContext(connection) as queries:
+                save_predictions(self.predictions(rng.uniform(0, 60, self.n_students)), self.document)
+            timings.append(time.perf_counter() - started)
+            query_counts.append(len(queries.captured_queries))
+
+            self.assertEqual(PredictedScore.objects.filter(analysis_document=self.document).count(), self.n_students)
+
+        self.assertEqual(len(set(query_counts)), 1)
+        # updating every row costs about as much as the first insert, and no more on each rerun
+        self.assertLess(max(timings[1:]), 3 * timings[0] + 0.05)
+
+    def test_rerun_updates_the_values(self):
+        save_predictions(self.predictions([10.0, 20.0]), self.document)
+        first_ids = set(PredictedScore.objects.values_list("pk", flat=True))
+        save_predictions(self.predictions([30.0, 40.0]), self.document)
+
+        self.assertEqual(set(PredictedScore.objects.values_list("pk", flat=True)), first_ids)
+        self.assertEqual(
+            sorted(PredictedScore.objects.values_list("score", "lower_bound", "upper_bound")),
+            [(30.0, 25.0, 35.0), (40.0, 35.0, 45.0)],
+        )
+
+    def test_newer_test_number_replaces_the_prediction(self):
+        save_predictions(self.predictions([10.0, 20.0]), self.document)
+        save_predictions(self.predictions([50.0], test_number=6), self.document)
+
+        self.assertEqual(
+            sorted(PredictedScore.objects.values_list("student_id_id", "test_number", "score")),
+            [("740000000000", "6", 50.0), ("740000000001", "5", 20.0)],
+        )
+
+    def test_unknown_students_and_missing_bounds(self):
+        df = self.predictions([10.0, 20.0], lrns=["740000000000", "unknown-lrn"])
+        df["prediction_lower"] = np.nan
+        save_predictions(df, self.document)
+
+        prediction = PredictedScore.objects.get()
+        self.assertEqual(prediction.student_id_id, "740000000000")
+        self.assertIsNone(prediction.lower_bound)
+        self.assertEqual(prediction.upper_bound, 15.0)
@@ -0,0 +1,77 @@
+from django.test import TestCase
+from Authentication.models import Student
+from Test_Management.models import AnalysisDocument, Subject, Quarter, Section, FormativeAssessmentScore
+from arima_model.score_loader import load_score_frame, ScoreLoadLimitExceeded
+from arima_model.arima_model import preprocess_data
+from arima_model.fixtures import make_teacher, make_document
+import pandas as pd
+
+
+class ScoreLoaderTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_loader")
+        self.section = Section.objects.create(section_name="Section Loader")
+        self.subject = Subject.objects.create(subject_name="Math Loader")
+        self.quarter = Quarter.objects.create(quarter_name="1st Quarter")
+
+        self.student1 = Student.objects.create(
+            lrn="20000000002", first_name="Ana", last_name="Reyes", section=self.section
+        )
+        self.student2 = Student.objects.create(
+            lrn="20000000001", first_name="Ben", last_name="Cruz", section=self.section
+        )
+
+        # created newest test first, so the rows do not arrive in test order
+        scores = {(0, 2): 10, (0, 1): 40, (1, 2): 15, (1, 1): 25}
+        self.analysis_doc = make_document(
+            self.user, self.section, [self.student1, self.student2], (2, 1), lambda i, t: scores[i, t],
+            title="Loader Doc", max_score=lambda t: 50 if t == 1 else 20,
+            subject=self.subject, quarter=self.quarter,
+        )
+        FormativeAssessmentScore.objects.create(
+            analysis_document=self.analysis_doc, student_id=self.student1,
+            score=70, test_number="3", topic_mapping=None
+        )
+
+    def test_load_score_frame_columns(self):
+        """Scores are loaded column-wise with typed and categorical columns."""
+        df = load_score_frame(self.analysis_doc, chunk_size=2)
+
+        self.assertEqual(len(df), 5)
+        self.assertIsInstance(df["student_id"].dtype, pd.CategoricalDtype)
+        self.assertIsInstance(df["section"].dtype, pd.CategoricalDtype)
+        self.assertEqual(list(df["student_id"].cat.categories), ["20000000001", "20000000002"])
+
+        row = df[(df["student_id"] == "20000000002") & (df["test_number"] == 1)].iloc[0]
+        self.assertEqual(row["first_name"], "Ana")
+        self.assertEqual(row["last_name"], "Reyes")
+        self.assertEqual(row["section"], "Section Loader")
+        self.assertEqual(row["score"], 40.0)
+        self.assertEqual(row["max_score"], 50.0)
+
+        # missing topic mapping falls back to the default max score
+        unmapped = df[df["test_number"] == 3].iloc[0]
+        self.assertEqual(unmapped["max_score"], 100.0)
+
+    def test_load_score_frame_query_count(self):
+        """One query for the score rows and one for the students, regardless of chunking."""
+        with self.assertNumQueries(2):
+            load_score_frame(self.analysis_doc, chunk_size=2)
+
+    def test_empty_document_raises(self):
+        empty_doc = AnalysisDocument.objects.create(analysis_doc_title="Empty", section=self.section)
+        with self.assertRaises(FormativeAssessmentScore.DoesNotExist):
+            load_score_frame(empty_doc)
+
+    def test_memory_cap(self):
+        with self.assertRaises(ScoreLoadLimitExceeded):
+            load_score_frame(self.analysis_doc, chunk_size=1, max_bytes=16)
+
+    def test_preprocess_orders_series_by_test_number(self):
+        """Scores saved on the same day are ordered by test number within each student."""
+        df, features_df = preprocess_data(self.analysis_doc)
+
+        student1_tests = list(df[df["student_id"] == "20000000002"]["test_number"])
+        self.assertEqual(student1_tests, [1, 2, 3])
+        self.assertEqual(list(features_df["student_id"]), ["20000000001", "20000000002"])
+        self.assertEqual(list(features_df["test_number"]), [2, 3])
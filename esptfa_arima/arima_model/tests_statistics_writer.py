@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from Authentication.models import Student
+from Test_Management.models import (
+    Subject, Quarter, Section, AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic
+)
+from arima_model.arima_statistics import compute_all_statistics, compute_student_statistics
+from arima_model.fixtures import make_teacher, make_document
+import pandas as pd
+
+
+class StatisticsWriterTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_writer")
+        self.section = Section.objects.create(section_name="Section Writer")
+        self.subject = Subject.objects.create(subject_name="Math Writer")
+        self.quarter = Quarter.objects.create(quarter_name="1st Quarter")
+
+    def make_document(self, n_students, n_tests):
+        """A document with topics but no stored scores, and the processed scores of its students."""
+        document = make_document(
+            self.user, self.section, [], n_tests, score=None, title=f"Writer {n_students}x{n_tests}",
+            subject=self.subject, quarter=self.quarter,
+        )
+
+        rows = []
+        for i in range(n_students):
+            lrn = f"{document.pk:04d}{i:07d}"
+            Student.objects.create(lrn=lrn, section=self.section)
+            for t in range(1, n_tests + 1):
+                score = float((i * 7 + t * 3) % 50)
+                rows.append({
+                    "student_id": lrn,
+                    "test_number": t,
+                    "score": score,
+                    "max_score": 50.0,
+                    "normalized_scores": score / 50,
+                    "normalized_passing_threshold": 0.70,
+                })
+        return document, pd.DataFrame(rows)
+
+    def count_queries(self, processed_data, document):
+        with CaptureQueriesContext(connection) as context:
+            compute_all_statistics(processed_data, document)
+        return len(context.captured_queries)
+
+    def test_query_count_does_not_grow_with_document_size(self):
+        small_doc, small_data = self.make_document(n_students=2, n_tests=2)
+        large_doc, large_data = self.make_document(n_students=40, n_tests=12)
+
+        self.assertEqual(
+            self.count_queries(small_data, small_doc),
+            self.count_queries(large_data, large_doc),
+        )
+        self.assertEqual(StudentScoresStatistic.objects.filter(analysis_document=large_doc).count(), 40)
+        self.assertEqual(FormativeAssessmentStatistic.objects.filter(analysis_document=large_doc).count(), 12)
+
+    def test_rerun_updates_rows_in_place(self):
+        document, processed_data = self.make_document(n_students=3, n_tests=2)
+        compute_all_statistics(processed_data, document)
+
+        processed_data["score"] = 50.0
+        compute_all_statistics(processed_data, document)
+
+        self.assertEqual(AnalysisDocumentStatistic.objects.filter(analysis_document=document).count(), 1)
+        self.assertEqual(FormativeAssessmentStatistic.objects.filter(analysis_document=document).count(), 2)
+        student_stats = StudentScoresStatistic.objects.filter(analysis_document=document)
+        self.assertEqual(student_stats.count(), 3)
+        self.assertTrue(all(stat.mean == 50.0 for stat in student_stats))
+
+        test_stat = FormativeAssessmentStatistic.objects.get(
+            analysis_document=document, formative_assessment_number="1"
+        )
+        self.assertEqual(test_stat.fa_topic.topic_name, "Writer 3x2 1")
+
+    def test_missing_students_are_all_reported(self):
+        document, processed_data = self.make_document(n_students=1, n_tests=1)
+        extra = processed_data.copy()
+        extra["student_id"] = "99999999998"
+        more = processed_data.copy()
+        more["student_id"] = "99999999999"
+        processed_data = pd.concat([processed_data, extra, more], ignore_index=True)
+
+        with self.assertRaises(Student.DoesNotExist) as context:
+            compute_student_statistics(processed_data, document)
+        self.assertIn("99999999998", str(context.exception))
+        self.assertIn("99999999999", str(context.exception))
+        self.assertFalse(StudentScoresStatistic.objects.filter(analysis_document=document).exists())
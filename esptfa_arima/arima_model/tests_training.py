@@ -0,0 +1,97 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command, CommandError
+from django.test import TestCase, override_settings
+from Test_Management.models import Section, ActualPostTest
+from arima_model.arima_model import preprocess_data
+from arima_model.features import feature_matrix, FEATURE_COLUMNS
+from arima_model.model_registry import ModelRegistry, DEFAULT_MODEL_PATH, schema_path
+from arima_model.fixtures import make_teacher, make_students, make_document
+from arima_model.training import (
+    train_model, iter_training_chunks, training_documents, is_validation_document, NoTrainingData
+)
+import numpy as np
+
+
+@override_settings(ARIMA_TRAINING={"NUM_BOOST_ROUND": 20, "DOCUMENTS_PER_CHUNK": 3, "PARAMS": {"nthread": 1}})
+class TrainingTests(TestCase):
+    def setUp(self):
+        self.user = make_teacher("teacher_training")
+        self.section = Section.objects.create(section_name="Section Training")
+        self.students = make_students(self.section, "7200000000", 12)
+        self.output_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.output_dir)
+
+        rng = np.random.default_rng(5)
+        self.documents = []
+        for d in range(10):
+            ability = rng.uniform(0.3, 0.95, len(self.students))
+            document = make_document(
+                self.user, self.section, self.students, 6,
+                lambda i, t: float(np.clip(50 * ability[i] + rng.normal(0, 4), 0, 50)),
+                title=f"Training Doc {d}",
+            )
+            # the last student never sat the post-test
+            ActualPostTest.objects.bulk_create([
+                ActualPostTest(
+                    analysis_document=document, student=student, max_score=60.0,
+                    score=float(np.clip(60 * ability[i] + rng.normal(0, 3), 0, 60)),
+                )
+                for i, student in enumerate(self.students[:-1])
+            ])
+            self.documents.append(document)
+
+    def test_chunks_use_the_prediction_features(self):
+        chunks = list(iter_training_chunks(training_documents(), 3))
+
+        self.assertEqual([len(chunk) for chunk in chunks], [33, 33, 33, 11])
+        _, features_df = preprocess_data(self.documents[0])
+        np.testing.assert_allclose(chunks[0].features[:11], feature_matrix(features_df)[:11])
+        actual = ActualPostTest.objects.get(analysis_document=self.documents[0], student=self.students[0])
+        self.assertAlmostEqual(chunks[0].targets[0], actual.score / actual.max_score)
+
+    def test_validation_split_is_stable(self):
+        ids = training_documents()
+        split = [is_validation_document(pk, 0.2) for pk in ids]
+        self.assertEqual(split, [is_validation_document(pk, 0.2) for pk in ids])
+        self.assertFalse(any(is_validation_document(pk, 0) for pk in ids))
+
+    def test_trained_artifact_loads_and_predicts(self):
+        report = train_model(output_dir=self.output_dir, validation_fraction=0.3)
+
+        self.assertTrue(os.path.basename(report["path"]).startswith("esptfa_xgboost-"))
+        self.assertTrue(report["path"].endswith(".ubj"))
+        with open(schema_path(report["path"])) as f:
+            sidecar = json.load(f)
+        self.assertEqual(sidecar["version"], report["version"])
+        self.assertEqual(sidecar["feature_columns"], FEATURE_COLUMNS)
+        self.assertEqual(sidecar["train_rows"] + sidecar["metrics"]["trained"]["rows"], 110)
+        self.assertIn("installed", sidecar["metrics"])
+        self.assertLess(sidecar["metrics"]["trained"]["mae"], 0.15)
+
+        loaded = ModelRegistry(report["path"]).get()
+        _, features_df = preprocess_data(self.documents[0])
+        self.assertEqual(loaded.predict(feature_matrix(features_df)).shape, (12,))
+
+    def test_external_memory_training(self):
+        report = train_model(output_dir=self.output_dir, external_memory=True)
+        self.assertGreater(report["train_rows"], 0)
+
+    def test_command_installs_the_model(self):
+        installed_path = os.path.join(self.output_dir, "installed.ubj")
+        shutil.copy(DEFAULT_MODEL_PATH, installed_path)
+        with override_settings(ARIMA_MODEL_PATH=installed_path):
+            call_command("train_model", "--output-dir", self.output_dir, "--install", "--rounds", "5", stdout=open(os.devnull, "w"))
+            version_file = [name for name in os.listdir(self.output_dir) if name.endswith(".ubj") and name != "installed.ubj"]
+            with open(os.path.join(self.output_dir, version_file[0]), "rb") as trained, open(installed_path, "rb") as installed:
+                self.assertEqual(trained.read(), installed.read())
+
+    def test_no_actual_scores(self):
+        ActualPostTest.objects.all().delete()
+        with self.assertRaises(NoTrainingData):
+            train_model(output_dir=self.output_dir)
+        with self.assertRaises(CommandError):
+            call_command("train_model", "--output-dir", self.output_dir)
@@ -0,0 +1,82 @@
+from django.test import SimpleTestCase
+from unittest.mock import patch
+from Test_Management.models import AnalysisDocument
+from arima_model.arima_model import make_predictions
+from arima_model.features import build_student_features
+from arima_model.fixtures import FeatureModel, score_frame
+from arima_model.trend_forecaster import forecast_ar1, forecast_holt, HOLT_ALPHAS, HOLT_BETAS
+import numpy as np
+import statsmodels.api as sm
+
+
+def random_series(n_students=30, seed=5):
+    rng = np.random.default_rng(seed)
+    return {
+        f"s{i:03d}": np.clip(rng.uniform(0.3, 0.9) + rng.normal(0, 0.1, rng.integers(2, 15)), 0, 1)
+        for i in range(n_students)
+    }
+
+
+def holt_reference(series):
+    """Plain per-series Holt recursion over the same parameter grid."""
+    best = None
+    for alpha in HOLT_ALPHAS:
+        for beta in HOLT_BETAS:
+            smoothed, trend, sse = series[1], series[1] - series[0], 0.0
+            for y in series[2:]:
+                sse += (y - smoothed - trend) ** 2
+                new_smoothed = alpha * y + (1 - alpha) * (smoothed + trend)
+                trend = beta * (new_smoothed - smoothed) + (1 - beta) * trend
+                smoothed = new_smoothed
+            if best is None or sse < best[0]:
+                best = (sse, smoothed + trend)
+    return best[1]
+
+
+class TrendForecasterTests(SimpleTestCase):
+    def test_ar1_matches_per_student_least_squares(self):
+        series = random_series()
+        forecasts = forecast_ar1(score_frame(series), level=0.8)
+
+        for lrn, values in series.items():
+            row = forecasts.loc[lrn]
+            if len(values) < 4:
+                self.assertTrue(row.isna().all())
+                continue
+            fitted = sm.OLS(values[1:], sm.add_constant(values[:-1])).fit()
+            prediction = fitted.get_prediction(np.array([[1.0, values[-1]]]))
+            lower, upper = prediction.conf_int(obs=True, alpha=0.2)[0]
+
+            self.assertAlmostEqual(row["forecast"], prediction.predicted_mean[0], places=9)
+            self.assertAlmostEqual(row["lower"], lower, places=9)
+            self.assertAlmostEqual(row["upper"], upper, places=9)
+
+    def test_holt_matches_per_student_recursion(self):
+        series = random_series()
+        forecasts = forecast_holt(score_frame(series))
+
+        for lrn, values in series.items():
+            if len(values) < 4:
+                self.assertTrue(forecasts.loc[lrn].isna().all())
+                continue
+            self.assertAlmostEqual(forecasts.loc[lrn, "forecast"], holt_reference(values), places=9)
+            self.assertLessEqual(forecasts.loc[lrn, "lower"], forecasts.loc[lrn, "upper"])
+
+    def test_linear_trend_is_extrapolated(self):
+        scores = score_frame({"a": np.linspace(0.2, 0.74, 10)})
+        self.assertAlmostEqual(forecast_ar1(scores).loc["a", "forecast"], 0.8, places=9)
+        self.assertAlmostEqual(forecast_holt(scores).loc["a", "forecast"], 0.8, places=9)
+
+    @patch("arima_model.arima_model.get_model", return_value=FeatureModel())
+    def test_make_predictions_uses_the_document_method(self, _):
+        scores = score_frame({"long": np.linspace(0.2, 0.74, 10), "short": [0.5, 0.6]})
+        features = build_student_features(scores)
+        fallback = features.set_index("student_id")["weighted_mean_score"] * 50
+
+        for method in (AnalysisDocument.AR1, AnalysisDocument.HOLT):
+            document = AnalysisDocument(post_test_max_score=50.0, forecast_method=method)
+            predictions = make_predictions(features.copy(), document, scores).set_index("student_id")
+
+            self.assertAlmostEqual(predictions.loc["long", "predictions"], 40.0, places=6)
+            self.assertAlmostEqual(predictions.loc["short", "predictions"], fallback["short"], places=9)
+            self.assertTrue(np.isnan(predictions.loc["short", "prediction_lower"]))
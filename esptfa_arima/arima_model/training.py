@@ -0,0 +1,282 @@
+import logging
+import os
+import tempfile
+import time
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+import xgboost
+from django.conf import settings
+
+from Test_Management.models import AnalysisDocument, ActualPostTest, FormativeAssessmentScore
+from .batch_driver import document_frames
+from .feature_store import load_feature_frames
+from .features import build_student_features, feature_matrix, FEATURE_COLUMNS, MASTERY_THRESHOLD, PASSING_THRESHOLD
+from .model_registry import registry, save_model, NativeModel, DEFAULT_MODEL_PATH
+from .score_loader import load_documents_score_frame
+
+logger = logging.getLogger("arima_model")
+
+DEFAULT_TRAINING_SETTINGS = {
+    # documents whose scores are loaded (and featurized) per chunk
+    "DOCUMENTS_PER_CHUNK": 50,
+    # share of documents held out to evaluate against their actual post-test scores
+    "VALIDATION_FRACTION": 0.2,
+    "NUM_BOOST_ROUND": 300,
+    "EARLY_STOPPING_ROUNDS": 20,
+    # quantized pages are spilled to disk instead of kept in memory
+    "EXTERNAL_MEMORY": False,
+    # artifacts are written here; None uses the directory of the shipped model
+    "OUTPUT_DIR": None,
+    "PARAMS": {
+        "objective": "reg:squarederror",
+        "tree_method": "hist",
+        "max_depth": 4,
+        "learning_rate": 0.05,
+        "subsample": 0.8,
+        "min_child_weight": 1.0,
+        "max_bin": 256,
+        "seed": 42,
+        # 0 uses every core
+        "nthread": 0,
+    },
+}
+
+ARTIFACT_PREFIX = "esptfa_xgboost"
+
+
+def training_settings():
+    configured = getattr(settings, "ARIMA_TRAINING", {})
+    merged = {**DEFAULT_TRAINING_SETTINGS, **configured}
+    merged["PARAMS"] = {**DEFAULT_TRAINING_SETTINGS["PARAMS"], **configured.get("PARAMS", {})}
+    return merged
+
+
+class NoTrainingData(Exception):
+    """Raised when no analysis document has both scores and actual post-test scores."""
+
+
+@dataclass
+class TrainingChunk:
+    """Features of the students of a few documents and their normalized actual post-test scores."""
+
+    features: np.ndarray
+    targets: np.ndarray
+    document_ids: np.ndarray
+
+    def __len__(self):
+        return len(self.targets)
+
+
+def is_validation_document(document_id, fraction):
+    """Stable split: a document lands on the same side on every run and every machine."""
+    return zlib.crc32(str(document_id).encode()) % 1000 < fraction * 1000
+
+
+def training_documents():
+    """Ids of the documents that have actual post-test scores, in id order."""
+    return list(
+        AnalysisDocument.objects.filter(actual_post_tests__isnull=False)
+        .order_by("pk").values_list("pk", flat=True).distinct()
+    )
+
+
+def iter_training_chunks(document_ids, documents_per_chunk):
+    """
+    Yield a ``TrainingChunk`` per ``documents_per_chunk`` documents. Documents
+    with stored feature snapshots are read from them; the scores of the rest are
+    loaded with one query and featurized exactly like ``preprocess_data``.
+    Students without an actual post-test score are dropped. Only one chunk is
+    held in memory at a time.
+    """
+    for start in range(0, len(document_ids), documents_per_chunk):
+        chunk_ids = document_ids[start:start + documents_per_chunk]
+        feature_frames = load_feature_frames(chunk_ids)
+        missing = [pk for pk in chunk_ids if pk not in feature_frames]
+        if missing:
+            try:
+                frames = document_frames(load_documents_score_frame(missing))
+            except FormativeAssessmentScore.DoesNotExist:
+                frames = {}
+            for document_id, processed_data in frames.items():
+                feature_frames[document_id] = build_student_features(processed_data)
+
+        actual = {
+            (document_id, lrn): score / max_score
+            for document_id, lrn, score, max_score in ActualPostTest.objects.filter(
+                analysis_document_id__in=chunk_ids, max_score__gt=0
+            ).order_by().values_list("analysis_document_id", "student_id", "score", "max_score")
+        }
+
+        features, targets, documents = [], [], []
+        for document_id, features_df in sorted(feature_frames.items()):
+            document_targets = np.array(
+                [actual.get((document_id, lrn), np.nan) for lrn in features_df["student_id"]], dtype=float
+            )
+            known = ~np.isnan(document_targets)
+            features.append(feature_matrix(features_df)[known])
+            targets.append(document_targets[known])
+            documents.append(np.full(known.sum(), document_id))
+
+        chunk = TrainingChunk(
+            features=np.concatenate(features) if features else np.empty((0, len(FEATURE_COLUMNS))),
+            targets=np.concatenate(targets) if targets else np.empty(0),
+            document_ids=np.concatenate(documents) if documents else np.empty(0, dtype=int),
+        )
+        if len(chunk):
+            yield chunk
+
+
+class ChunkIter(xgboost.DataIter):
+    """Feeds ``iter_training_chunks`` to XGBoost, restarting the stream from the database on every pass."""
+
+    def __init__(self, document_ids, documents_per_chunk, cache_prefix=None):
+        self.document_ids = document_ids
+        self.documents_per_chunk = documents_per_chunk
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = iter_training_chunks(self.document_ids, self.documents_per_chunk)
+        chunk = next(self._chunks, None)
+        if chunk is None:
+            return False
+        input_data(data=chunk.features, label=chunk.targets, feature_names=FEATURE_COLUMNS)
+        return True
+
+    def reset(self):
+        self._chunks = None
+
+
+def _status(normalized):
+    return np.select([normalized >= MASTERY_THRESHOLD, normalized >= PASSING_THRESHOLD], [2, 1], default=0)
+
+
+def evaluate(models, document_ids, documents_per_chunk):
+    """
+    Stream the documents once and score every model in ``models`` (name -> object
+    with ``predict``) against the actual post-test scores. Errors are in points of
+    the normalized (0-1) score; ``status_accuracy`` is the share of students whose
+    predicted status matches the actual one.
+    """
+    totals = {name: {"abs": 0.0, "squared": 0.0, "status": 0} for name in models}
+    rows = 0
+    for chunk in iter_training_chunks(document_ids, documents_per_chunk):
+        rows += len(chunk)
+        actual_status = _status(chunk.targets)
+        for name, model in models.items():
+            predictions = np.clip(model.predict(chunk.features), 0, 1)
+            errors = predictions - chunk.targets
+            totals[name]["abs"] += float(np.abs(errors).sum())
+            totals[name]["squared"] += float((errors ** 2).sum())
+            totals[name]["status"] += int((_status(predictions) == actual_status).sum())
+
+    if not rows:
+        return {name: None for name in models}
+    return {
+        name: {
+            "rows": rows,
+            "mae": total["abs"] / rows,
+            "rmse": float(np.sqrt(total["squared"] / rows)),
+            "status_accuracy": total["status"] / rows,
+        }
+        for name, total in totals.items()
+    }
+
+
+def _matrix(data_iter, config, ref=None):
+    if config["EXTERNAL_MEMORY"]:
+        return xgboost.ExtMemQuantileDMatrix(data_iter, max_bin=config["PARAMS"]["max_bin"], ref=ref)
+    return xgboost.QuantileDMatrix(data_iter, max_bin=config["PARAMS"]["max_bin"], ref=ref)
+
+
+def train_model(output_dir=None, install=False, **overrides):
+    """
+    Train a new XGBoost model on every document with actual post-test scores.
+
+    The training set is streamed from the database chunk by chunk into a
+    quantized ``hist`` matrix, so only the compressed matrix (or, with
+    ``EXTERNAL_MEMORY``, its on-disk pages) has to fit. A stable share of the
+    documents is held out for early stopping and evaluation, where the new model
+    is compared with the currently installed one.
+
+    Writes ``esptfa_xgboost-<version>.ubj`` (XGBoost's native format) and its
+    ``.schema.json`` sidecar with the feature columns, metrics and training setup
+    to ``output_dir`` (see ``save_model``). With ``install`` the model also
+    replaces the registry's model file, which running processes pick up on their
+    next lookup. Returns the sidecar's contents plus the artifact path.
+    """
+    config = training_settings()
+    config.update({key.upper(): value for key, value in overrides.items() if value is not None})
+    started = time.perf_counter()
+
+    document_ids = training_documents()
+    validation_ids = [pk for pk in document_ids if is_validation_document(pk, config["VALIDATION_FRACTION"])]
+    train_ids = [pk for pk in document_ids if pk not in set(validation_ids)]
+    if not train_ids:
+        raise NoTrainingData("No analysis documents with actual post-test scores to train on")
+
+    with tempfile.TemporaryDirectory(prefix="arima-train-") as cache_dir:
+        def data_iter(ids, name):
+            prefix = os.path.join(cache_dir, name) if config["EXTERNAL_MEMORY"] else None
+            return ChunkIter(ids, config["DOCUMENTS_PER_CHUNK"], cache_prefix=prefix)
+
+        train_iter = data_iter(train_ids, "train")
+        dtrain = _matrix(train_iter, config)
+        if dtrain.num_row() == 0:
+            raise NoTrainingData("No students with both formative and actual post-test scores to train on")
+
+        evals, early_stopping = [], None
+        if validation_ids:
+            dvalid = _matrix(data_iter(validation_ids, "validation"), config, ref=dtrain)
+            if dvalid.num_row():
+                evals, early_stopping = [(dvalid, "validation")], config["EARLY_STOPPING_ROUNDS"]
+            del dvalid
+
+        logger.info(
+            f"Training on {dtrain.num_row()} students of {len(train_ids)} analysis documents "
+            f"({len(validation_ids)} documents held out)"
+        )
+        booster = xgboost.train(
+            config["PARAMS"], dtrain, num_boost_round=config["NUM_BOOST_ROUND"],
+            evals=evals, early_stopping_rounds=early_stopping, verbose_eval=False,
+        )
+        if early_stopping:
+            booster = booster[:booster.best_iteration + 1]
+        train_rows = dtrain.num_row()
+        # release the matrices while their external memory pages still exist
+        del dtrain, evals
+    train_seconds = time.perf_counter() - started
+
+    candidates = {"trained": NativeModel(booster, booster.feature_names)}
+    try:
+        candidates["installed"] = registry.get()
+    except Exception as e:
+        logger.warning(f"Not comparing with the installed model: {e}")
+    metrics = evaluate(candidates, validation_ids, config["DOCUMENTS_PER_CHUNK"])
+
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    output_dir = output_dir or config["OUTPUT_DIR"] or os.path.dirname(DEFAULT_MODEL_PATH)
+    os.makedirs(output_dir, exist_ok=True)
+    artifact_path = os.path.join(output_dir, f"{ARTIFACT_PREFIX}-{version}.ubj")
+
+    report = {
+        "version": version,
+        "xgboost_version": xgboost.__version__,
+        "params": config["PARAMS"],
+        "train_documents": len(train_ids),
+        "validation_documents": len(validation_ids),
+        "train_rows": train_rows,
+        "metrics": metrics,
+        "train_seconds": train_seconds,
+    }
+    report = save_model(booster, artifact_path, report)
+
+    if install:
+        save_model(booster, registry.path, report)
+        logger.info(f"Installed model {version} at {registry.path}")
+    logger.info(f"Wrote model {version} to {artifact_path} in {time.perf_counter() - started:.1f}s")
+    return {**report, "path": artifact_path, "installed": install}
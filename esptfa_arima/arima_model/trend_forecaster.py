@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm, t as student_t
+
+from .features import build_score_matrix, PREDICTION_INTERVAL_LEVEL, FORECAST_COLUMNS
+
+# both models need at least two residuals to estimate their error variance
+TREND_MIN_SERIES_LENGTH = 4
+
+# Holt smoothing parameters searched for every student
+HOLT_ALPHAS = np.array([0.2, 0.4, 0.6, 0.8])
+HOLT_BETAS = np.array([0.1, 0.2, 0.3])
+
+
+def _forecast_frame(matrix, forecast, half_width, min_length):
+    """Assemble the forecast frame, blanking out series shorter than ``min_length``."""
+    values = np.column_stack([forecast, forecast - half_width, forecast + half_width])
+    values[matrix.lengths < max(min_length, TREND_MIN_SERIES_LENGTH)] = np.nan
+    return pd.DataFrame(values, index=matrix.keys, columns=FORECAST_COLUMNS)
+
+
+def _last_values(matrix):
+    return matrix.values[np.arange(len(matrix.keys)), matrix.lengths - 1]
+
+
+def forecast_ar1(scores, level=PREDICTION_INTERVAL_LEVEL, min_length=TREND_MIN_SERIES_LENGTH):
+    """
+    One-step forecast of every student's next normalized score with an AR(1)
+    model with drift, y[t] = c + phi * y[t-1], fitted by least squares for all
+    students at once over the padded score matrix.
+
+    The interval is the exact OLS prediction interval of the next value
+    (Student's t with n - 2 degrees of freedom). Returns a
+    frame of FORECAST_COLUMNS indexed by student id; series shorter than
+    ``min_length`` are NaN.
+    """
+    matrix = build_score_matrix(scores)
+    valid = matrix.valid[:, 1:]
+    x = np.where(valid, matrix.values[:, :-1], 0.0)
+    y = np.where(valid, matrix.values[:, 1:], 0.0)
+
+    n = valid.sum(axis=1)
+    safe_n = np.maximum(n, 1)
+    x_mean = x.sum(axis=1) / safe_n
+    y_mean = y.sum(axis=1) / safe_n
+    dx = np.where(valid, x - x_mean[:, None], 0.0)
+    dy = np.where(valid, y - y_mean[:, None], 0.0)
+    sxx = (dx * dx).sum(axis=1)
+    sxy = (dx * dy).sum(axis=1)
+
+    # a flat history has no autocorrelation to estimate; it forecasts its mean
+    has_slope = sxx > 1e-12
+    phi = np.where(has_slope, sxy / np.where(has_slope, sxx, 1.0), 0.0)
+    c = y_mean - phi * x_mean
+
+    residuals = np.where(valid, y - c[:, None] - phi[:, None] * x, 0.0)
+    variance = (residuals ** 2).sum(axis=1) / np.maximum(n - 2, 1)
+
+    last = _last_values(matrix)
+    leverage = np.where(has_slope, (last - x_mean) ** 2 / np.where(has_slope, sxx, 1.0), 0.0)
+    standard_error = np.sqrt(variance * (1 + 1 / safe_n + leverage))
+
+    forecast = c + phi * last
+    quantile = student_t.ppf(0.5 + level / 2, np.maximum(n - 2, 1))
+    return _forecast_frame(matrix, forecast, quantile * standard_error, min_length)
+
+
+def forecast_holt(scores, level=PREDICTION_INTERVAL_LEVEL, min_length=TREND_MIN_SERIES_LENGTH):
+    """
+    One-step forecast of every student's next normalized score with Holt's
+    linear trend method.
+
+    Every (alpha, beta) pair of the HOLT_ALPHAS x HOLT_BETAS grid is run for all
+    students together, stepping through the tests once, and each student keeps
+    the pair with the smallest squared one-step error. The recursion starts from
+    level y[1] and trend y[1] - y[0], so errors are counted from the third score.
+    The interval uses the standard deviation of those one-step errors.
+    """
+    matrix = build_score_matrix(scores)
+    values, valid = matrix.values, matrix.valid
+    n_students, width = values.shape
+
+    alpha = np.repeat(HOLT_ALPHAS, len(HOLT_BETAS))[:, None]
+    beta = np.tile(HOLT_BETAS, len(HOLT_ALPHAS))[:, None]
+    shape = (len(alpha), n_students)
+
+    if width < 2:
+        nothing = np.full(n_students, np.nan)
+        return _forecast_frame(matrix, nothing, nothing, min_length)
+
+    # state after the second score: level y[1], trend y[1] - y[0]
+    smoothed = np.broadcast_to(np.where(valid[:, 1], values[:, 1], values[:, 0]), shape).copy()
+    trend = np.broadcast_to(np.where(valid[:, 1], values[:, 1] - values[:, 0], 0.0), shape).copy()
+    sse = np.zeros(shape)
+
+    for t in range(2, width):
+        step = valid[:, t]
+        y = np.where(step, values[:, t], 0.0)
+        error = y - (smoothed + trend)
+        sse += np.where(step, error ** 2, 0.0)
+        new_smoothed = alpha * y + (1 - alpha) * (smoothed + trend)
+        new_trend = beta * (new_smoothed - smoothed) + (1 - beta) * trend
+        smoothed = np.where(step, new_smoothed, smoothed)
+        trend = np.where(step, new_trend, trend)
+
+    best = sse.argmin(axis=0)
+    students = np.arange(n_students)
+    forecast = smoothed[best, students] + trend[best, students]
+    standard_error = np.sqrt(sse[best, students] / np.maximum(matrix.lengths - 2, 1))
+    return _forecast_frame(matrix, forecast, norm.ppf(0.5 + level / 2) * standard_error, min_length)
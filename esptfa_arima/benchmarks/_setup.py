@@ -0,0 +1,136 @@
+"""
+Shared helpers for the benchmark scripts.
+
+The scripts are run from the ``esptfa_arima`` directory, e.g.
+``python -m benchmarks.bench_score_loader``. Database benchmarks run against a
+throwaway test database, never against the configured one.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django():
+    if PROJECT_DIR not in sys.path:
+        sys.path.insert(0, PROJECT_DIR)
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "esptfaARIMA.settings_ci")
+    os.environ.setdefault("DJANGO_SECRET_KEY", "benchmark-key-not-for-production")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def temporary_database():
+    """Create a fresh test database for the duration of the block."""
+    from django.db import connection
+
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+@contextmanager
+def measure(trace_memory=False):
+    """
+    Record the wall time of the block into the yielded dict, plus the peak traced
+    memory when ``trace_memory`` is set. Tracing slows allocation-heavy code down,
+    so time and memory should come from separate runs.
+    """
+    result = {}
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        yield result
+    finally:
+        result["seconds"] = time.perf_counter() - start
+        if trace_memory:
+            result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+
+def time_and_trace(func, *args, **kwargs):
+    """Run ``func`` twice: once for wall time, once under tracemalloc for peak memory."""
+    with measure() as timed:
+        value = func(*args, **kwargs)
+    with measure(trace_memory=True) as traced:
+        func(*args, **kwargs)
+    return value, {"seconds": timed["seconds"], "peak_bytes": traced["peak_bytes"]}
+
+
+def seed_document(n_students, n_tests, title="Benchmark Doc", seed=0, batch_size=20000):
+    """Create one analysis document with ``n_students`` x ``n_tests`` random scores."""
+    import numpy as np
+    from django.contrib.auth.models import User
+    from Authentication.models import Student
+    from Test_Management.models import (
+        AnalysisDocument, Subject, Quarter, Section,
+        TestTopic, TestTopicMapping, FormativeAssessmentScore
+    )
+
+    rng = np.random.default_rng(seed)
+    teacher, _ = User.objects.get_or_create(username="benchmark_teacher")
+    section = Section.objects.create(section_name=f"{title} Section")
+    subject, _ = Subject.objects.get_or_create(subject_name="Benchmark Subject")
+    quarter, _ = Quarter.objects.get_or_create(quarter_name="1st Quarter")
+
+    document = AnalysisDocument.objects.create(
+        analysis_doc_title=title,
+        teacher=teacher,
+        section=section,
+        subject=subject,
+        quarter=quarter,
+        post_test_max_score=60.0,
+    )
+
+    topics = TestTopic.objects.bulk_create([
+        TestTopic(topic_name=f"Topic {t}", max_score=50, subject=subject, test_number=str(t))
+        for t in range(1, n_tests + 1)
+    ])
+    mappings = TestTopicMapping.objects.bulk_create([
+        TestTopicMapping(analysis_document=document, topic=topic) for topic in topics
+    ])
+
+    prefix = f"{document.pk:04d}"
+    students = Student.objects.bulk_create([
+        Student(lrn=f"{prefix}{i:08d}", first_name=f"First{i}", last_name=f"Last{i}", section=section)
+        for i in range(n_students)
+    ], batch_size=batch_size)
+
+    ability = rng.uniform(0.4, 0.95, size=n_students)
+    scores = []
+    for i, student in enumerate(students):
+        student_scores = np.clip(ability[i] + rng.normal(0, 0.1, size=n_tests), 0, 1) * 50
+        for t, mapping in enumerate(mappings):
+            scores.append(FormativeAssessmentScore(
+                analysis_document=document,
+                student_id=student,
+                score=round(float(student_scores[t])),
+                test_number=str(t + 1),
+                topic_mapping=mapping,
+                passing_threshold=35.0,
+            ))
+        if len(scores) >= batch_size:
+            FormativeAssessmentScore.objects.bulk_create(scores)
+            scores = []
+    if scores:
+        FormativeAssessmentScore.objects.bulk_create(scores)
+
+    return document
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for row in rows:
+        print("  ".join(str(c).ljust(w) for c, w in zip(row, widths)))
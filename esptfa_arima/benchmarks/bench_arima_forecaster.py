@@ -0,0 +1,83 @@
+"""
+Throughput of the per-student ARIMA forecaster: cold-start serial fits (the old
+``grid_search_arima`` loop over the same order grid) against the warm-started
+engine, serially and with a process pool. No database is needed.
+
+    python -m benchmarks.bench_arima_forecaster --students 1000 --tests 20 --workers 1 4
+"""
+
+import argparse
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._setup import setup_django, measure, print_table
+
+
+def make_scores(n_students, n_tests, seed=0):
+    rng = np.random.default_rng(seed)
+    ability = rng.uniform(0.4, 0.95, size=(n_students, 1))
+    normalized = np.clip(ability + rng.normal(0, 0.1, size=(n_students, n_tests)), 0, 1)
+    return pd.DataFrame({
+        "student_id": pd.Categorical(np.repeat([f"{i:012d}" for i in range(n_students)], n_tests)),
+        "test_number": np.tile(np.arange(1, n_tests + 1), n_students),
+        "score": np.round(normalized.ravel() * 50),
+        "max_score": 50.0,
+        "date": np.tile(pd.date_range("2026-01-05", periods=n_tests, freq="7D"), n_students),
+    })
+
+
+def cold_start_fits(scores, orders):
+    """Every order fitted from the default start values, one series at a time."""
+    from statsmodels.tsa.arima.model import ARIMA
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        for _, student_scores in scores.groupby("student_id", observed=True):
+            for order in orders:
+                try:
+                    ARIMA(student_scores["normalized_scores"].to_numpy(), order=order).fit()
+                except (ValueError, np.linalg.LinAlgError):
+                    continue
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=1_000)
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, os.cpu_count() or 1])
+    parser.add_argument("--skip-cold", action="store_true", help="skip the slow cold-start baseline")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.arima_forecaster import forecast_scores, forecaster_settings, candidate_orders
+    from arima_model.arima_model import prepare_scores
+
+    config = forecaster_settings()
+    orders = candidate_orders(config["MAX_P"], config["MAX_Q"], config["DIFFERENCING"])
+    scores = prepare_scores(make_scores(args.students, args.tests))
+    fits = args.students * len(orders)
+
+    def row(label, workers, seconds):
+        return [label, workers, f"{seconds:.1f}s", f"{fits / seconds:.0f}", f"{fits / seconds / workers:.0f}"]
+
+    results = []
+    if not args.skip_cold:
+        with measure() as cold:
+            cold_start_fits(scores, orders)
+        results.append(row("cold start, serial", 1, cold["seconds"]))
+
+    for workers in sorted(set(args.workers)):
+        with measure() as engine:
+            forecasts = forecast_scores(scores, workers=workers)
+        results.append(row("warm start engine", workers, engine["seconds"]))
+
+    print(f"{args.students:,} students x {args.tests} tests, orders {orders}, "
+          f"{int(forecasts['forecast'].notna().sum()):,} forecasts")
+    print_table(["fits", "workers", "wall", "fits/sec", "fits/sec/core"], results)
+
+
+if __name__ == "__main__":
+    main()
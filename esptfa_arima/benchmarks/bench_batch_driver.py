@@ -0,0 +1,64 @@
+"""
+Compare analysing many documents one by one with ``arima_driver`` against one
+``arima_batch_driver`` run over all of them (one score query, one predict call).
+
+    python -m benchmarks.bench_batch_driver --documents 10 40 --students 40
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, temporary_database, measure, seed_document, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, nargs="+", default=[10, 40])
+    parser.add_argument("--students", type=int, default=40, help="students per document")
+    parser.add_argument("--tests", type=int, default=10, help="tests per student")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from arima_model.arima_model import arima_driver
+    from arima_model.batch_driver import arima_batch_driver
+    from arima_model.model_registry import get_model
+
+    # load the model up front so neither side pays for it
+    get_model()
+
+    results = []
+    with temporary_database():
+        for n_documents in args.documents:
+            documents = [
+                seed_document(args.students, args.tests, title=f"Batch {n_documents} {d}", seed=d)
+                for d in range(n_documents)
+            ]
+
+            with CaptureQueriesContext(connection) as sequential_queries, measure() as sequential:
+                for document in documents:
+                    arima_driver(document)
+            with CaptureQueriesContext(connection) as batch_queries, measure() as batch:
+                report = arima_batch_driver(documents)
+
+            assert not any("error" in entry for entry in report["documents"])
+            per_document = [entry["seconds"] for entry in report["documents"]]
+            results.append([
+                n_documents,
+                f"{n_documents * args.students:,}",
+                f"{sequential['seconds']:.2f}s ({len(sequential_queries)} q)",
+                f"{batch['seconds']:.2f}s ({len(batch_queries)} q)",
+                f"{report['load_seconds']:.3f}s",
+                f"{report['predict_seconds']:.3f}s",
+                f"{min(per_document):.3f}-{max(per_document):.3f}s",
+                f"{sequential['seconds'] / batch['seconds']:.1f}x",
+            ])
+
+    print_table(
+        ["documents", "students", "one by one", "batch", "batch load", "batch predict", "per document", "speedup"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Peak memory and wall time of analysing one growing document in a single pass
+(``arima_driver`` below the chunk threshold) against the chunked pipeline,
+which keeps only ``--chunk`` students in memory at a time. Uses the shipped
+model; runs with DEBUG off so the query log is not counted, and the single pass
+does not rebuild the full_details payload either.
+
+    python -m benchmarks.bench_chunked_pipeline --students 5000 20000 50000 --chunk 5000
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, temporary_database, time_and_trace, seed_document, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[5_000, 20_000, 50_000])
+    parser.add_argument("--tests", type=int, default=10, help="tests per student")
+    parser.add_argument("--chunk", type=int, default=5_000, help="students per chunk")
+    args = parser.parse_args()
+
+    setup_django()
+    from unittest.mock import patch
+    from django.test.utils import override_settings
+    from arima_model.arima_model import arima_driver
+    from arima_model.chunked_pipeline import arima_chunked_driver
+    from arima_model.model_registry import get_model
+    from Test_Management.services.full_details_service import invalidate_full_details
+
+    def invalidate(document):
+        invalidate_full_details(document.pk)
+
+    # load the model up front so neither side pays for it
+    get_model()
+    # like the web process: no query log
+    override_settings(DEBUG=False).enable()
+
+    results = []
+    with temporary_database():
+        for n_students in args.students:
+            document = seed_document(n_students, args.tests, title=f"Chunked {n_students}")
+
+            with override_settings(ARIMA_PIPELINE={"CHUNK_STUDENTS": n_students}), \
+                    patch("arima_model.arima_model.refresh_full_details", invalidate):
+                _, single = time_and_trace(arima_driver, document)
+            _, chunked = time_and_trace(arima_chunked_driver, document, chunk_students=args.chunk)
+
+            results.append([
+                f"{n_students:,}",
+                f"{n_students * args.tests:,}",
+                f"{single['seconds']:.2f}s",
+                f"{single['peak_bytes'] / 2 ** 20:.1f} MiB",
+                f"{chunked['seconds']:.2f}s",
+                f"{chunked['peak_bytes'] / 2 ** 20:.1f} MiB",
+            ])
+
+    print_table(["students", "scores", "single pass", "peak", "chunked", "peak"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Response time of one page of /api/predicted-score/ at growing depth: page-number
+pages (COUNT plus OFFSET) against keyset pages (``?cursor=``, seeking past the
+previous page's last primary key), and keyset pages trimmed with
+``fields=student_id,score``. Times are the best of ``--repeat`` requests.
+
+    python -m benchmarks.bench_keyset_pagination --students 200000
+"""
+
+import argparse
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks._setup import setup_django, temporary_database, measure, seed_document, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, default=200_000, help="predicted scores to page through")
+    parser.add_argument("--page-size", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+    from rest_framework.pagination import Cursor
+    from rest_framework.test import APIClient
+    from Authentication.models import Student
+    from Test_Management.models import PredictedScore
+    from utils.pagination.pagination import KeysetPagination
+
+    # like the web process: no query log
+    override_settings(DEBUG=False, ALLOWED_HOSTS=["*"]).enable()
+
+    def best(url, params):
+        timings = []
+        for _ in range(args.repeat):
+            with measure() as timed:
+                response = client.get(url, params)
+            assert response.status_code == 200, response.content
+            timings.append(timed["seconds"])
+        return f"{min(timings) * 1000:.1f} ms"
+
+    results = []
+    with temporary_database():
+        document = seed_document(args.students, 1, title="Keyset")
+        PredictedScore.objects.bulk_create([
+            PredictedScore(
+                analysis_document=document, student_id_id=lrn, score=40.0, test_number="2",
+                passing_threshold=35.0, max_score=50.0,
+            )
+            for lrn in Student.objects.filter(section=document.section).values_list("lrn", flat=True)
+        ], batch_size=20_000)
+
+        client = APIClient()
+        client.force_authenticate(document.teacher)
+        url = "/api/predicted-score/"
+        ids = list(PredictedScore.objects.order_by("pk").values_list("pk", flat=True))
+        paginator = KeysetPagination()
+        paginator.base_url = url
+
+        last_page = (len(ids) - 1) // args.page_size + 1
+        for page in sorted({1, 10, last_page // 2, last_page}):
+            depth = (page - 1) * args.page_size
+            # the cursor the previous page's "next" link would carry
+            cursor = ""
+            if depth:
+                link = paginator.encode_cursor(Cursor(offset=0, reverse=False, position=ids[depth - 1]))
+                cursor = parse_qs(urlsplit(link).query)["cursor"][0]
+            keyset = {"cursor": cursor, "page_size": args.page_size}
+
+            results.append([
+                f"{page:,}",
+                f"{depth:,}",
+                best(url, {"page": page, "page_size": args.page_size}),
+                best(url, keyset),
+                best(url, {**keyset, "fields": "student_id,score"}),
+            ])
+
+    print_table(["page", "rows before", "page number", "keyset", "keyset + fields"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Startup cost of the prediction model: load time and resident memory of the
+pickled model against XGBoost's native formats. Every first load runs in a
+fresh interpreter, so the imports a format needs are part of its cost;
+"reload" deserializes the same file again with everything imported.
+
+    python -m benchmarks.bench_model_load --repeat 5
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from benchmarks._setup import setup_django, print_table, PROJECT_DIR
+
+# run in the child: Django settings and numpy are already imported (as in the
+# web process) before the clock starts
+CHILD = """
+import json, sys, time
+from benchmarks._setup import setup_django
+setup_django()
+import numpy
+
+def rss():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * {page_size}
+
+before = rss()
+started = time.perf_counter()
+from arima_model.model_registry import ModelRegistry
+loaded = ModelRegistry(sys.argv[1]).get()
+loaded.predict(numpy.zeros((1, 10)))
+seconds = time.perf_counter() - started
+grown = rss() - before
+# deserializing again once every module is imported
+reload_seconds = ModelRegistry(sys.argv[1]).get().load_seconds
+print(json.dumps({{"seconds": seconds, "reload_seconds": reload_seconds, "rss": grown}}))
+"""
+
+
+def run_child(path):
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(page_size=os.sysconf("SC_PAGE_SIZE")), path],
+        cwd=PROJECT_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5, help="fresh interpreters per format")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.management.commands.export_model import LEGACY_MODEL_PATH
+    from arima_model.model_registry import save_model, DEFAULT_MODEL_PATH
+    import pickle
+
+    with open(LEGACY_MODEL_PATH, "rb") as f:
+        booster = pickle.load(f).get_booster()
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        json_path = os.path.join(tmp_dir, "esptfa_xgboost.json")
+        save_model(booster, json_path)
+        for name, path in [("pickle", LEGACY_MODEL_PATH), ("ubj", DEFAULT_MODEL_PATH), ("json", json_path)]:
+            runs = [run_child(path) for _ in range(args.repeat)]
+            results.append([
+                name,
+                f"{os.path.getsize(path) / 1024:.0f} KiB",
+                f"{statistics.median(run['seconds'] for run in runs) * 1000:.0f} ms",
+                f"{statistics.median(run['reload_seconds'] for run in runs) * 1000:.1f} ms",
+                f"{statistics.median(run['rss'] for run in runs) / 2 ** 20:.1f} MiB",
+            ])
+
+    print_table(["format", "file", "first load (with imports)", "reload", "RSS growth"], results)
+
+
+if __name__ == "__main__":
+    main()
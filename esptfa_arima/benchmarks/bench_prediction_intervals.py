@@ -0,0 +1,58 @@
+"""
+Cost of prediction intervals: features plus ``predict`` for a document with and
+without the backtest rows that calibrate them, using the shipped model. No
+database is needed.
+
+    python -m benchmarks.bench_prediction_intervals --students 1000 10000 50000
+"""
+
+import argparse
+
+import numpy as np
+
+from benchmarks._setup import setup_django, measure, print_table
+from benchmarks.bench_arima_forecaster import make_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.arima_model import prepare_scores
+    from arima_model.features import build_student_features, feature_matrix
+    from arima_model.intervals import build_backtest, calibrate, prediction_bounds
+    from arima_model.model_registry import get_model
+
+    model = get_model()
+
+    results = []
+    for n_students in args.students:
+        scores = prepare_scores(make_scores(n_students, args.tests))
+
+        with measure() as plain:
+            features_df = build_student_features(scores)
+            model.predict(feature_matrix(features_df))
+
+        with measure() as bounded:
+            features_df = build_student_features(scores)
+            backtest = build_backtest(scores)
+            predictions = model.predict(np.concatenate([feature_matrix(features_df), feature_matrix(backtest.features)]))
+            calibration = calibrate(backtest, predictions[len(features_df):])
+            prediction_bounds(calibration, features_df, predictions[:len(features_df)])
+
+        results.append([
+            f"{n_students:,}",
+            f"{len(backtest):,}",
+            f"{plain['seconds']:.3f}s",
+            f"{bounded['seconds']:.3f}s",
+            f"{bounded['seconds'] / plain['seconds']:.2f}x",
+        ])
+
+    print_table(["students", "backtests", "point only", "with intervals", "ratio"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,177 @@
+"""
+Query plans and latency of the two heaviest document reads, ``build_full_details``
+and the ``student_analysis_detail`` action, on a database seeded with
+``--documents`` x ``--students`` x ``--tests`` scores (1M by default) plus one
+statistic, prediction and post-test row per student. Every read is measured
+without and with the composite indexes the score models declare in
+``Meta.indexes``.
+
+The plans are SQLite's EXPLAIN QUERY PLAN of every SELECT the read runs. A
+``SCAN`` step reads the whole table, and a ``USE TEMP B-TREE`` step is a sort.
+Times are the best of ``--repeat`` runs.
+
+    python -m benchmarks.bench_query_plans --documents 5 --students 10000 --tests 20
+"""
+
+import argparse
+import re
+
+from benchmarks._setup import setup_django, temporary_database, measure, seed_document, print_table
+
+
+def seed_analysis(document, n_tests):
+    """Stand-in analysis results: the statistic, prediction and post-test rows full_details reads."""
+    from Authentication.models import Student
+    from Test_Management.models import (
+        AnalysisDocumentStatistic, FormativeAssessmentStatistic, StudentScoresStatistic,
+        PredictedScore, ActualPostTest, TestTopicMapping
+    )
+
+    summary = dict(mean=35.0, standard_deviation=5.0, median=35.0, minimum=10.0, maximum=50.0, mode=35.0)
+    AnalysisDocumentStatistic.objects.create(
+        analysis_document=document, total_students=0, mean_passing_threshold=35.0, **summary
+    )
+    FormativeAssessmentStatistic.objects.bulk_create([
+        FormativeAssessmentStatistic(
+            analysis_document=document, formative_assessment_number=mapping.topic.test_number, fa_topic=mapping.topic,
+            passing_rate=70.0, failing_rate=30.0, passing_threshold=35.0, max_score=50.0, **summary
+        )
+        for mapping in TestTopicMapping.objects.filter(analysis_document=document).select_related("topic")
+    ])
+    lrns = list(Student.objects.filter(section=document.section).values_list("lrn", flat=True))
+    StudentScoresStatistic.objects.bulk_create([
+        StudentScoresStatistic(
+            analysis_document=document, student_id=lrn, passing_rate=70.0, failing_rate=30.0,
+            sum_scores=35.0 * n_tests, max_possible_score=50.0 * n_tests, **summary
+        )
+        for lrn in lrns
+    ], batch_size=20_000)
+    PredictedScore.objects.bulk_create([
+        PredictedScore(
+            analysis_document=document, student_id_id=lrn, score=40.0, test_number=str(n_tests + 1),
+            predicted_status="Pass", passing_threshold=35.0, max_score=50.0,
+        )
+        for lrn in lrns
+    ], batch_size=20_000)
+    ActualPostTest.objects.bulk_create([
+        ActualPostTest(analysis_document=document, student_id=lrn, score=45.0, max_score=60.0, status="Pass")
+        for lrn in lrns
+    ], batch_size=20_000)
+    return lrns
+
+
+def captured_selects(read):
+    """Run ``read`` and return the (sql, params) of every SELECT it sent."""
+    from django.db import connection
+
+    statements = []
+
+    def record(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith("SELECT"):
+            statements.append((sql, params))
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        read()
+    return statements
+
+
+def query_plan(sql, params):
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=5)
+    parser.add_argument("--students", type=int, default=10_000, help="students per document")
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.apps import apps
+    from django.db import connection
+    from django.test.utils import override_settings
+    from rest_framework.test import APIClient
+    from Authentication.models import Teacher
+    from Test_Management.services.full_details_service import build_full_details
+
+    # like the web process: no query log
+    override_settings(DEBUG=False, ALLOWED_HOSTS=["*"]).enable()
+
+    indexed = [
+        (model, index)
+        for model in apps.get_app_config("Test_Management").get_models()
+        for index in model._meta.indexes
+    ]
+
+    def set_indexes(present):
+        with connection.schema_editor() as editor:
+            for model, index in indexed:
+                (editor.add_index if present else editor.remove_index)(model, index)
+
+    with temporary_database():
+        documents = [
+            seed_document(args.students, args.tests, title=f"Plans {d}", seed=d) for d in range(args.documents)
+        ]
+        # the document in the middle, and a student in the middle of it
+        document = documents[len(documents) // 2]
+        lrns = seed_analysis(document, args.tests)
+        for other in documents:
+            if other is not document:
+                seed_analysis(other, args.tests)
+        lrn = lrns[len(lrns) // 2]
+
+        Teacher.objects.get_or_create(user_id=document.teacher)
+        client = APIClient()
+        client.force_authenticate(document.teacher)
+        detail_url = f"/api/analysis-document/{document.pk}/student_analysis_detail/"
+
+        def student_detail():
+            response = client.get(detail_url, {"lrn": lrn})
+            assert response.status_code == 200, response.content
+
+        reads = [("full_details", lambda: build_full_details(document)), ("student_analysis_detail", student_detail)]
+
+        # identical plans (one query per row, say) are counted rather than repeated
+        timings, plans = {}, {}
+        for label, present in (("without indexes", False), ("with indexes", True)):
+            set_indexes(present)
+            for name, read in reads:
+                best = None
+                for _ in range(args.repeat):
+                    with measure() as timed:
+                        read()
+                    best = timed["seconds"] if best is None else min(best, timed["seconds"])
+                statements = captured_selects(read)
+                steps = [query_plan(sql, params) for sql, params in statements]
+                sorts = sum("TEMP B-TREE" in step for plan in steps for step in plan)
+                timings[name, label] = (best, sorts)
+                for (sql, _), plan in zip(statements, steps):
+                    table = re.search(r'FROM "(\w+)"', sql)
+                    key = (name, label, table.group(1) if table else "?", " / ".join(plan))
+                    plans[key] = plans.get(key, 0) + 1
+
+        print_table(["read", "indexes", "table", "queries", "query plan"], [
+            [name, label, table, count, plan] for (name, label, table, plan), count in plans.items()
+        ])
+        print()
+        print_table(
+            ["read", "without indexes", "sorts", "with indexes", "sorts"],
+            [
+                [
+                    name,
+                    f"{timings[name, 'without indexes'][0] * 1000:.1f} ms", timings[name, "without indexes"][1],
+                    f"{timings[name, 'with indexes'][0] * 1000:.1f} ms", timings[name, "with indexes"][1],
+                ]
+                for name, _ in reads
+            ],
+        )
+
+
+if __name__ == "__main__":
+    main()
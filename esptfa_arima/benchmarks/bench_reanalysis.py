@@ -0,0 +1,66 @@
+"""
+Compare a full analysis with the scoped recompute (``recompute_students``) of
+one student whose score was corrected, and of one student who received a new
+test score.
+
+    python -m benchmarks.bench_reanalysis --students 1000 10000
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, temporary_database, measure, seed_document, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    args = parser.parse_args()
+
+    setup_django()
+    from Test_Management.models import FormativeAssessmentScore
+    from arima_model.arima_model import arima_driver
+    from arima_model.model_registry import get_model
+    from arima_model.reanalysis import recompute_students
+
+    # load the model up front so neither side pays for it
+    get_model()
+
+    results = []
+    with temporary_database():
+        for n_students in args.students:
+            document = seed_document(n_students, args.tests, title=f"Reanalysis {n_students}")
+            with measure() as full:
+                arima_driver(document)
+
+            edited = FormativeAssessmentScore.objects.filter(analysis_document=document).order_by("pk").first()
+            FormativeAssessmentScore.objects.filter(pk=edited.pk).update(score=edited.score / 2)
+            with measure() as edit:
+                recompute_students(document, [edited.student_id_id], [int(edited.test_number)])
+
+            # a new test taken by one student
+            new_test = args.tests + 1
+            FormativeAssessmentScore.objects.create(
+                analysis_document=document,
+                student_id_id=edited.student_id_id,
+                score=40,
+                test_number=str(new_test),
+                passing_threshold=35.0,
+            )
+            with measure() as append:
+                recompute_students(document, [edited.student_id_id], [new_test])
+
+            results.append([
+                f"{n_students:,}",
+                f"{n_students * args.tests:,}",
+                f"{full['seconds']:.2f}s",
+                f"{edit['seconds']:.3f}s",
+                f"{append['seconds']:.3f}s",
+                f"{full['seconds'] / edit['seconds']:.0f}x",
+            ])
+
+    print_table(["students", "scores", "full", "one edit", "one new score", "speedup"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compare the ORM-instance score loading that preprocess_data used to do with the
+column-wise streaming loader.
+
+    python -m benchmarks.bench_score_loader --rows 10000 100000 1000000
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, temporary_database, time_and_trace, seed_document, print_table
+
+
+def legacy_load(analysis_document):
+    """The previous preprocess_data loading loop, kept here for comparison."""
+    import pandas as pd
+    from Test_Management.models import FormativeAssessmentScore
+
+    fa_scores = FormativeAssessmentScore.objects.filter(
+        analysis_document=analysis_document
+    ).select_related("student_id", "student_id__section", "topic_mapping__topic")
+
+    data = []
+    for score in fa_scores:
+        student = score.student_id
+        topic = score.topic_mapping.topic if score.topic_mapping else None
+        data.append({
+            "student_id": student.lrn,
+            "first_name": student.first_name,
+            "last_name": student.last_name,
+            "section": student.section.section_name if student.section else "N/A",
+            "test_number": int(score.test_number),
+            "score": score.score,
+            "max_score": topic.max_score if topic and topic.max_score else 100.0,
+            "date": score.date,
+        })
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.score_loader import load_score_frame
+
+    results = []
+    with temporary_database():
+        for rows in args.rows:
+            document = seed_document(rows // args.tests, args.tests, title=f"Loader {rows}")
+
+            legacy_df, legacy = time_and_trace(legacy_load, document)
+            streaming_df, streaming = time_and_trace(load_score_frame, document, max_bytes=1 << 40)
+            assert len(legacy_df) == len(streaming_df)
+
+            results.append([
+                f"{rows:,}",
+                f"{legacy['seconds']:.2f}s",
+                f"{streaming['seconds']:.2f}s",
+                f"{legacy['seconds'] / streaming['seconds']:.1f}x",
+                f"{legacy['peak_bytes'] / 2**20:.0f} MiB",
+                f"{streaming['peak_bytes'] / 2**20:.0f} MiB",
+                f"{legacy_df.memory_usage(deep=True).sum() / 2**20:.1f} MiB",
+                f"{streaming_df.memory_usage(deep=True).sum() / 2**20:.1f} MiB",
+            ])
+
+    print_table(
+        ["rows", "orm", "streaming", "speedup", "orm peak", "streaming peak", "orm frame", "streaming frame"],
+        results,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Size and build-plus-serialize time of a document's scores as the per-student
+``scores`` dicts of full_details (the time covers building its whole
+student_performance list, which they are part of; only the scores are rendered,
+with DRF's JSONRenderer) against the columnar score matrix in each of its
+encodings. Times are the best of ``--repeat`` runs.
+
+    python -m benchmarks.bench_score_matrix --students 1000 5000 --tests 20
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, temporary_database, measure, seed_document, print_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 5_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test.utils import override_settings
+    from rest_framework.renderers import JSONRenderer
+    from arima_model.arima_model import prepare_scores
+    from arima_model.arima_statistics import compute_student_statistics
+    from arima_model.score_loader import load_score_frame
+    from Test_Management.services.full_details_service import build_full_details
+    from Test_Management.services.score_matrix_service import (
+        build_score_matrix, score_matrix_json, score_matrix_gzip, score_matrix_msgpack
+    )
+
+    # like the web process: no query log
+    override_settings(DEBUG=False).enable()
+    renderer = JSONRenderer()
+    encodings = {
+        "json": lambda matrix: renderer.render(score_matrix_json(matrix)),
+        "gzip": score_matrix_gzip,
+        "msgpack": score_matrix_msgpack,
+    }
+
+    results = []
+    with temporary_database():
+        for n_students in args.students:
+            document = seed_document(n_students, args.tests, title=f"Matrix {n_students}")
+            compute_student_statistics(prepare_scores(load_score_frame(document)), document)
+
+            def dicts():
+                performance = build_full_details(document)["student_performance"]
+                return renderer.render([{"lrn": row["lrn"], "scores": row["scores"]} for row in performance])
+
+            payloads = [("full_details scores", dicts)] + [
+                (f"matrix {name}", lambda encode=encode: encode(build_score_matrix(document)))
+                for name, encode in encodings.items()
+            ]
+            for name, build in payloads:
+                timings = []
+                for _ in range(args.repeat):
+                    with measure() as timed:
+                        content = build()
+                    timings.append(timed["seconds"])
+                results.append([f"{n_students:,}", name, f"{len(content) / 1024:.0f} KiB", f"{min(timings):.3f}s"])
+
+    print_table(["students", "payload", "size", "build + serialize"], results)
+
+
+if __name__ == "__main__":
+    main()
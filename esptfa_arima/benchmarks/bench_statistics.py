@@ -0,0 +1,79 @@
+"""
+Compare the per-group statistics loops with the vectorized statistics kernel.
+No database is needed; only the computation is timed.
+
+    python -m benchmarks.bench_statistics --students 1000 10000 50000
+"""
+
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from benchmarks._setup import setup_django, measure, print_table
+
+
+def make_processed_data(n_students, n_tests, seed=0):
+    rng = np.random.default_rng(seed)
+    max_score = np.tile(np.where(np.arange(n_tests) % 2, 50.0, 100.0), n_students)
+    score = np.round(rng.uniform(0.3, 1.0, size=n_students * n_tests) * max_score)
+    return pd.DataFrame({
+        "student_id": pd.Categorical(np.repeat([f"{i:012d}" for i in range(n_students)], n_tests)),
+        "test_number": np.tile(np.arange(1, n_tests + 1), n_students),
+        "score": score,
+        "max_score": max_score,
+        "normalized_scores": score / max_score,
+        "normalized_passing_threshold": 0.70,
+    })
+
+
+def _summary(scores):
+    std = scores.std()
+    mode = scores.mode()
+    return (scores.mean(), scores.median(), mode[0] if not mode.empty else None,
+            0.0 if np.isnan(std) else std, scores.min(), scores.max())
+
+
+def legacy_statistics(processed_data):
+    """The previous per-group loops, without the database writes."""
+    _summary(processed_data["score"])
+    tests = {}
+    for fa_number, fa_data in processed_data.groupby("test_number"):
+        threshold = 0.70 * fa_data["max_score"].iloc[0]
+        tests[fa_number] = (_summary(fa_data["score"]), len(fa_data[fa_data["score"] >= threshold]))
+    students = {}
+    for student_id, student_data in processed_data.groupby("student_id", observed=True):
+        passing = (student_data["normalized_scores"] >= student_data["normalized_passing_threshold"]).sum()
+        students[student_id] = (_summary(student_data["score"]), passing, student_data["max_score"].sum())
+    return tests, students
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.arima_statistics import analysis_statistics
+
+    results = []
+    for n_students in args.students:
+        data = make_processed_data(n_students, args.tests)
+        with measure() as legacy:
+            legacy_statistics(data)
+        with measure() as kernel:
+            analysis_statistics(data)
+        results.append([
+            f"{n_students:,}",
+            f"{len(data):,}",
+            f"{legacy['seconds']:.2f}s",
+            f"{kernel['seconds']:.3f}s",
+            f"{legacy['seconds'] / kernel['seconds']:.0f}x",
+        ])
+
+    print_table(["students", "rows", "per-group", "kernel", "speedup"], results)
+
+
+if __name__ == "__main__":
+    main()
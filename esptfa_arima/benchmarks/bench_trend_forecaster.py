@@ -0,0 +1,49 @@
+"""
+Throughput of the vectorized AR(1)/Holt forecasters against the per-student
+ARIMA engine (timed on a sample and scaled per student). No database is needed.
+
+    python -m benchmarks.bench_trend_forecaster --students 1000 10000 100000
+"""
+
+import argparse
+
+from benchmarks._setup import setup_django, measure, print_table
+from benchmarks.bench_arima_forecaster import make_scores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--students", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--tests", type=int, default=20, help="tests per student")
+    parser.add_argument("--arima-sample", type=int, default=100, help="students fitted with ARIMA")
+    args = parser.parse_args()
+
+    setup_django()
+    from arima_model.arima_forecaster import forecast_scores
+    from arima_model.arima_model import prepare_scores
+    from arima_model.trend_forecaster import forecast_ar1, forecast_holt
+
+    with measure() as arima:
+        forecast_scores(prepare_scores(make_scores(args.arima_sample, args.tests)), workers=1)
+    arima_per_student = arima["seconds"] / args.arima_sample
+
+    results = []
+    for n_students in args.students:
+        scores = prepare_scores(make_scores(n_students, args.tests))
+        with measure() as ar1:
+            forecast_ar1(scores)
+        with measure() as holt:
+            forecast_holt(scores)
+        results.append([
+            f"{n_students:,}",
+            f"{ar1['seconds']:.3f}s",
+            f"{holt['seconds']:.3f}s",
+            f"{arima_per_student * n_students:.0f}s",
+            f"{arima_per_student * n_students / ar1['seconds']:.0f}x",
+        ])
+
+    print_table(["students", "AR(1)", "Holt", "ARIMA (est., 1 core)", "AR(1) speedup"], results)
+
+
+if __name__ == "__main__":
+    main()
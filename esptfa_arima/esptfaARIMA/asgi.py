@@ -2,4 +2,9 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "esptfaARIMA.settings")
-application = get_asgi_application()
\ No newline at end of file
+application = get_asgi_application()
+
+# load the prediction model now so the first analysis after a deploy is not the slow one
+from arima_model.model_registry import warm_model_registry  # noqa: E402
+
+warm_model_registry()
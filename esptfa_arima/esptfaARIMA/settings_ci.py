@@ -88,6 +88,92 @@ CELERY_BROKER_URL = "redis://redis:6379/0"
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 
+# PREDICTION MODEL
+# path to the serialized model; defaults to arima_model/model/esptfa_xgboost.ubj.
+# .ubj/.json files load natively (feature order from their .schema.json sidecar),
+# anything else is unpickled
+ARIMA_MODEL_PATH = os.getenv("ARIMA_MODEL_PATH") or None
+# load the model when the ASGI application starts
+ARIMA_MODEL_WARMUP = True
+
+# BACKGROUND ANALYSIS JOBS
+# "local" runs jobs in a thread pool inside the web process (SQLite deployments);
+# "redis" queues them for `python manage.py run_analysis_worker`
+ARIMA_JOBS = {
+    "BACKEND": os.getenv("ARIMA_JOBS_BACKEND", "local"),
+    "MAX_WORKERS": int(os.getenv("ARIMA_JOBS_MAX_WORKERS", "2")),
+    "MAX_ATTEMPTS": 3,
+    "RETRY_BACKOFF_SECONDS": 2.0,
+    "REDIS_URL": CELERY_BROKER_URL,
+    "QUEUE_NAME": "arima:jobs",
+    "STALE_AFTER_SECONDS": 3600,
+    "RECOVERY_INTERVAL_SECONDS": 300,
+}
+
+# ARIMA FORECASTER
+# per-student ARIMA fits for documents whose forecast_method is "arima";
+# series shorter than MIN_SERIES_LENGTH keep the XGBoost prediction
+ARIMA_FORECASTER = {
+    "MIN_SERIES_LENGTH": 6,
+    "MAX_P": 1,
+    "MAX_Q": 1,
+    # worker processes; 0 uses every core
+    "WORKERS": int(os.getenv("ARIMA_FORECASTER_WORKERS", "0")) or None,
+    "CHUNK_SIZE": 100,
+}
+
+# MODEL TRAINING
+# `python manage.py train_model` (see arima_model.training for every option)
+ARIMA_TRAINING = {
+    "DOCUMENTS_PER_CHUNK": 50,
+    "VALIDATION_FRACTION": 0.2,
+    "NUM_BOOST_ROUND": 300,
+    # keep the quantized training data on disk for very large histories
+    "EXTERNAL_MEMORY": os.getenv("ARIMA_TRAINING_EXTERNAL_MEMORY", "") == "1",
+}
+
+# ANALYSIS PIPELINE
+# documents with more students than this are analysed this many students at a time
+ARIMA_PIPELINE = {
+    "CHUNK_STUDENTS": int(os.getenv("ARIMA_PIPELINE_CHUNK_STUDENTS", "5000")),
+}
+
+# PIPELINE INSTRUMENTATION
+# every analysis logs its per-stage timings as JSON to the arima_model logger;
+# `python manage.py profile_analysis <id>` profiles one document on demand
+ARIMA_INSTRUMENTATION = {
+    "RECORD_RUNS": os.getenv("ARIMA_RECORD_PIPELINE_RUNS", "") == "1",
+    "TRACE_MEMORY": False,
+    "PROFILE_DOCUMENTS": [int(pk) for pk in os.getenv("ARIMA_PROFILE_DOCUMENTS", "").split(",") if pk.strip()],
+    "PROFILER": "cprofile",
+}
+
+# RESPONSE CACHE
+# full_details payloads are shared through Redis when REDIS_CACHE_URL is set,
+# otherwise each process keeps the most recently used ones in memory. The in-memory
+# cache only works with the local job backend: invalidations made by a separate
+# run_analysis_worker would never reach the web process (system check Test_Management.E001)
+REDIS_CACHE_URL = os.getenv("REDIS_CACHE_URL")
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "full_details": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_CACHE_URL,
+        "KEY_PREFIX": "esptfa",
+    }
+    if REDIS_CACHE_URL
+    else {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "full-details",
+        "OPTIONS": {"MAX_ENTRIES": 200},
+    },
+}
+# the in-memory cache also assumes a single web process: with several, a payload
+# another process cached stays stale for up to this long (Test_Management.W001)
+FULL_DETAILS_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 # Application definition
 
@@ -1,6 +1,8 @@
 from django.core.exceptions import PermissionDenied
 from django.contrib import messages
 from django.shortcuts import redirect
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
 
 class TeacherRequiredMixin:
     def dispatch(self, request, *args, **kwargs):
@@ -8,3 +10,78 @@ class TeacherRequiredMixin:
             messages.error(request, "You are not authorized to access this page.")
             return redirect("home")
         return super().dispatch(request, *args, **kwargs)
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b,c`` on a list or retrieve request trims the serializer output to
+    those fields and, when every kept field reads a plain model field, the SELECT
+    to those columns (``QuerySet.only``).
+    """
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self):
+        if self.request is None or self.request.method != "GET":
+            return None
+        requested = self.request.query_params.get(self.fields_query_param)
+        if not requested:
+            return None
+        return [name.strip() for name in requested.split(",") if name.strip()]
+
+    def _trim_fields(self, serializer):
+        requested = self.get_requested_fields()
+        if requested is None:
+            return serializer
+        target = serializer.child if isinstance(serializer, serializers.ListSerializer) else serializer
+        unknown = sorted(set(requested) - set(target.fields))
+        if unknown:
+            raise ValidationError({self.fields_query_param: f"Unknown field(s): {', '.join(unknown)}"})
+        for name in list(target.fields):
+            if name not in requested:
+                target.fields.pop(name)
+        return serializer
+
+    def get_serializer(self, *args, **kwargs):
+        return self._trim_fields(super().get_serializer(*args, **kwargs))
+
+    def _selected_columns(self, model):
+        """
+        Model fields the requested serializer fields read and the forward relations
+        they read through, or None when that cannot be told.
+        """
+        serializer = self._trim_fields(self.get_serializer_class()(context=self.get_serializer_context()))
+        concrete = {field.name for field in model._meta.concrete_fields}
+        columns = {model._meta.pk.name}
+        relations = set()
+        for field in serializer.fields.values():
+            if field.write_only:
+                continue
+            if isinstance(field, serializers.SerializerMethodField) or field.source == "*":
+                return None
+            source, *path = field.source.split(".")
+            if source not in concrete:
+                return None
+            columns.add(source)
+            if not path:
+                continue
+            # "student.full_name": join the student row in and keep all of its
+            # columns, since the attribute read may be a property over several
+            relation = model._meta.get_field(source)
+            if not (relation.many_to_one or relation.one_to_one) or len(path) > 1:
+                return None
+            relations.add(source)
+            columns.update(f"{source}__{f.name}" for f in relation.related_model._meta.concrete_fields)
+        return sorted(columns), sorted(relations)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_requested_fields() is None:
+            return queryset
+        selected = self._selected_columns(queryset.model)
+        if selected is None:
+            return queryset
+        columns, relations = selected
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
@@ -0,0 +1,46 @@
+from rest_framework.pagination import BasePagination, CursorPagination, PageNumberPagination
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Forward/backward pages ordered by primary key, fetched with ``WHERE pk > <last
+    seen>`` instead of OFFSET and without a COUNT, so a deep page costs the same
+    as the first one.
+    """
+
+    ordering = "pk"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+
+class PageNumberOrKeysetPagination(BasePagination):
+    """
+    The usual page-number pages (with ``count``) by default; keyset pages once the
+    request carries ``cursor`` (an empty ``?cursor=`` asks for the first one, each
+    response links to the next).
+    """
+
+    def __init__(self):
+        self.page_number = PageNumberPagination()
+        self.keyset = KeysetPagination()
+        self.active = self.page_number
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.active = self.keyset if self.keyset.cursor_query_param in request.query_params else self.page_number
+        return self.active.paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        return self.active.get_paginated_response(data)
+
+    @property
+    def display_page_controls(self):
+        return getattr(self.active, "display_page_controls", False)
+
+    def to_html(self):
+        return self.active.to_html()
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            *self.page_number.get_schema_operation_parameters(view),
+            *self.keyset.get_schema_operation_parameters(view),
+        ]